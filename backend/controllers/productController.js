@@ -1,3 +1,4 @@
+const mongoose = require('mongoose');
 const Product = require('../models/Product');
 const Category = require('../models/Category');
 
@@ -171,6 +172,66 @@ exports.deleteProduct = async (req, res) => {
   }
 };
 
+// Bulk delete products by id, or every product when `all` is set
+exports.bulkDeleteProducts = async (req, res) => {
+  try {
+    const { ids, all } = req.body;
+
+    if (all === true) {
+      const result = await Product.deleteMany({});
+      return res.json({
+        message: 'All products deleted successfully',
+        deletedCount: result.deletedCount
+      });
+    }
+
+    if (!Array.isArray(ids) || ids.length === 0) {
+      return res.status(400).json({ message: 'ids must be a non-empty array' });
+    }
+
+    const validIds = ids.filter(id => mongoose.Types.ObjectId.isValid(id));
+    const existing = await Product.find({ _id: { $in: validIds } }).select('_id');
+    const deleted = existing.map(product => product._id.toString());
+    const deletedSet = new Set(deleted);
+
+    await Product.deleteMany({ _id: { $in: deleted } });
+
+    res.json({
+      message: 'Products deleted successfully',
+      deletedCount: deleted.length,
+      deleted,
+      notFound: ids.filter(id => !deletedSet.has(String(id)))
+    });
+  } catch (error) {
+    res.status(500).json({ message: error.message });
+  }
+};
+
+// Look up updatedAt for many products at once so clients can revalidate cached data
+exports.getProductVersions = async (req, res) => {
+  try {
+    const { ids } = req.body;
+
+    if (!Array.isArray(ids)) {
+      return res.status(400).json({ message: 'ids must be an array' });
+    }
+
+    const validIds = ids.filter(id => mongoose.Types.ObjectId.isValid(id));
+    const products = await Product.find({ _id: { $in: validIds } })
+      .select('_id updatedAt')
+      .lean();
+
+    const versions = {};
+    products.forEach(product => {
+      versions[product._id.toString()] = product.updatedAt;
+    });
+
+    res.json({ versions });
+  } catch (error) {
+    res.status(500).json({ message: error.message });
+  }
+};
+
 // Advanced filtering
 exports.filterProducts = async (req, res) => {
   try {
@@ -380,6 +441,38 @@ exports.reorderProductImages = async (req, res) => {
   }
 };
 
+// Replace all product images in one save, so the product is never left without them
+exports.replaceProductImages = async (req, res) => {
+  try {
+    const { productId } = req.params;
+    const { images } = req.body; // Array of { url }, in display order
+
+    const product = await Product.findById(productId);
+    if (!product) {
+      return res.status(404).json({ message: 'Product not found' });
+    }
+
+    if (!Array.isArray(images) || images.some(img => !img || !img.url)) {
+      return res.status(400).json({ message: 'Images must be an array of { url }' });
+    }
+
+    product.images = images.map((img, idx) => ({
+      url: img.url,
+      order: idx
+    }));
+
+    await product.save();
+
+    res.json({
+      message: 'Images replaced successfully',
+      images: product.images
+    });
+  } catch (error) {
+    console.error('Error replacing product images:', error);
+    res.status(500).json({ message: error.message });
+  }
+};
+
 // Clear all product images
 exports.clearProductImages = async (req, res) => {
   try {
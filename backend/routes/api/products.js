@@ -6,8 +6,11 @@ const {
   createProduct,
   updateProduct,
   deleteProduct,
+  bulkDeleteProducts,
+  getProductVersions,
   filterProducts,
   addProductImages,
+  replaceProductImages,
   reorderProductImages,
   clearProductImages
 } = require('../../controllers/productController');
@@ -20,6 +23,12 @@ router.route('/')
 router.route('/filter')
   .post(filterProducts);
 
+router.route('/bulk-delete')
+  .post(bulkDeleteProducts);
+
+router.route('/versions')
+  .post(getProductVersions);
+
 router.route('/:id')
   .get(getProductById)
   .put(updateProduct)
@@ -27,6 +36,7 @@ router.route('/:id')
 
 // Image routes
 router.post('/:productId/images', addProductImages);
+router.put('/:productId/images', replaceProductImages);
 router.patch('/:productId/images/reorder', reorderProductImages);
 router.delete('/:productId/images', clearProductImages);
 
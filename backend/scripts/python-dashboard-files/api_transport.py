@@ -0,0 +1,198 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# POST is left out on purpose - retrying a create that reached the server
+# could duplicate the product. Connection errors are still retried for every
+# method since the request never left the client in that case.
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'PATCH', 'DELETE'])
+
+
+class ApiTransport:
+    """Shared HTTP session with a tuned connection pool, keep-alive, timeouts and retries"""
+
+    def __init__(self, pool_connections=4, pool_maxsize=16, connect_timeout=3.05,
+                 read_timeout=30, max_retries=3, backoff_factor=0.3):
+        self.timeout = (connect_timeout, read_timeout)
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._error_count = 0
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+        # pool_connections is the number of hosts kept, pool_maxsize the number
+        # of sockets kept alive per host (should cover the worker count)
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=False
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({'Connection': 'keep-alive'})
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the pooled session, applying the default timeout"""
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            self._request_count += 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._error_count += 1
+            raise
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def stats(self):
+        """Return request and connection counters for the session
+
+        connections_reused counts requests served on an already open socket,
+        including retries, so it can exceed the number of API calls made.
+        """
+        connections = 0
+        pool_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pool_requests += pool.num_requests
+
+        with self._lock:
+            return {
+                'requests': self._request_count,
+                'errors': self._error_count,
+                'connections_opened': connections,
+                'connections_reused': max(pool_requests - connections, 0)
+            }
+
+    def close(self):
+        self.session.close()
+
+
+def fetch_page(transport, url, page, page_size, params=None, items_key='products'):
+    """Fetch one page and return (items, total_pages)"""
+    query = dict(params or {})
+    query.update({'page': page, 'limit': page_size})
+    response = transport.get(url, params=query)
+    response.raise_for_status()
+    data = response.json()
+
+    # Some endpoints return a bare list without pagination metadata
+    if isinstance(data, list):
+        return data, 1
+    return data.get(items_key, []), int(data.get('totalPages') or 1)
+
+
+def iter_pages(transport, url, page_size=200, params=None, items_key='products', prefetch=True):
+    """Yield pages of items from a paginated endpoint, following totalPages
+
+    With prefetch the next page is requested in the background while the
+    caller is still handling the current one.
+    """
+    items, total_pages = fetch_page(transport, url, 1, page_size, params, items_key)
+    if not prefetch:
+        yield items
+        for page in range(2, total_pages + 1):
+            items, _ = fetch_page(transport, url, page, page_size, params, items_key)
+            yield items
+        return
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = None
+    try:
+        for page in range(2, total_pages + 1):
+            pending = executor.submit(fetch_page, transport, url, page, page_size, params, items_key)
+            yield items
+            items, _ = pending.result()
+            pending = None
+        yield items
+    finally:
+        # Generator closed early: drop the prefetched page
+        if pending is not None:
+            pending.cancel()
+        executor.shutdown(wait=False)
+
+
+# Base URLs whose server has no PUT /products/:id/images, so later calls go
+# straight to the two-step fallback
+_replace_unsupported = set()
+
+
+def replace_product_images(transport, base_url, product_id, urls, current_urls=None):
+    """Make a product's images exactly urls, in order, in a single request where possible
+
+    current_urls is the order the caller believes the server has. A pure
+    reorder of it is sent as PATCH .../images/reorder; any other change is one
+    PUT .../images. Servers without the PUT route get DELETE followed by POST.
+    transport is an ApiTransport or anything with the same get/post/... API.
+    Returns the new image list or raises requests.HTTPError.
+    """
+    urls = list(urls)
+    images_url = f"{base_url}/products/{product_id}/images"
+    images = [{'url': url, 'order': idx} for idx, url in enumerate(urls)]
+
+    if urls and current_urls is not None and sorted(urls) == sorted(current_urls):
+        response = transport.patch(f"{images_url}/reorder", json={'imageOrders': [{'url': url} for url in urls]})
+        if response.ok:
+            return images
+        # 400 means the server's set differs from current_urls; replace instead
+        if response.status_code != 400:
+            response.raise_for_status()
+        logger.info(f"Reorder rejected for product {product_id}, replacing images")
+
+    if base_url not in _replace_unsupported:
+        response = transport.put(images_url, json={'images': images})
+        # A missing product answers with a JSON message; a missing route doesn't
+        is_missing_route = response.status_code == 405 or (
+            response.status_code == 404 and 'application/json' not in response.headers.get('Content-Type', '')
+        )
+        if not is_missing_route:
+            response.raise_for_status()
+            return images
+        logger.warning("Server does not support replacing images, clearing and re-adding")
+        _replace_unsupported.add(base_url)
+
+    response = transport.delete(images_url)
+    response.raise_for_status()
+    if images:
+        response = transport.post(images_url, json={'images': images})
+        response.raise_for_status()
+    return images
@@ -0,0 +1,108 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DELAY_MS = 700
+
+
+class DebouncedWriter(QObject):
+    """Coalesces rapid edits of a value and writes only the latest one
+
+    Callers update their UI straight away and submit the new value with the
+    value the server is known to hold. Once no edit has arrived for delay_ms
+    (or on flush) the latest value per key is written on a worker thread.
+    Edits that cancel out (up, then down) send nothing. On failure the last
+    value the server accepted is reported through failed so the caller can
+    roll its UI back.
+    """
+    committed = pyqtSignal(str, object)  # key, value now on the server
+    failed = pyqtSignal(str, object, str)  # key, value still on the server, error message
+    _write_done = pyqtSignal(str, object, str)  # key, value written, error ('' on success)
+
+    def __init__(self, write, delay_ms=DEFAULT_DELAY_MS, parent=None):
+        super().__init__(parent)
+        # write(key, value, previous) returns a truthy value on success
+        self.write = write
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='debounced-writer')
+        self._pending = {}  # key -> latest value not sent yet
+        self._confirmed = {}  # key -> value the server holds while edits are outstanding
+        self._in_flight = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+        # Worker threads emit; the receiver runs on the GUI thread
+        self._write_done.connect(self.on_write_done)
+
+    def submit(self, key, value, confirmed):
+        """Record value as the wanted state for key and restart the quiet period
+
+        confirmed is the value the server holds; only the first one given
+        while edits are outstanding is kept.
+        """
+        self._confirmed.setdefault(key, confirmed)
+        self._pending[key] = value
+        self.timer.start()
+
+    def has_pending(self, key):
+        return key in self._pending or key in self._in_flight
+
+    def discard(self, key):
+        """Forget unsent edits for key, e.g. before the caller writes it another way"""
+        self._pending.pop(key, None)
+        if key not in self._in_flight:
+            self._confirmed.pop(key, None)
+
+    def flush(self, key=None):
+        """Send pending values now, for one key or all of them"""
+        keys = [key] if key is not None else list(self._pending)
+        for key in keys:
+            if key not in self._pending or key in self._in_flight:
+                # A write in flight picks up newer edits when it finishes
+                continue
+            value = self._pending.pop(key)
+            previous = self._confirmed[key]
+            if value == previous:
+                self._confirmed.pop(key)
+                continue
+            self._in_flight.add(key)
+            self.executor.submit(self._run, key, value, previous)
+
+    def _run(self, key, value, previous):
+        try:
+            error = '' if self.write(key, value, previous) else 'Write failed'
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self._write_done.emit(key, value, error)
+
+    def on_write_done(self, key, value, error):
+        self._in_flight.discard(key)
+        if error:
+            logger.error(f"Error writing {key}: {error}")
+            # Edits made on top of the failed value are dropped with it
+            self._pending.pop(key, None)
+            self.failed.emit(key, self._confirmed.pop(key, None), error)
+            return
+        self._confirmed[key] = value
+        self.committed.emit(key, value)
+        if key in self._pending:
+            self.flush(key)
+        else:
+            self._confirmed.pop(key, None)
+
+    def shutdown(self):
+        """Write whatever is pending before returning"""
+        self.timer.stop()
+        self.executor.shutdown(wait=True)
+        # No event loop from here on, so newer edits are written directly
+        for key, value in list(self._pending.items()):
+            if value == self._confirmed.get(key):
+                continue
+            try:
+                if not self.write(key, value, self._confirmed.get(key)):
+                    logger.error(f"Error writing {key} on shutdown")
+            except Exception as e:
+                logger.error(f"Error writing {key} on shutdown: {e}")
+        self._pending.clear()
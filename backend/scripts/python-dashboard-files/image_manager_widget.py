@@ -1,7 +1,6 @@
 import sys
 import os
 import logging
-import requests
 import cloudinary
 import cloudinary.uploader
 from PyQt6.QtWidgets import (
@@ -11,8 +10,12 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QImage
-import urllib.request
 from dotenv import load_dotenv
+from api_transport import ApiTransport, replace_product_images
+from image_pipeline import ImageCache
+from debounced_writer import DebouncedWriter
+from upload_service import UploadService, UploadProgressDialog
+from image_preprocess import preprocessor_from_env
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +36,7 @@ cloudinary.config(
 )
 
 class ImageThumbnail(QFrame):
+    IMAGE_SIZE = (150, 150)
     clicked = pyqtSignal()
     delete_clicked = pyqtSignal()
     move_up_clicked = pyqtSignal()
@@ -47,25 +51,22 @@ class ImageThumbnail(QFrame):
         layout = QVBoxLayout()
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
         
-        # Image display
-        image_label = QLabel()
-        image_label.setFixedSize(150, 150)
-        image_label.setScaledContents(True)
+        # Image display: a placeholder until the loader delivers the image
+        self.image_label = QLabel("Loading...")
+        self.image_label.setFixedSize(*self.IMAGE_SIZE)
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        # Load and display image
-        try:
-            if self.image_url.startswith(('http://', 'https://')):
-                data = urllib.request.urlopen(self.image_url).read()
-                image = QImage()
-                image.loadFromData(data)
+        if self.image_url.startswith(('http://', 'https://')):
+            url, requester, size = self.image_url, id(self), self.IMAGE_SIZE
+            # Drop the download if the grid is rebuilt before it finishes
+            self.destroyed.connect(lambda _=None: ImageCache.instance().unsubscribe(url, requester, size))
+            ImageCache.instance().subscribe(url, requester, self.set_image, self.set_failed, size)
+        else:
+            image = QImage(self.image_url)
+            if image.isNull():
+                self.set_failed("Could not read file")
             else:
-                image = QImage(self.image_url)
-            
-            pixmap = QPixmap.fromImage(image)
-            image_label.setPixmap(pixmap)
-        except Exception as e:
-            logger.error(f"Error loading image {self.image_url}: {e}")
-            image_label.setText("Error loading image")
+                self.set_image(QPixmap.fromImage(image))
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -82,18 +83,36 @@ class ImageThumbnail(QFrame):
         button_layout.addWidget(down_button)
         button_layout.addWidget(delete_button)
         
-        layout.addWidget(image_label)
+        layout.addWidget(self.image_label)
         layout.addLayout(button_layout)
         self.setLayout(layout)
+    
+    def set_image(self, pixmap):
+        self.image_label.setPixmap(pixmap.scaled(*self.IMAGE_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                                                 Qt.TransformationMode.SmoothTransformation))
+    
+    def set_failed(self, message):
+        logger.error(f"Error loading image {self.image_url}: {message}")
+        self.image_label.setText("Error loading image")
 
 class ImageManagerWidget(QWidget):
     images_updated = pyqtSignal(list)  # Emitted when images are changed
     
-    def __init__(self, parent=None):
+    def __init__(self, transport=None, parent=None):
         super().__init__(parent)
         self.api_base_url = os.getenv('API_BASE_URL', 'http://localhost:5001/api')
+        # Pooled session with timeouts and retries, shared with the reorder writer's thread
+        self.transport = transport or ApiTransport()
         self.image_urls = []
+        self.server_urls = None  # Image order last confirmed by the server
         self.current_product_id = None
+        self.uploads = UploadService(preprocessor=preprocessor_from_env(), parent=self)
+        self.uploads.batch_finished.connect(self.handle_upload_finished)
+        self.upload_dialogs = {}  # batch id -> progress dialog
+        # Up/down clicks are shown at once and sent as one reorder when they stop
+        self.reorder_writer = DebouncedWriter(self.write_image_order, parent=self)
+        self.reorder_writer.committed.connect(self.handle_reorder_committed)
+        self.reorder_writer.failed.connect(self.handle_reorder_failed)
         self.setup_ui()
         
         # Verify Cloudinary configuration
@@ -130,8 +149,11 @@ class ImageManagerWidget(QWidget):
         
     def set_product(self, product_id):
         """Set the current product and load its images"""
+        self.reorder_writer.flush()
         self.current_product_id = product_id
+        self.server_urls = None
         self.load_product_images()
+        self.resume_interrupted_uploads()
         
     def load_product_images(self):
         """Load images for the current product"""
@@ -139,12 +161,13 @@ class ImageManagerWidget(QWidget):
             return
             
         try:
-            response = requests.get(f"{self.api_base_url}/products/{self.current_product_id}")
+            response = self.transport.get(f"{self.api_base_url}/products/{self.current_product_id}")
             if response.ok:
                 product = response.json()
                 if 'images' in product:
                     sorted_images = sorted(product['images'], key=lambda x: x.get('order', 0))
                     self.image_urls = [img['url'] for img in sorted_images]
+                    self.server_urls = list(self.image_urls)
                     self.update_image_grid()
         except Exception as e:
             logger.error(f"Error loading product images: {e}")
@@ -188,51 +211,92 @@ class ImageManagerWidget(QWidget):
                            os.getenv('CLOUDINARY_API_SECRET')]):
                     raise Exception("Missing Cloudinary configuration in .env file")
                 
-                # Upload to Cloudinary
-                uploaded_urls = []
-                for path in filenames:
-                    if os.path.exists(path):
-                        logger.info(f"Uploading image: {path}")
-                        response = cloudinary.uploader.upload(path)
-                        url = response['secure_url']
-                        uploaded_urls.append(url)
-                        logger.info(f"Successfully uploaded to: {url}")
-                
-                if uploaded_urls:
-                    # Add new images to product
-                    self.image_urls.extend(uploaded_urls)
-                    self.update_product_images()
+                # Upload to Cloudinary in the background
+                if filenames:
+                    self.start_upload(filenames, self.current_product_id)
             except Exception as e:
                 logger.error(f"Error uploading images: {e}")
                 QMessageBox.critical(self, "Error", f"Failed to upload images: {str(e)}")
                 
-    def update_product_images(self):
-        """Update product with current image order"""
-        if not self.current_product_id:
+    def start_upload(self, paths, product_id, batch_id=None):
+        """Upload with per-file progress; a known batch_id resumes an interrupted batch"""
+        dialog = UploadProgressDialog(self.uploads, paths, self)
+        if batch_id is None:
+            batch_id = self.uploads.start_batch(paths, product_id)
+        else:
+            self.uploads.resume_batch(batch_id)
+        dialog.track(batch_id)
+        self.upload_dialogs[batch_id] = dialog
+        dialog.show()
+        
+    def handle_upload_finished(self, batch_id, summary):
+        dialog = self.upload_dialogs.pop(batch_id, None)
+        if dialog:
+            dialog.close_dialog()
+        if summary['cancelled']:
             return
             
+        urls = summary['urls']
+        if urls:
+            if summary['product_id'] == self.current_product_id:
+                # Add new images to product
+                self.image_urls.extend(urls)
+                self.update_product_images()
+            else:
+                self.append_product_images(summary['product_id'], urls)
+                
+        if summary['failed']:
+            failures = "\n".join(f"{os.path.basename(path)}: {error}"
+                                  for path, error in summary['failed'].items())
+            QMessageBox.warning(self, "Upload Incomplete",
+                                f"{len(summary['failed'])} image(s) failed to upload:\n{failures}")
+                
+    def append_product_images(self, product_id, urls):
+        """Add images to a product that is no longer the one shown"""
         try:
-            # First clear existing images
-            response = requests.delete(
-                f"{self.api_base_url}/products/{self.current_product_id}/images"
+            response = self.transport.post(
+                f"{self.api_base_url}/products/{product_id}/images",
+                json={'images': [{'url': url} for url in urls]}
             )
             if not response.ok:
-                raise Exception("Failed to clear existing images")
-                
-            # Create image objects with order
-            images = [{'url': url, 'order': i} for i, url in enumerate(self.image_urls)]
-            
-            # Update product with new images
-            response = requests.post(
-                f"{self.api_base_url}/products/{self.current_product_id}/images",
-                json={'images': images}
-            )
+                raise Exception("Failed to add images")
+        except Exception as e:
+            logger.error(f"Error adding images to product {product_id}: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to add uploaded images: {str(e)}")
             
-            if response.ok:
-                self.update_image_grid()
-                self.images_updated.emit(self.image_urls)
+    def resume_interrupted_uploads(self):
+        """Offer to finish uploads for this product that were cut off last time"""
+        batches = self.uploads.queue.unfinished_batches(self.current_product_id)
+        batches = [(batch_id, batch) for batch_id, batch in batches if batch_id not in self.upload_dialogs]
+        if not batches:
+            return
+        count = sum(len(batch['paths']) for _, batch in batches)
+        reply = QMessageBox.question(
+            self, "Resume Uploads",
+            f"{count} image(s) for this product were not finished uploading. Resume them now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        for batch_id, batch in batches:
+            if reply == QMessageBox.StandardButton.Yes:
+                self.start_upload(batch['paths'], batch['product_id'], batch_id)
             else:
-                raise Exception(f"Failed to update images: {response.status_code}")
+                self.uploads.queue.finish_batch(batch_id)
+            
+    def update_product_images(self):
+        """Update product with current image order"""
+        if not self.current_product_id:
+            return
+            
+        try:
+            # A reorder or a replace, in one request; it also covers unsent reorders
+            self.reorder_writer.discard(self.current_product_id)
+            replace_product_images(
+                self.transport, self.api_base_url, self.current_product_id,
+                self.image_urls, self.server_urls
+            )
+            self.server_urls = list(self.image_urls)
+            self.update_image_grid()
+            self.images_updated.emit(self.image_urls)
         except Exception as e:
             logger.error(f"Error updating product images: {e}")
             QMessageBox.critical(self, "Error", f"Failed to update images: {str(e)}")
@@ -251,11 +315,12 @@ class ImageManagerWidget(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                response = requests.delete(
+                response = self.transport.delete(
                     f"{self.api_base_url}/products/{self.current_product_id}/images"
                 )
                 if response.ok:
                     self.image_urls = []
+                    self.server_urls = []
                     self.update_image_grid()
                     self.images_updated.emit(self.image_urls)
                 else:
@@ -274,15 +339,41 @@ class ImageManagerWidget(QWidget):
         """Move an image up in the order"""
         idx = self.image_urls.index(url)
         if idx > 0:
-            self.image_urls[idx], self.image_urls[idx-1] = self.image_urls[idx-1], self.image_urls[idx]
-            self.update_product_images()
+            self.move_image(idx, idx - 1)
             
     def move_image_down(self, url):
         """Move an image down in the order"""
         idx = self.image_urls.index(url)
         if idx < len(self.image_urls) - 1:
-            self.image_urls[idx], self.image_urls[idx+1] = self.image_urls[idx+1], self.image_urls[idx]
-            self.update_product_images()
+            self.move_image(idx, idx + 1)
+            
+    def move_image(self, idx, new_idx):
+        """Swap two images locally; the server is updated once the clicks stop"""
+        self.image_urls[idx], self.image_urls[new_idx] = self.image_urls[new_idx], self.image_urls[idx]
+        self.update_image_grid()
+        self.reorder_writer.submit(self.current_product_id, list(self.image_urls), self.server_urls)
+        
+    def write_image_order(self, product_id, image_urls, previous_urls):
+        # Runs on the writer's worker thread
+        replace_product_images(self.transport, self.api_base_url, product_id, image_urls, previous_urls)
+        return True
+        
+    def handle_reorder_committed(self, product_id, image_urls):
+        if product_id == self.current_product_id:
+            self.server_urls = list(image_urls)
+            if not self.reorder_writer.has_pending(product_id):
+                self.images_updated.emit(self.image_urls)
+            
+    def handle_reorder_failed(self, product_id, previous_urls, error):
+        if product_id == self.current_product_id and previous_urls is not None:
+            self.image_urls = list(previous_urls)
+            self.update_image_grid()
+        QMessageBox.critical(self, "Error", f"Failed to reorder images: {error}")
+        
+    def hideEvent(self, event):
+        # Send pending reorders before the widget goes away
+        self.reorder_writer.flush()
+        super().hideEvent(event)
 
 def main():
     # Load environment variables
@@ -290,7 +381,11 @@ def main():
     load_dotenv(env_path)
     
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(ImageCache.instance().shutdown)
     widget = ImageManagerWidget()
+    app.aboutToQuit.connect(widget.uploads.shutdown)
+    app.aboutToQuit.connect(widget.reorder_writer.shutdown)
+    app.aboutToQuit.connect(widget.transport.close)
     widget.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,490 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import Qt, QObject, QStandardPaths, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from api_transport import ApiTransport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BYTES = 128 * 1024 * 1024  # Decoded pixels, not file size
+DEFAULT_DISK_BYTES = 512 * 1024 * 1024
+DEFAULT_FRESHNESS = 3600  # Seconds a file is trusted when the server sends no max-age
+
+
+def max_age(headers, default=DEFAULT_FRESHNESS):
+    """Seconds a response may be reused without revalidation, from Cache-Control"""
+    for directive in (headers.get('Cache-Control') or '').split(','):
+        directive = directive.strip().lower()
+        if directive in ('no-cache', 'no-store'):
+            return 0
+        if directive.startswith('max-age='):
+            try:
+                return int(directive.split('=', 1)[1])
+            except ValueError:
+                return default
+    return default
+
+
+CLOUDINARY_UPLOAD_PATH = '/image/upload/'
+
+
+def sized_url(url, size=None):
+    """Ask Cloudinary for a derived image no larger than size (width, height)
+
+    c_limit keeps the aspect ratio and never upscales; f_auto/q_auto let
+    Cloudinary pick the format and quality. Other URLs are returned as is.
+    """
+    if not size or 'res.cloudinary.com' not in url or CLOUDINARY_UPLOAD_PATH not in url:
+        return url
+    width, height = size
+    head, tail = url.split(CLOUDINARY_UPLOAD_PATH, 1)
+    return f"{head}{CLOUDINARY_UPLOAD_PATH}c_limit,w_{width},h_{height},f_auto,q_auto/{tail}"
+
+
+def image_key(url, size=None):
+    """Cache key for an image at a given display size"""
+    return f"{url}#{size[0]}x{size[1]}" if size else url
+
+
+def default_cache_dir():
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    if not base:
+        base = tempfile.gettempdir()
+    return os.path.join(base, 'ecommerce-dashboard', 'images')
+
+
+class MemoryImageCache:
+    """LRU of decoded QImages, bounded by the bytes the pixels take in memory"""
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def peek(self, key):
+        """Like get, but not counted as a hit or miss and without touching the LRU order"""
+        with self._lock:
+            return self._images.get(key)
+
+    def put(self, key, image):
+        size = image.sizeInBytes()
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self._bytes -= old.sizeInBytes()
+            # An image larger than the whole budget is not worth keeping
+            if size > self.max_bytes:
+                return
+            self._images[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= evicted.sizeInBytes()
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._images),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+class DiskImageCache:
+    """Content-addressed store of downloaded image files with HTTP revalidation
+
+    Files are named by the SHA-256 of their bytes, so the same image served
+    under several URLs is stored once. index.json maps each URL to its file
+    and the ETag/Last-Modified validators needed for conditional requests.
+    """
+
+    INDEX_FILE = 'index.json'
+    SAVE_EVERY = 20  # Index changes between saves
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_DISK_BYTES, transport=None):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.transport = transport or ApiTransport()
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self.entries = self.load_index()
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def load_index(self):
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    entries = json.load(f)
+                # Drop entries whose file was removed behind our back
+                return {url: entry for url, entry in entries.items()
+                        if os.path.exists(self.blob_path(entry['hash']))}
+        except Exception as e:
+            logger.error(f"Error loading image cache index: {e}")
+        return {}
+
+    def save_index(self):
+        """Write the index atomically; caller holds the lock"""
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, path)
+            self._dirty = 0
+        except Exception as e:
+            logger.error(f"Error saving image cache index: {e}")
+
+    def mark_dirty(self):
+        self._dirty += 1
+        if self._dirty >= self.SAVE_EVERY:
+            self.save_index()
+
+    def read_blob(self, digest):
+        try:
+            with open(self.blob_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write_blob(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def fetch(self, url):
+        """Return the image bytes for url, revalidating a stored copy if there is one"""
+        with self._lock:
+            entry = self.entries.get(url)
+        cached = self.read_blob(entry['hash']) if entry else None
+
+        headers = {}
+        if cached is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        # Fresh copies, and copies without validators, are used as is
+        if cached is not None and (not headers or entry.get('expires', 0) > time.time()):
+            self.touch(url)
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        try:
+            response = self.transport.get(url, headers=headers)
+        except Exception as e:
+            if cached is not None:
+                # Offline: a possibly stale image beats no image
+                logger.warning(f"Using cached image, revalidation failed for {url}: {e}")
+                return cached
+            raise
+
+        if response.status_code == 304 and cached is not None:
+            self.touch(url, expires=time.time() + max_age(response.headers))
+            with self._lock:
+                self.revalidated += 1
+            return cached
+
+        response.raise_for_status()
+        data = response.content
+        self.store(url, data, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                   expires=time.time() + max_age(response.headers))
+        with self._lock:
+            self.misses += 1
+        return data
+
+    def touch(self, url, expires=None):
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry:
+                entry['accessed'] = time.time()
+                if expires is not None:
+                    entry['expires'] = expires
+                self.mark_dirty()
+
+    def store(self, url, data, etag=None, last_modified=None, expires=0):
+        digest = self.write_blob(data)
+        with self._lock:
+            self.entries[url] = {
+                'hash': digest,
+                'size': len(data),
+                'etag': etag,
+                'last_modified': last_modified,
+                'expires': expires,
+                'accessed': time.time()
+            }
+            self.evict()
+            self.mark_dirty()
+
+    def evict(self):
+        """Drop least recently used files until the store fits; caller holds the lock"""
+        sizes = {}
+        for entry in self.entries.values():
+            sizes[entry['hash']] = entry['size']
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        # A file is only deleted once no URL points at it any more
+        for url, entry in sorted(self.entries.items(), key=lambda item: item[1]['accessed']):
+            if total <= self.max_bytes:
+                break
+            del self.entries[url]
+            self.evictions += 1
+            digest = entry['hash']
+            if any(other['hash'] == digest for other in self.entries.values()):
+                continue
+            total -= sizes[digest]
+            try:
+                os.remove(self.blob_path(digest))
+            except OSError:
+                pass
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self.save_index()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': sum({e['hash']: e['size'] for e in self.entries.values()}.values()),
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+class TieredImageCache:
+    """Decoded images in memory in front of encoded files on disk"""
+
+    def __init__(self, memory=None, disk=None):
+        self.memory = memory or MemoryImageCache()
+        self.disk = disk or DiskImageCache()
+
+    def cached_image(self, url, size=None):
+        """Return a decoded image if it is already in memory, without any I/O"""
+        return self.memory.get(image_key(url, size))
+
+    def load_image(self, url, size=None):
+        """Return a decoded QImage for url, going to disk and network as needed
+
+        With a size the image is fetched as a Cloudinary derived image where
+        possible, and scaled down here otherwise, so only the displayed
+        resolution is kept in memory. Safe to call from worker threads: QImage,
+        unlike QPixmap, may be created outside the GUI thread.
+        """
+        key = image_key(url, size)
+        # Callers have already been counted by cached_image; this only catches
+        # an image another worker finished in the meantime
+        image = self.memory.peek(key)
+        if image is not None:
+            return image
+
+        data = self.disk.fetch(sized_url(url, size))
+        image = QImage()
+        if not image.loadFromData(data):
+            raise ValueError(f"Could not decode image from {url}")
+        if size and (image.width() > size[0] or image.height() > size[1]):
+            image = image.scaled(size[0], size[1], Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        self.memory.put(key, image)
+        return image
+
+    def flush(self):
+        self.disk.flush()
+
+    def stats(self):
+        return {'memory': self.memory.stats(), 'disk': self.disk.stats()}
+
+
+class ImageLoader(QObject):
+    """Loads images on a fixed pool of worker threads and reports back by signal
+
+    Workers only produce QImages. Signals cross back to the GUI thread, where
+    receivers turn them into QPixmaps. Concurrent requests for the same URL
+    share one download, and a download nobody is waiting for any more is
+    dropped before it starts.
+    """
+    image_loaded = pyqtSignal(str, QImage)  # image_key(url, size), decoded image
+    image_failed = pyqtSignal(str, str)  # image_key(url, size), error message
+
+    ANONYMOUS = object()  # Requester that never cancels
+
+    def __init__(self, cache=None, max_workers=6, parent=None):
+        super().__init__(parent)
+        self.cache = cache or TieredImageCache()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-loader')
+        self._pending = {}  # image key -> (future, set of requesters)
+        self._lock = threading.Lock()
+
+    def request(self, url, requester=None, size=None):
+        """Return the image if it is in memory, otherwise queue a load and return None
+
+        Asking again for an image already in flight only registers the requester.
+        """
+        image = self.cache.cached_image(url, size)
+        if image is not None:
+            return image
+
+        key = image_key(url, size)
+        requester = self.ANONYMOUS if requester is None else requester
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                pending[1].add(requester)
+                return None
+            future = self.executor.submit(self._load, url, size)
+            self._pending[key] = (future, {requester})
+        return None
+
+    def cancel(self, url, requester, size=None):
+        """Withdraw a requester; the load is dropped once nobody is waiting"""
+        key = image_key(url, size)
+        with self._lock:
+            pending = self._pending.get(key)
+            if not pending:
+                return
+            future, requesters = pending
+            requesters.discard(requester)
+            if not requesters and future.cancel():
+                del self._pending[key]
+
+    def is_loading(self, url, size=None):
+        with self._lock:
+            return image_key(url, size) in self._pending
+
+    def _load(self, url, size):
+        key = image_key(url, size)
+        # Connection failures, 429 and 5xx are already retried by the transport
+        try:
+            image = self.cache.load_image(url, size)
+        except Exception as e:
+            logger.error(f"Error loading image {url}: {e}")
+            with self._lock:
+                self._pending.pop(key, None)
+            self.image_failed.emit(key, str(e))
+            return
+        with self._lock:
+            self._pending.pop(key, None)
+        self.image_loaded.emit(key, image)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.flush()
+
+
+class ImageCache:
+    """Process-wide image service for widgets: bounded caches behind one loader
+
+    Lives on the GUI thread and hands out QPixmaps to subscribers.
+    """
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        # Created from the GUI thread, so loader signals are delivered there
+        self.cache = TieredImageCache()
+        self.loader = ImageLoader(self.cache)
+        self.loader.image_loaded.connect(self.on_image_loaded)
+        self.loader.image_failed.connect(self.on_image_failed)
+        self.subscribers = {}  # image key -> {requester: (on_ready, on_failed)}
+
+    def get_image(self, url, requester=None, size=None):
+        """Return a pixmap if the image is ready, otherwise start loading it"""
+        image = self.loader.request(url, requester, size)
+        if image is not None:
+            return QPixmap.fromImage(image)
+        return None
+
+    def subscribe(self, url, requester, on_ready, on_failed, size=None):
+        """Deliver the image to on_ready (now if cached) or the error to on_failed
+
+        size is the display size in pixels; the image is fetched and kept at
+        that size rather than at full resolution.
+        """
+        image = self.loader.request(url, requester, size)
+        if image is not None:
+            on_ready(QPixmap.fromImage(image))
+            return
+        self.subscribers.setdefault(image_key(url, size), {})[requester] = (on_ready, on_failed)
+
+    def unsubscribe(self, url, requester, size=None):
+        key = image_key(url, size)
+        callbacks = self.subscribers.get(key)
+        if callbacks is not None:
+            callbacks.pop(requester, None)
+            if not callbacks:
+                del self.subscribers[key]
+        self.loader.cancel(url, requester, size)
+
+    def on_image_loaded(self, key, image):
+        callbacks = self.subscribers.pop(key, {})
+        if callbacks:
+            pixmap = QPixmap.fromImage(image)  # One conversion shared by every subscriber
+            for on_ready, _ in callbacks.values():
+                on_ready(pixmap)
+
+    def on_image_failed(self, key, message):
+        for _, on_failed in self.subscribers.pop(key, {}).values():
+            on_failed(message)
+
+    def cancel(self, url, requester, size=None):
+        self.loader.cancel(url, requester, size)
+
+    def shutdown(self):
+        self.loader.shutdown()
+
+    def stats(self):
+        return self.cache.stats()
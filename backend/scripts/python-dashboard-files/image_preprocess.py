@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
+
+# Kept free of Qt and Cloudinary imports: this module is loaded by the
+# worker processes as well (they are spawned, not forked, since the pool is
+# started from a thread of a multithreaded Qt process).
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DIMENSION = 2400
+DEFAULT_FORMAT = 'WEBP'
+DEFAULT_QUALITY = 82
+FORMAT_EXTENSIONS = {'WEBP': '.webp', 'JPEG': '.jpg'}
+
+
+def default_output_dir():
+    return os.path.join(tempfile.gettempdir(), 'ecommerce-dashboard', 'preprocessed')
+
+
+def output_name(path, settings):
+    """Derive a stable file name from the source file and the settings used"""
+    stat = os.stat(path)
+    source = f"{os.path.abspath(path)}|{stat.st_size}|{int(stat.st_mtime)}|{sorted(settings.items())}"
+    return hashlib.sha256(source.encode()).hexdigest()[:32]
+
+
+def preprocess_image(path, output_dir, max_dimension=DEFAULT_MAX_DIMENSION, image_format=DEFAULT_FORMAT,
+                     quality=DEFAULT_QUALITY, thumbnail_size=None):
+    """Downscale, strip metadata and re-encode one image
+
+    Returns a dict with the path to upload (the original if re-encoding
+    would not make it smaller) and the optional thumbnail path. Runs in a
+    worker process, so it only takes and returns plain values.
+    """
+    image_format = image_format.upper()
+    settings = {'max': max_dimension, 'format': image_format, 'quality': quality, 'thumb': thumbnail_size}
+    name = output_name(path, settings)
+    out_path = os.path.join(output_dir, name + FORMAT_EXTENSIONS[image_format])
+    thumb_path = os.path.join(output_dir, name + '_thumb' + FORMAT_EXTENSIONS[image_format]) if thumbnail_size else None
+    # Marks an earlier run that decided the original was the better upload
+    keep_path = os.path.join(output_dir, name + '.keep')
+    original_bytes = os.path.getsize(path)
+
+    # Already done by an earlier run
+    if not thumb_path or os.path.exists(thumb_path):
+        if os.path.exists(out_path):
+            return {'source': path, 'path': out_path, 'thumbnail': thumb_path,
+                    'original_bytes': original_bytes, 'bytes': os.path.getsize(out_path)}
+        if os.path.exists(keep_path):
+            return {'source': path, 'path': path, 'thumbnail': thumb_path,
+                    'original_bytes': original_bytes, 'bytes': original_bytes}
+
+    os.makedirs(output_dir, exist_ok=True)
+    with Image.open(path) as opened:
+        # Apply the EXIF orientation before the EXIF block is dropped
+        image = ImageOps.exif_transpose(opened)
+        resized = max(image.size) > max_dimension
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+        if image_format == 'JPEG':
+            image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        # Only the colour profile is carried over; EXIF, GPS and XMP are not
+        save_options = {'quality': quality}
+        if opened.info.get('icc_profile'):
+            save_options['icc_profile'] = opened.info['icc_profile']
+        if image_format == 'JPEG':
+            save_options.update(optimize=True, progressive=True)
+        else:
+            save_options['method'] = 4
+
+        has_metadata = bool(opened.info.get('exif') or opened.info.get('xmp'))
+
+        tmp_path = out_path + '.tmp'
+        image.save(tmp_path, image_format, **save_options)
+        os.replace(tmp_path, out_path)
+
+        if thumb_path:
+            thumb = image.copy()
+            thumb.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
+            tmp_thumb_path = thumb_path + '.tmp'
+            thumb.save(tmp_thumb_path, image_format, quality=quality)
+            os.replace(tmp_thumb_path, thumb_path)
+
+    processed_bytes = os.path.getsize(out_path)
+    if not resized and not has_metadata and processed_bytes >= original_bytes:
+        # Re-encoding a small, clean, already compressed file can make it bigger
+        open(keep_path, 'w').close()
+        os.remove(out_path)
+        out_path, processed_bytes = path, original_bytes
+
+    return {'source': path, 'path': out_path, 'thumbnail': thumb_path,
+            'original_bytes': original_bytes, 'bytes': processed_bytes}
+
+
+class ImagePreprocessor:
+    """Runs preprocess_image for many files on a process pool"""
+
+    def __init__(self, max_dimension=DEFAULT_MAX_DIMENSION, image_format=DEFAULT_FORMAT,
+                 quality=DEFAULT_QUALITY, thumbnail_size=None, output_dir=None, max_workers=None):
+        if image_format.upper() not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        self.settings = {
+            'max_dimension': max_dimension,
+            'image_format': image_format.upper(),
+            'quality': quality,
+            'thumbnail_size': thumbnail_size
+        }
+        self.output_dir = output_dir or default_output_dir()
+        self.executor = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, path):
+        """Start preprocessing path; the future resolves to preprocess_image's dict"""
+        return self.executor.submit(preprocess_image, path, self.output_dir, **self.settings)
+
+    def process(self, path):
+        """Preprocess path and return the file to upload, falling back to the original"""
+        try:
+            result = self.submit(path).result()
+        except Exception as e:
+            logger.error(f"Error preprocessing {path}, uploading original: {e}")
+            return path
+        logger.info(f"Preprocessed {path}: {result['original_bytes']} -> {result['bytes']} bytes")
+        return result['path']
+
+    def shutdown(self):
+        # Waits for images being encoded right now; queued ones are dropped
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def preprocessor_from_env():
+    """Build a preprocessor from IMAGE_PREPROCESS* settings, or None when disabled"""
+    if os.getenv('IMAGE_PREPROCESS', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    thumbnail = int(os.getenv('IMAGE_THUMBNAIL_SIZE', '0'))
+    return ImagePreprocessor(
+        max_dimension=int(os.getenv('IMAGE_MAX_DIMENSION', DEFAULT_MAX_DIMENSION)),
+        image_format=os.getenv('IMAGE_FORMAT', DEFAULT_FORMAT),
+        quality=int(os.getenv('IMAGE_QUALITY', DEFAULT_QUALITY)),
+        thumbnail_size=(thumbnail, thumbnail) if thumbnail else None
+    )
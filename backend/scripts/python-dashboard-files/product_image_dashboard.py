@@ -9,15 +9,20 @@ import subprocess
 import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QListWidget, QFileDialog, QMessageBox,
+    QPushButton, QLabel, QListWidget, QListWidgetItem, QFileDialog, QMessageBox,
     QScrollArea, QFrame, QGridLayout, QStatusBar
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QProcess, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal, QProcess, QTimer, QThread, QEvent
 from PyQt6.QtGui import QPixmap, QImage
 from PIL import Image
 import io
-import urllib.request
 from dotenv import load_dotenv
+from api_transport import ApiTransport, iter_pages, replace_product_images
+from image_pipeline import ImageCache
+from debounced_writer import DebouncedWriter
+from product_prefetch import ProductPrefetcher
+from upload_service import UploadService, UploadProgressDialog
+from image_preprocess import preprocessor_from_env
 
 # Configure logging
 logging.basicConfig(
@@ -37,7 +42,15 @@ cloudinary.config(
     api_secret=os.getenv('CLOUDINARY_API_SECRET')
 )
 
+# Listed products above and below the visible ones whose documents are prefetched
+PREFETCH_MARGIN = 20
+
+def image_urls(product):
+    """Image URLs of a product document in display order"""
+    return [img['url'] for img in sorted(product.get('images') or [], key=lambda x: x.get('order', 0))]
+
 class ImageThumbnail(QFrame):
+    IMAGE_SIZE = (150, 150)
     clicked = pyqtSignal()
     delete_clicked = pyqtSignal()
     move_up_clicked = pyqtSignal()
@@ -52,25 +65,22 @@ class ImageThumbnail(QFrame):
         layout = QVBoxLayout()
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
         
-        # Image display
-        image_label = QLabel()
-        image_label.setFixedSize(150, 150)
-        image_label.setScaledContents(True)
+        # Image display: a placeholder until the loader delivers the image
+        self.image_label = QLabel("Loading...")
+        self.image_label.setFixedSize(*self.IMAGE_SIZE)
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        # Load and display image
-        try:
-            if self.image_url.startswith(('http://', 'https://')):
-                data = urllib.request.urlopen(self.image_url).read()
-                image = QImage()
-                image.loadFromData(data)
+        if self.image_url.startswith(('http://', 'https://')):
+            url, requester, size = self.image_url, id(self), self.IMAGE_SIZE
+            # Drop the download if the grid is rebuilt before it finishes
+            self.destroyed.connect(lambda _=None: ImageCache.instance().unsubscribe(url, requester, size))
+            ImageCache.instance().subscribe(url, requester, self.set_image, self.set_failed, size)
+        else:
+            image = QImage(self.image_url)
+            if image.isNull():
+                self.set_failed("Could not read file")
             else:
-                image = QImage(self.image_url)
-            
-            pixmap = QPixmap.fromImage(image)
-            image_label.setPixmap(pixmap)
-        except Exception as e:
-            logger.error(f"Error loading image {self.image_url}: {e}")
-            image_label.setText("Error loading image")
+                self.set_image(QPixmap.fromImage(image))
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -87,9 +97,38 @@ class ImageThumbnail(QFrame):
         button_layout.addWidget(down_button)
         button_layout.addWidget(delete_button)
         
-        layout.addWidget(image_label)
+        layout.addWidget(self.image_label)
         layout.addLayout(button_layout)
         self.setLayout(layout)
+    
+    def set_image(self, pixmap):
+        self.image_label.setPixmap(pixmap.scaled(*self.IMAGE_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                                                 Qt.TransformationMode.SmoothTransformation))
+    
+    def set_failed(self, message):
+        logger.error(f"Error loading image {self.image_url}: {message}")
+        self.image_label.setText("Error loading image")
+
+class ProductPageLoader(QThread):
+    """Stream product pages from the API off the GUI thread"""
+    page_loaded = pyqtSignal(list, int)  # products on this page, products loaded so far
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, api_client, page_size=200):
+        super().__init__()
+        self.api_client = api_client
+        self.page_size = page_size
+
+    def run(self):
+        loaded = 0
+        try:
+            for products in self.api_client.iter_product_pages(self.page_size):
+                loaded += len(products)
+                self.page_loaded.emit(products, loaded)
+            self.finished.emit(True, f"Loaded {loaded} products")
+        except Exception as e:
+            logger.error(f"Error loading products: {e}")
+            self.finished.emit(False, str(e))
 
 class ProductImageDashboard(QMainWindow):
     def __init__(self):
@@ -97,6 +136,9 @@ class ProductImageDashboard(QMainWindow):
         self.api_client = ApiClient()
         self.current_product = None
         self.image_urls = []
+        self.product_loader = None
+        self.upload_dialogs = {}  # batch id -> progress dialog
+        self.resume_checked = False
         self.db_process = None
         self.server_running = False
         self.retry_timer = QTimer()
@@ -110,6 +152,19 @@ class ProductImageDashboard(QMainWindow):
             QMessageBox.critical(self, "Error", "Missing Cloudinary configuration in .env file")
             sys.exit(1)
             
+        self.api_client.uploads.batch_finished.connect(self.handle_upload_finished)
+        # Up/down clicks are shown at once and sent as one reorder when they stop
+        self.reorder_writer = DebouncedWriter(self.write_image_order, parent=self)
+        self.reorder_writer.failed.connect(self.handle_reorder_failed)
+        self.reorder_writer.committed.connect(lambda product_id, _: self.prefetcher.invalidate(product_id))
+        # Full products for the listed rows on screen and around them
+        self.prefetcher = ProductPrefetcher(self.api_client.get_product_by_id, parent=self)
+        self.prefetcher.product_loaded.connect(self.handle_product_loaded)
+        self.prefetcher.product_failed.connect(self.handle_product_failed)
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(150)
+        self.prefetch_timer.timeout.connect(self.prefetch_visible_products)
         self.setup_ui()
         
     def setup_ui(self):
@@ -143,6 +198,7 @@ class ProductImageDashboard(QMainWindow):
         
         self.product_list = QListWidget()
         self.product_list.itemClicked.connect(self.load_product_images)
+        self.product_list.verticalScrollBar().valueChanged.connect(self.prefetch_timer.start)
         left_layout.addWidget(self.product_list)
         
         # Right panel - Image management
@@ -323,48 +379,110 @@ class ProductImageDashboard(QMainWindow):
         if not self.server_running:
             logger.warning("Cannot load products - server not running")
             return
+        if self.product_loader and self.product_loader.isRunning():
+            return
             
-        try:
-            self.status_bar.showMessage("Loading products...")
-            self.refresh_button.setEnabled(False)
-            
-            products = self.api_client.get_products()
-            self.product_list.clear()
-            
-            if not products:
-                logger.warning("No products found")
-                self.status_bar.showMessage("No products found")
-            else:
-                for product in products:
-                    item_text = f"{product.get('name', 'Unnamed')} (ID: {product.get('_id', 'No ID')})"
-                    logger.debug(f"Adding product: {item_text}")
-                    self.product_list.addItem(item_text)
-                self.status_bar.showMessage(f"Loaded {len(products)} products")
-                
-        except Exception as e:
-            logger.error(f"Error loading products: {e}")
+        self.status_bar.showMessage("Loading products...")
+        self.refresh_button.setEnabled(False)
+        self.product_list.clear()
+        
+        # Pages are added to the list as they arrive
+        self.product_loader = ProductPageLoader(self.api_client)
+        self.product_loader.page_loaded.connect(self.add_product_page)
+        self.product_loader.finished.connect(self.handle_products_loaded)
+        self.product_loader.start()
+        
+    def add_product_page(self, products, loaded):
+        for product in products:
+            item_text = f"{product.get('name', 'Unnamed')} (ID: {product.get('_id', 'No ID')})"
+            item = QListWidgetItem(item_text)
+            item.setData(Qt.ItemDataRole.UserRole, (product.get('_id'), product.get('updatedAt')))
+            self.product_list.addItem(item)
+        # The listing already carries full documents
+        self.prefetcher.seed(p for p in products if 'images' in p)
+        self.status_bar.showMessage(f"Loading products... {loaded}")
+        self.prefetch_timer.start()
+        
+    def handle_products_loaded(self, success, message):
+        if not success:
             self.status_bar.showMessage("Error loading products")
-        finally:
-            if self.server_running:
-                self.refresh_button.setEnabled(True)
+        elif self.product_list.count() == 0:
+            logger.warning("No products found")
+            self.status_bar.showMessage("No products found")
+        else:
+            logger.info(message)
+            self.status_bar.showMessage(message)
+        if self.server_running:
+            self.refresh_button.setEnabled(True)
+        if success and not self.resume_checked:
+            self.resume_checked = True
+            self.resume_interrupted_uploads()
             
     def closeEvent(self, event):
         # Stop the database process when closing the application
         self.stop_db()
+        if self.product_loader and self.product_loader.isRunning():
+            self.product_loader.wait()
+        self.reorder_writer.shutdown()
+        self.prefetcher.shutdown()
+        self.api_client.uploads.shutdown()
+        ImageCache.instance().shutdown()
         event.accept()
         
+    def changeEvent(self, event):
+        # Send pending reorders when the window loses focus
+        if event.type() == QEvent.Type.ActivationChange and not self.isActiveWindow():
+            self.reorder_writer.flush()
+        super().changeEvent(event)
+        
+    def prefetch_visible_products(self):
+        """Warm the cache for the listed products on screen and their neighbours"""
+        count = self.product_list.count()
+        if count == 0:
+            return
+        viewport = self.product_list.viewport()
+        top = self.product_list.itemAt(0, 0)
+        bottom = self.product_list.itemAt(0, viewport.height() - 1)
+        first = self.product_list.row(top) if top else 0
+        last = self.product_list.row(bottom) if bottom else count - 1
+        rows = list(range(first, last + 1))
+        for offset in range(1, PREFETCH_MARGIN + 1):
+            rows.extend(row for row in (last + offset, first - offset) if 0 <= row < count)
+        versions = dict(self.product_list.item(row).data(Qt.ItemDataRole.UserRole) for row in rows)
+        self.prefetcher.prefetch(list(versions), versions=versions)
+        
     def load_product_images(self, item):
-        product_id = item.text().split("ID: ")[1].rstrip(")")
+        product_id, updated_at = item.data(Qt.ItemDataRole.UserRole)
+        if self.reorder_writer.has_pending(product_id):
+            # The cached copy predates the reorder being written
+            self.prefetcher.invalidate(product_id)
+        self.reorder_writer.flush()
         self.current_product = product_id
         
         # Clear existing images
         self.clear_image_grid()
         
-        # Load product images
-        images = self.api_client.get_product_preview_images(product_id)
-        self.image_urls = images
+        # Load product images, from the prefetch cache when it has them
+        product = self.prefetcher.request(product_id, updated_at)
+        if product is None:
+            self.image_urls = []
+            self.status_bar.showMessage("Loading images...")
+            return
+        self.show_product_images(product)
+        
+    def show_product_images(self, product):
+        self.image_urls = image_urls(product)
         self.update_image_grid()
         
+    def handle_product_loaded(self, product_id, product):
+        if product_id == self.current_product and not self.image_urls:
+            self.status_bar.clearMessage()
+            self.show_product_images(product)
+            
+    def handle_product_failed(self, product_id, error):
+        if product_id == self.current_product:
+            self.status_bar.showMessage(f"Failed to load images: {error}")
+        
     def clear_image_grid(self):
         while self.image_grid.count():
             item = self.image_grid.takeAt(0)
@@ -395,30 +513,82 @@ class ProductImageDashboard(QMainWindow):
         
         if file_dialog.exec():
             filenames = file_dialog.selectedFiles()
-            try:
-                # Upload images
-                uploaded_urls = self.api_client.upload_images(filenames)
-                if uploaded_urls:
-                    # Add new images to product
-                    self.image_urls.extend(uploaded_urls)
-                    success = self.api_client.update_product_images(
-                        self.current_product,
-                        self.image_urls
-                    )
-                    if success:
-                        self.update_image_grid()
-                    else:
-                        raise Exception("Failed to update product images")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to upload images: {str(e)}")
+            if filenames:
+                self.start_upload(filenames, self.current_product)
+                
+    def start_upload(self, paths, product_id, batch_id=None):
+        """Upload in the background; a known batch_id resumes an interrupted batch"""
+        uploads = self.api_client.uploads
+        dialog = UploadProgressDialog(uploads, paths, self)
+        if batch_id is None:
+            batch_id = uploads.start_batch(paths, product_id)
+        else:
+            uploads.resume_batch(batch_id)
+        dialog.track(batch_id)
+        self.upload_dialogs[batch_id] = dialog
+        dialog.show()
+        
+    def handle_upload_finished(self, batch_id, summary):
+        dialog = self.upload_dialogs.pop(batch_id, None)
+        if dialog:
+            dialog.close_dialog()
+            
+        if summary['cancelled']:
+            self.status_bar.showMessage("Upload cancelled - it will be offered for resuming next time")
+            return
+            
+        product_id = summary['product_id']
+        urls = summary['urls']
+        try:
+            if urls:
+                # Appended on the server, so it works even if another product is selected now
+                if not self.api_client.add_product_images(product_id, urls):
+                    raise Exception("Failed to update product images")
+                self.prefetcher.invalidate(product_id)
+                if product_id == self.current_product:
+                    self.image_urls.extend(urls)
+                    self.update_image_grid()
+                    if self.reorder_writer.has_pending(product_id):
+                        # Keep an unsent reorder from dropping the new images
+                        self.reorder_writer.submit(product_id, list(self.image_urls), None)
+                self.status_bar.showMessage(f"Uploaded {len(urls)} image(s)")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to upload images: {str(e)}")
+            
+        if summary['failed']:
+            failures = "\n".join(f"{os.path.basename(path)}: {error}"
+                                  for path, error in summary['failed'].items())
+            QMessageBox.warning(self, "Upload Incomplete",
+                                f"{len(summary['failed'])} image(s) failed to upload:\n{failures}")
+            
+    def resume_interrupted_uploads(self):
+        batches = [(batch_id, batch) for batch_id, batch in self.api_client.uploads.queue.unfinished_batches()
+                   if batch.get('product_id')]
+        if not batches:
+            return
+        count = sum(len(batch['paths']) for _, batch in batches)
+        reply = QMessageBox.question(
+            self, "Resume Uploads",
+            f"{count} image(s) from {len(batches)} interrupted upload(s) were not finished.\n"
+            "Resume them now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        for batch_id, batch in batches:
+            if reply == QMessageBox.StandardButton.Yes:
+                self.start_upload(batch['paths'], batch['product_id'], batch_id)
+            else:
+                self.api_client.uploads.queue.finish_batch(batch_id)
                 
     def delete_image(self, url):
         if url in self.image_urls:
+            # The replace below carries the current order as well
+            self.reorder_writer.discard(self.current_product)
             self.image_urls.remove(url)
             success = self.api_client.update_product_images(
                 self.current_product,
                 self.image_urls
             )
+            self.prefetcher.invalidate(self.current_product)
             if success:
                 self.update_image_grid()
             else:
@@ -427,59 +597,55 @@ class ProductImageDashboard(QMainWindow):
     def move_image_up(self, url):
         idx = self.image_urls.index(url)
         if idx > 0:
-            self.image_urls[idx], self.image_urls[idx-1] = self.image_urls[idx-1], self.image_urls[idx]
-            success = self.api_client.update_product_images(
-                self.current_product,
-                self.image_urls
-            )
-            if success:
-                self.update_image_grid()
-            else:
-                QMessageBox.critical(self, "Error", "Failed to reorder images")
+            self.move_image(idx, idx - 1)
                 
     def move_image_down(self, url):
         idx = self.image_urls.index(url)
         if idx < len(self.image_urls) - 1:
-            self.image_urls[idx], self.image_urls[idx+1] = self.image_urls[idx+1], self.image_urls[idx]
-            success = self.api_client.update_product_images(
-                self.current_product,
-                self.image_urls
-            )
-            if success:
-                self.update_image_grid()
-            else:
-                QMessageBox.critical(self, "Error", "Failed to reorder images")
+            self.move_image(idx, idx + 1)
+            
+    def move_image(self, idx, new_idx):
+        """Swap two images locally; the server is updated once the clicks stop"""
+        previous_urls = list(self.image_urls)
+        self.image_urls[idx], self.image_urls[new_idx] = self.image_urls[new_idx], self.image_urls[idx]
+        self.update_image_grid()
+        self.reorder_writer.submit(self.current_product, list(self.image_urls), previous_urls)
+        
+    def write_image_order(self, product_id, image_urls, previous_urls):
+        # Runs on the writer's worker thread
+        return self.api_client.update_product_images(product_id, image_urls, current_urls=previous_urls)
+        
+    def handle_reorder_failed(self, product_id, previous_urls, error):
+        if product_id == self.current_product and previous_urls is not None:
+            self.image_urls = list(previous_urls)
+            self.update_image_grid()
+        QMessageBox.critical(self, "Error", "Failed to reorder images")
 
 class ApiClient:
     def __init__(self):
         self.base_url = os.getenv('API_BASE_URL', 'http://localhost:5001/api')
+        self.transport = ApiTransport()
+        self.uploads = UploadService(preprocessor=preprocessor_from_env())
         logger.info(f"API Client initialized with base URL: {self.base_url}")
         
+    def iter_product_pages(self, page_size=200, prefetch=True):
+        """Yield product pages as they arrive, following totalPages from the API"""
+        return iter_pages(
+            self.transport,
+            f"{self.base_url}/products",
+            page_size=page_size,
+            params={'sort': '-createdAt -_id'},
+            prefetch=prefetch
+        )
+        
     def get_products(self):
         try:
             logger.info("Fetching products...")
-            response = requests.get(f"{self.base_url}/products", params={
-                'page': 1,
-                'limit': 1000
-            })
-            logger.info(f"Products API response status: {response.status_code}")
-            
-            if response.ok:
-                data = response.json()
-                # Check if the response has the expected structure
-                if isinstance(data, dict) and 'products' in data:
-                    products = data['products']
-                    logger.info(f"Successfully fetched {len(products)} products")
-                    return products
-                elif isinstance(data, list):
-                    logger.info(f"Successfully fetched {len(data)} products")
-                    return data
-                else:
-                    logger.error(f"Unexpected response format: {data}")
-                    return []
-            else:
-                logger.error(f"Failed to fetch products: {response.status_code} - {response.text}")
-                return []
+            products = []
+            for page in self.iter_product_pages():
+                products.extend(page)
+            logger.info(f"Successfully fetched {len(products)} products")
+            return products
         except Exception as e:
             logger.error(f"Error fetching products: {e}")
             return []
@@ -487,16 +653,15 @@ class ApiClient:
     def get_product_preview_images(self, product_id):
         try:
             logger.info(f"Fetching images for product {product_id}")
-            response = requests.get(f"{self.base_url}/products/{product_id}")
+            response = self.transport.get(f"{self.base_url}/products/{product_id}")
             logger.info(f"Product API response status: {response.status_code}")
             
             if response.ok:
                 product = response.json()
                 if product and 'images' in product:
-                    sorted_images = sorted(product['images'], key=lambda x: x.get('order', 0))
-                    image_urls = [img['url'] for img in sorted_images]
-                    logger.info(f"Found {len(image_urls)} images for product {product_id}")
-                    return image_urls
+                    urls = image_urls(product)
+                    logger.info(f"Found {len(urls)} images for product {product_id}")
+                    return urls
                 else:
                     logger.warning(f"No images found for product {product_id}")
                     return []
@@ -507,8 +672,15 @@ class ApiClient:
             logger.error(f"Error fetching preview images for product {product_id}: {e}")
             return []
             
+    def get_product_by_id(self, product_id):
+        """Fetch the full product document, or None if it doesn't exist"""
+        response = self.transport.get(f"{self.base_url}/products/{product_id}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+            
     def upload_images(self, image_paths):
-        uploaded_urls = []
         try:
             # Verify Cloudinary configuration before upload
             if not all([os.getenv('CLOUDINARY_CLOUD_NAME'),
@@ -516,42 +688,36 @@ class ApiClient:
                        os.getenv('CLOUDINARY_API_SECRET')]):
                 raise Exception("Missing Cloudinary configuration in .env file")
                 
-            for path in image_paths:
-                if os.path.exists(path):
-                    logger.info(f"Uploading image: {path}")
-                    response = cloudinary.uploader.upload(path)
-                    url = response['secure_url']
-                    uploaded_urls.append(url)
-                    logger.info(f"Successfully uploaded to: {url}")
-            return uploaded_urls
+            local_paths = [path for path in image_paths if os.path.exists(path)]
+            return self.uploads.upload_paths(local_paths)
         except Exception as e:
             logger.error(f"Error uploading images: {e}")
             raise
             
-    def update_product_images(self, product_id, image_urls):
+    def update_product_images(self, product_id, image_urls, current_urls=None):
+        """Set the product's images to image_urls; current_urls lets a pure reorder use PATCH"""
         try:
             logger.info(f"Updating images for product {product_id}")
-            # First clear existing images
-            response = requests.delete(f"{self.base_url}/products/{product_id}/images")
-            if not response.ok:
-                raise Exception(f"Failed to clear existing images: {response.status_code} - {response.text}")
-                
-            # Create image objects with order
-            images = [{'url': url, 'order': i} for i, url in enumerate(image_urls)]
+            replace_product_images(self.transport, self.base_url, product_id, image_urls, current_urls)
+            logger.info(f"Successfully updated images for product {product_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error updating product images: {e}")
+            return False
             
-            # Update product with new images
-            response = requests.post(
+    def add_product_images(self, product_id, image_urls):
+        """Append images after the product's existing ones"""
+        try:
+            response = self.transport.post(
                 f"{self.base_url}/products/{product_id}/images",
-                json={'images': images}
+                json={'images': [{'url': url} for url in image_urls]}
             )
-            
             if response.ok:
-                logger.info(f"Successfully updated images for product {product_id}")
+                logger.info(f"Added {len(image_urls)} images to product {product_id}")
                 return True
-            else:
-                raise Exception(f"Failed to update images: {response.status_code} - {response.text}")
+            raise Exception(f"Failed to add images: {response.status_code} - {response.text}")
         except Exception as e:
-            logger.error(f"Error updating product images: {e}")
+            logger.error(f"Error adding product images: {e}")
             return False
 
 def main():
@@ -11,25 +11,44 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QPushButton, QLabel, QLineEdit, QTextEdit, QComboBox, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox,
+    QPushButton, QLabel, QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, 
+    QTableView, QAbstractItemView, QStyledItemDelegate, QStyle, QHeaderView, QSpinBox,
     QMessageBox, QFileDialog, QProgressDialog, QFrame,
     QSplitter, QStatusBar, QGroupBox, QFormLayout, QDoubleSpinBox,
-    QScrollArea, QGridLayout
+    QScrollArea, QGridLayout, QCheckBox
+)
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QThread, QDateTime, QMimeData, QPoint, QTimer,
+    QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QEvent
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QDateTime, QMimeData, QPoint, QTimer
 from PyQt6.QtGui import (
     QColor, QPalette, QFont, QDragEnterEvent, QDropEvent, QPixmap, 
-    QImage, QDrag, QCursor
+    QImage, QDrag, QCursor, QPainter
 )
 import base64
 import csv
+import html
+from array import array
 import time
+import asyncio
 import cloudinary
 import cloudinary.uploader
 from dotenv import load_dotenv
+try:
+    import aiohttp
+except ImportError:  # Only AsyncApiClient needs it
+    aiohttp = None
 from pathlib import Path
 import tempfile
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from api_transport import ApiTransport, iter_pages, replace_product_images, RETRY_STATUS_CODES, RETRY_METHODS
+from image_pipeline import ImageCache
+from debounced_writer import DebouncedWriter
+from request_executor import RequestExecutor
+from product_prefetch import ProductPrefetcher
+from upload_service import UploadService, UploadError
+from image_preprocess import preprocessor_from_env
 
 # Load environment variables
 load_dotenv()
@@ -53,59 +72,187 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Newest first like the API default, with _id as a tie-breaker so pages stay
+# stable when many products share a createdAt (e.g. after a CSV import)
+PRODUCT_PAGE_SORT = '-createdAt -_id'
+
+# Rows above and below the visible ones whose full documents are prefetched
+PREFETCH_MARGIN = 20
+
 class ImageTracker:
-    def __init__(self):
-        # Change the path to be in the same directory as the script
+    """Product image orders kept in product_images.json plus an append-only change log
+
+    Updates are applied in memory and appended to the log after a short
+    debounce, so a drag-reorder writes one line instead of the whole file.
+    The log is folded back into the JSON snapshot (temp file + rename) once it
+    grows past COMPACT_AFTER entries and on close.
+    """
+
+    SAVE_DELAY = 0.5  # seconds
+    COMPACT_AFTER = 500  # log entries
+    VALIDATED_TTL = 60  # seconds an entry is trusted after the server confirmed it
+
+    def __init__(self, tracker_file=None):
+        # Defaults to product_images.json in the same directory as the script
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.tracker_file = os.path.join(current_dir, 'product_images.json')
+        self.tracker_file = tracker_file or os.path.join(current_dir, 'product_images.json')
+        self.log_file = self.tracker_file + '.log'
+        self._lock = threading.RLock()
+        self._dirty = set()
+        self._save_timer = None
+        self._log_entries = 0
+        # product_id -> time.monotonic() of the last server confirmation, not persisted
+        self._validated = {}
+        self._local_writes = set()  # Written by us this session, server version not known yet
         self.image_data = self.load_tracker()
+        if self._log_entries:
+            # Fold in whatever the last session left behind, including a torn line
+            self.compact()
     
     def load_tracker(self):
+        data = {'products': {}, 'metadata': {'last_updated': None}}
         try:
             if os.path.exists(self.tracker_file):
                 with open(self.tracker_file, 'r') as f:
-                    return json.load(f)
-            return {'products': {}, 'metadata': {'last_updated': None}}
+                    data = json.load(f)
         except Exception as e:
             logger.error(f"Error loading image tracker: {e}")
-            return {'products': {}, 'metadata': {'last_updated': None}}
-    
-    def save_tracker(self):
+            # Keep the unreadable snapshot for inspection; the next compaction
+            # would otherwise replace it with just the log's products
+            corrupt_file = self.tracker_file + '.corrupt'
+            try:
+                os.replace(self.tracker_file, corrupt_file)
+                logger.warning(f"Moved unreadable image tracker to {corrupt_file}")
+            except OSError as move_error:
+                logger.error(f"Error moving unreadable image tracker aside: {move_error}")
+        self._log_entries = self.replay_log(data)
+        return data
+
+    def replay_log(self, data):
+        """Apply logged changes newer than the snapshot; returns the number of lines read"""
+        if not os.path.exists(self.log_file):
+            return 0
+        applied = 0
         try:
-            # Update metadata
-            self.image_data['metadata']['last_updated'] = QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
-            
-            # No need to create directories since we're saving in the current directory
-            with open(self.tracker_file, 'w') as f:
-                json.dump(self.image_data, f, indent=2)
-                
-            logger.info(f"Image tracker saved to {self.tracker_file}")
+            with open(self.log_file, 'r') as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-append
+                        logger.warning("Ignoring incomplete image tracker log entry")
+                        applied += 1
+                        break
+                    if change.get('product') is None:
+                        data['products'].pop(change['id'], None)
+                    else:
+                        data['products'][change['id']] = change['product']
+                    data['metadata']['last_updated'] = change.get('at')
+                    applied += 1
         except Exception as e:
-            logger.error(f"Error saving image tracker: {e}")
+            logger.error(f"Error replaying image tracker log: {e}")
+        return applied
     
-    def update_product_images(self, product_id, image_urls):
-        """Update product images with order information"""
+    def save_tracker(self):
+        """Schedule a write of the pending changes; bursts of updates share one write"""
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Append pending changes to the log, compacting it when it gets long"""
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            try:
+                now = QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
+                lines = [
+                    json.dumps({'id': product_id, 'product': self.image_data['products'].get(product_id), 'at': now})
+                    for product_id in self._dirty
+                ]
+                with open(self.log_file, 'a') as f:
+                    f.write('\n'.join(lines) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.image_data['metadata']['last_updated'] = now
+                self._log_entries += len(lines)
+                self._dirty.clear()
+                logger.info(f"Logged {len(lines)} image tracker changes to {self.log_file}")
+            except Exception as e:
+                logger.error(f"Error saving image tracker: {e}")
+                return
+            if self._log_entries >= self.COMPACT_AFTER:
+                self.compact()
+
+    def compact(self):
+        """Write the full snapshot atomically and start a fresh log"""
+        with self._lock:
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.tracker_file), suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self.image_data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.tracker_file)
+                # Replaying the old log over the new snapshot is harmless, so a
+                # crash between these two steps loses nothing
+                if os.path.exists(self.log_file):
+                    os.remove(self.log_file)
+                self._log_entries = 0
+                logger.info(f"Image tracker compacted to {self.tracker_file}")
+            except Exception as e:
+                logger.error(f"Error compacting image tracker: {e}")
+
+    def close(self):
+        """Write anything pending and fold the log into the snapshot"""
+        self.flush()
+        if self._log_entries:
+            self.compact()
+    
+    def update_product_images(self, product_id, image_urls, server_updated_at=None, etag=None):
+        """Update product images with order information
+
+        server_updated_at/etag identify the server version the images came
+        from; leave them out after a local write so the next read revalidates.
+        """
         try:
+            now = QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
             # Create image entries with order information
             image_entries = [
                 {
                     'url': url,
                     'order': idx,
-                    'added_at': QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
+                    'added_at': now
                 }
                 for idx, url in enumerate(image_urls)
             ]
             
-            # Update or create product entry
-            if product_id not in self.image_data['products']:
-                self.image_data['products'][product_id] = {
-                    'images': image_entries,
-                    'created_at': QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate),
-                    'updated_at': QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
-                }
-            else:
-                self.image_data['products'][product_id]['images'] = image_entries
-                self.image_data['products'][product_id]['updated_at'] = QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
+            with self._lock:
+                # Update or create product entry
+                if product_id not in self.image_data['products']:
+                    self.image_data['products'][product_id] = {
+                        'images': image_entries,
+                        'created_at': now,
+                        'updated_at': now
+                    }
+                else:
+                    self.image_data['products'][product_id]['images'] = image_entries
+                    self.image_data['products'][product_id]['updated_at'] = now
+                self.image_data['products'][product_id]['server_updated_at'] = server_updated_at
+                self.image_data['products'][product_id]['etag'] = etag
+                if server_updated_at or etag:
+                    self._validated[product_id] = time.monotonic()
+                    self._local_writes.discard(product_id)
+                else:
+                    self._validated.pop(product_id, None)
+                    self._local_writes.add(product_id)
+                self._dirty.add(product_id)
             
             self.save_tracker()
             logger.info(f"Updated images for product {product_id}")
@@ -119,18 +266,175 @@ class ImageTracker:
         Get product images maintaining order
         """
         try:
-            product_data = self.image_data['products'].get(product_id, {})
-            if not product_data:
-                return []
-            
-            # Sort images by order and return URLs
-            images = sorted(product_data.get('images', []), key=lambda x: x['order'])
+            with self._lock:
+                product_data = self.image_data['products'].get(product_id, {})
+                if not product_data:
+                    return []
+                
+                # Sort images by order and return URLs
+                images = sorted(product_data.get('images', []), key=lambda x: x['order'])
             return [img['url'] for img in images]
         except Exception as e:
             logger.error(f"Error retrieving product images: {e}")
             return []
 
+    def product_ids(self):
+        with self._lock:
+            return list(self.image_data['products'])
+
+    def get_version(self, product_id):
+        """Return (server_updated_at, etag) for a tracked product, or (None, None)"""
+        with self._lock:
+            product_data = self.image_data['products'].get(product_id) or {}
+            return product_data.get('server_updated_at'), product_data.get('etag')
+
+    def is_validated(self, product_id):
+        """True if the server confirmed this entry within VALIDATED_TTL"""
+        with self._lock:
+            checked = self._validated.get(product_id)
+            return checked is not None and time.monotonic() - checked < self.VALIDATED_TTL
+
+    def mark_validated(self, product_id):
+        with self._lock:
+            if product_id in self.image_data['products']:
+                self._validated[product_id] = time.monotonic()
+
+    def invalidate(self, product_id):
+        """Drop a product's entry so the next read goes to the server"""
+        with self._lock:
+            self._validated.pop(product_id, None)
+            self._local_writes.discard(product_id)
+            if self.image_data['products'].pop(product_id, None) is None:
+                return
+            self._dirty.add(product_id)
+        self.save_tracker()
+
+    def validate(self, versions):
+        """Check tracked entries against server updatedAt values
+
+        versions maps product_id -> updatedAt (None for products that no
+        longer exist). Matching entries are marked validated; entries that
+        differ, or predate version tracking, are dropped. An entry written
+        by us this session has no server version yet and adopts the one
+        given, since our write is the latest change we know of. Returns the
+        ids that were dropped.
+        """
+        stale = []
+        with self._lock:
+            now = time.monotonic()
+            for product_id, updated_at in versions.items():
+                product_data = self.image_data['products'].get(product_id)
+                if product_data is None:
+                    continue
+                stored = product_data.get('server_updated_at')
+                if updated_at is not None and stored is None and product_id in self._local_writes:
+                    self._local_writes.discard(product_id)
+                    product_data['server_updated_at'] = updated_at
+                    self._validated[product_id] = now
+                    self._dirty.add(product_id)
+                elif updated_at is not None and stored == updated_at:
+                    self._validated[product_id] = now
+                else:
+                    stale.append(product_id)
+                    self._validated.pop(product_id, None)
+                    self._local_writes.discard(product_id)
+                    del self.image_data['products'][product_id]
+                    self._dirty.add(product_id)
+        if stale:
+            logger.info(f"Image tracker dropped {len(stale)} stale products")
+        if self._dirty:
+            self.save_tracker()
+        return stale
+
+class CategoryIndex:
+    """In-memory category lookup keyed by normalized name and _id, refreshed after a TTL"""
+
+    def __init__(self, api_client, ttl=300, retry_after=30):
+        self.api_client = api_client
+        self.ttl = ttl
+        self.retry_after = retry_after  # Wait this long after an empty or failed fetch
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()  # One fetch at a time; other callers wait for it
+        self._categories = []
+        self._by_name = {}
+        self._by_id = {}
+        self._expires_at = None
+
+    @staticmethod
+    def normalize(name):
+        """Case- and whitespace-insensitive key for category names"""
+        return ' '.join(str(name or '').split()).casefold()
+
+    def is_stale(self):
+        return self._expires_at is None or time.monotonic() >= self._expires_at
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = None
+
+    def refresh(self):
+        """Fetch categories from the API and rebuild both lookup tables"""
+        categories = self.api_client.get_categories()
+        with self._lock:
+            if not categories:
+                # Keep whatever we had and don't ask again for a while, so a
+                # backend that is down isn't hit once per lookup
+                self._expires_at = time.monotonic() + self.retry_after
+                logger.warning(f"No categories loaded, retrying in {self.retry_after}s")
+                return
+            self._categories = list(categories)
+            self._by_name = {self.normalize(c.get('name')): c for c in self._categories}
+            self._by_id = {c.get('_id'): c for c in self._categories}
+            self._expires_at = time.monotonic() + self.ttl
+        logger.info(f"Category index loaded with {len(categories)} categories")
+
+    def ensure_fresh(self):
+        if not self.is_stale():
+            return
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited
+            if self.is_stale():
+                self.refresh()
+
+    def all(self):
+        self.ensure_fresh()
+        with self._lock:
+            return list(self._categories)
+
+    def get_by_name(self, name):
+        self.ensure_fresh()
+        with self._lock:
+            return self._by_name.get(self.normalize(name))
+
+    def get_by_id(self, category_id):
+        self.ensure_fresh()
+        with self._lock:
+            return self._by_id.get(category_id)
+
+    def id_for_name(self, name):
+        category = self.get_by_name(name)
+        return category.get('_id') if category else None
+
+    def resolve_id(self, category):
+        """Return the category _id for a populated dict, an _id or a category name"""
+        if isinstance(category, dict):
+            return category.get('_id')
+        if not category:
+            return None
+        if self.get_by_id(category):
+            return category
+        return self.id_for_name(category)
+
+    def display_name(self, category, default='N/A'):
+        """Return a display name for a populated dict or an _id"""
+        if isinstance(category, dict):
+            return category.get('name') or default
+        found = self.get_by_id(category) if category else None
+        return found.get('name', default) if found else default
+
 class ImagePreviewWidget(QWidget):
+    PREVIEW_SIZE = (150, 150)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.image_labels = []
@@ -147,17 +451,6 @@ class ImagePreviewWidget(QWidget):
             label.deleteLater()
         self.image_labels.clear()
         
-    def load_image_from_url(self, url):
-        try:
-            response = requests.get(url)
-            image_data = response.content
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_data)
-            return pixmap.scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio)
-        except Exception as e:
-            logger.error(f"Error loading image from URL {url}: {e}")
-            return None
-            
     def update_previews(self, image_urls):
         self.clear_previews()
         row, col = 0, 0
@@ -175,17 +468,16 @@ class ImagePreviewWidget(QWidget):
                 }
             """)
             
-            # Load image in the background
-            def load_image(label=label, url=url):
-                pixmap = self.load_image_from_url(url)
-                if pixmap:
-                    label.setPixmap(pixmap)
-                else:
-                    label.setText("Failed to load")
-            
-            # Start loading in a separate thread
-            thread = threading.Thread(target=load_image)
-            thread.start()
+            # Load image in the background at preview size
+            label.setText("Loading...")
+            requester = id(label)
+            label.destroyed.connect(
+                lambda _=None, url=url, requester=requester, size=self.PREVIEW_SIZE:
+                    ImageCache.instance().unsubscribe(url, requester, size))
+            ImageCache.instance().subscribe(
+                url, requester, label.setPixmap,
+                lambda message, label=label: label.setText("Failed to load"),
+                self.PREVIEW_SIZE)
             
             self.layout.addWidget(label, row, col)
             self.image_labels.append(label)
@@ -196,13 +488,18 @@ class ImagePreviewWidget(QWidget):
                 row += 1
 
 class ApiClient:
-    def __init__(self, base_url="http://localhost:5001/api"):
+    def __init__(self, base_url="http://localhost:5001/api", transport=None):
         self.base_url = base_url
+        self.transport = transport or ApiTransport()
         self.image_tracker = ImageTracker()
+        self.categories = CategoryIndex(self)
+        self.uploads = UploadService(preprocessor=preprocessor_from_env())
+        # Runs calls made from the GUI off its thread; create the client on the GUI thread
+        self.executor = RequestExecutor()
     
     def get_categories(self):
         try:
-            response = requests.get(f"{self.base_url}/categories")
+            response = self.transport.get(f"{self.base_url}/categories")
             if response.ok:
                 return response.json()
             return []
@@ -210,23 +507,30 @@ class ApiClient:
             print(f"Error fetching categories: {e}")
             return []
     
-    def get_products(self, page=1, limit=1000):
+    def iter_product_pages(self, page_size=200, prefetch=True):
+        """Yield product pages as they arrive, following totalPages from the API"""
+        return iter_pages(
+            self.transport,
+            f"{self.base_url}/products",
+            page_size=page_size,
+            params={'sort': PRODUCT_PAGE_SORT},
+            prefetch=prefetch
+        )
+    
+    def get_products(self, page_size=200):
+        """Fetch every product, page by page"""
         try:
-            response = requests.get(f"{self.base_url}/products", params={
-                'page': page,
-                'limit': limit
-            })
-            if response.ok:
-                data = response.json()
-                return data.get('products', [])
-            return []
+            products = []
+            for page in self.iter_product_pages(page_size):
+                products.extend(page)
+            return products
         except Exception as e:
             print(f"Error fetching products: {e}")
             return []
     
     def get_product_by_id(self, product_id):
         try:
-            response = requests.get(f"{self.base_url}/products/{product_id}")
+            response = self.transport.get(f"{self.base_url}/products/{product_id}")
             if response.ok:
                 return response.json()
             return None
@@ -236,18 +540,12 @@ class ApiClient:
     
     def upload_images(self, image_paths):
         """Upload images to Cloudinary and return the URLs"""
-        uploaded_urls = []
         try:
-            for path in image_paths:
-                if os.path.exists(path):  # Only upload if it's a local file
-                    logger.info(f"Uploading image: {path}")
-                    response = cloudinary.uploader.upload(path)
-                    url = response['secure_url']
-                    uploaded_urls.append(url)
-                    logger.info(f"Successfully uploaded to: {url}")
-                elif path.startswith('http'):  # If it's already a URL, keep it
-                    uploaded_urls.append(path)
-            return uploaded_urls
+            # Local files go up in parallel; existing URLs are kept in place
+            return self.uploads.upload_paths(image_paths)
+        except UploadError as e:
+            logger.error(f"Error uploading images to Cloudinary: {e}")
+            return e.urls
         except Exception as e:
             logger.error(f"Error uploading images to Cloudinary: {e}")
             logger.error(traceback.format_exc())
@@ -256,44 +554,24 @@ class ApiClient:
     def update_product_images(self, product_id, image_paths):
         """Update product images, handling both local files and existing URLs"""
         try:
-            # First clear existing images
-            response = requests.delete(f"{self.base_url}/products/{product_id}/images")
-            if not response.ok:
-                logger.error(f"Failed to clear existing images: {response.text}")
-                return False
-            
-            logger.info(f"Cleared existing images for product {product_id}")
-            
-            # Upload any new local images to Cloudinary
+            # Upload any new local images to Cloudinary first, so the product
+            # keeps its current images while the upload runs
             new_urls = self.upload_images(image_paths)
             
-            if new_urls:
-                # Create image orders with current sequence
-                image_data = {
-                    'images': [
-                        {'url': url, 'order': idx} 
-                        for idx, url in enumerate(new_urls)
-                    ]
-                }
-                
-                # Add new images using dedicated endpoint
-                response = requests.post(
-                    f"{self.base_url}/products/{product_id}/images",
-                    json=image_data
-                )
-                
-                if response.ok:
-                    # Update local tracker
-                    self.image_tracker.update_product_images(product_id, new_urls)
-                    logger.info(f"Successfully updated images for product {product_id}")
-                    return True
-                else:
-                    logger.error(f"Failed to update product images: {response.text}")
-                    return False
-                
-            return True  # Return true if no images to update
+            # One request: a reorder when only the order changed, otherwise a replace
+            replace_product_images(
+                self.transport, self.base_url, product_id, new_urls,
+                current_urls=self.image_tracker.get_product_images(product_id) or None
+            )
+            
+            # Update local tracker
+            self.image_tracker.update_product_images(product_id, new_urls)
+            logger.info(f"Successfully updated images for product {product_id}")
+            return True
         except Exception as e:
             logger.error(f"Error updating product images: {e}")
+            # A fallback clear may have gone through; don't trust the cached list
+            self.image_tracker.invalidate(product_id)
             return False
     
     def create_product(self, product_data):
@@ -302,7 +580,7 @@ class ApiClient:
             image_paths = product_data.pop('images', [])
             
             # First create the product without images
-            response = requests.post(f"{self.base_url}/products", json=product_data)
+            response = self.transport.post(f"{self.base_url}/products", json=product_data)
             
             if response.ok:
                 result = response.json()
@@ -313,6 +591,10 @@ class ApiClient:
                     success = self.update_product_images(product_id, image_paths)
                     if not success:
                         logger.error(f"Failed to upload images for new product {product_id}")
+                    result['images'] = [
+                        {'url': url, 'order': idx}
+                        for idx, url in enumerate(self.image_tracker.get_product_images(product_id))
+                    ]
                 
                 return result
             return None
@@ -327,8 +609,8 @@ class ApiClient:
             logger.info(f"Updating product {product_id} with images: {image_paths}")
             
             # First update the product without images
-            response = requests.put(f"{self.base_url}/products/{product_id}", 
-                                json=product_data)
+            response = self.transport.put(f"{self.base_url}/products/{product_id}", 
+                                          json=product_data)
             
             if response.ok:
                 result = response.json()
@@ -337,55 +619,25 @@ class ApiClient:
                 if image_paths is not None:  # Changed condition to handle empty lists
                     logger.info("Processing images for update...")
                     
-                    # First clear existing images
-                    clear_response = requests.delete(f"{self.base_url}/products/{product_id}/images")
-                    if not clear_response.ok:
-                        logger.error(f"Failed to clear existing images: {clear_response.text}")
-                        return None
-                    
-                    final_urls = []
+                    # Upload new local files before touching the product's images,
+                    # so a slow upload doesn't leave the product without any
+                    final_urls = self.upload_images(image_paths)
+                    logger.info(f"Updating product with {len(final_urls)} images")
                     
-                    # Process each image path
-                    for path in image_paths:
-                        if path.startswith('http'):  # It's an existing URL
-                            logger.info(f"Using existing URL: {path}")
-                            final_urls.append(path)
-                        elif os.path.exists(path):  # It's a new local file
-                            try:
-                                logger.info(f"Uploading new image: {path}")
-                                response = cloudinary.uploader.upload(path)
-                                new_url = response['secure_url']
-                                final_urls.append(new_url)
-                                logger.info(f"Successfully uploaded to: {new_url}")
-                            except Exception as e:
-                                logger.error(f"Failed to upload image {path}: {e}")
-                    
-                    if final_urls:
-                        logger.info(f"Updating product with {len(final_urls)} images")
-                        # Create image orders with current sequence
-                        image_data = {
-                            'images': [
-                                {'url': url, 'order': idx} 
-                                for idx, url in enumerate(final_urls)
-                            ]
-                        }
-                        
-                        # Update images
-                        img_response = requests.post(
-                            f"{self.base_url}/products/{product_id}/images",
-                            json=image_data
+                    try:
+                        # Reorder or replace in a single request
+                        result['images'] = replace_product_images(
+                            self.transport, self.base_url, product_id, final_urls,
+                            current_urls=self.image_tracker.get_product_images(product_id) or None
                         )
-                        
-                        if img_response.ok:
-                            logger.info("Successfully updated product images")
-                            # Update local tracker with new image set
-                            self.image_tracker.update_product_images(product_id, final_urls)
-                        else:
-                            logger.error(f"Failed to update images: {img_response.text}")
-                    else:
-                        # If no images to update, clear the local tracker for this product
-                        self.image_tracker.update_product_images(product_id, [])
-                        logger.warning("No valid images to update")
+                    except requests.RequestException as e:
+                        logger.error(f"Failed to update images: {e}")
+                        # A fallback clear may have gone through; don't trust the cached list
+                        self.image_tracker.invalidate(product_id)
+                        return None
+                    logger.info("Successfully updated product images")
+                    # Update local tracker with new image set
+                    self.image_tracker.update_product_images(product_id, final_urls)
                 
                 return result
             return None
@@ -395,16 +647,68 @@ class ApiClient:
             logger.error(traceback.format_exc())
             return None
     
-    def delete_products(self, product_ids):
-        deleted = []
-        for product_id in product_ids:
-            try:
-                response = requests.delete(f"{self.base_url}/products/{product_id}")
-                if response.ok:
-                    deleted.append(product_id)
-            except Exception as e:
-                print(f"Error deleting product {product_id}: {e}")
-        return deleted
+    def delete_product(self, product_id, transport=None):
+        """Delete a single product, returning (success, response or error message)
+
+        transport overrides the shared one, e.g. one without retries for a
+        caller that handles throttling itself.
+        """
+        try:
+            response = (transport or self.transport).delete(f"{self.base_url}/products/{product_id}")
+            return response.ok, response
+        except Exception as e:
+            logger.error(f"Error deleting product {product_id}: {e}")
+            return False, str(e)
+
+    def bulk_delete_products(self, product_ids=None):
+        """Delete products server-side in one request, or all products when no ids are given
+
+        Returns the server summary, or None if the server has no bulk endpoint.
+        """
+        body = {'all': True} if product_ids is None else {'ids': list(product_ids)}
+        response = self.transport.post(f"{self.base_url}/products/bulk-delete", json=body)
+        if response.status_code in (404, 405):
+            logger.warning("Server does not support bulk delete")
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def delete_products(self, product_ids, max_workers=8):
+        """Delete products and return a per-id status dict
+
+        Each id maps to {'status': 'deleted' | 'not_found' | 'failed', 'error': str or None}.
+        The server bulk endpoint is used when available; otherwise individual deletes
+        are sent with at most max_workers in flight.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        results = {}
+        if not product_ids:
+            return results
+
+        try:
+            summary = self.bulk_delete_products(product_ids)
+        except Exception as e:
+            logger.warning(f"Bulk delete failed, deleting individually: {e}")
+            summary = None
+
+        if summary is not None:
+            for product_id in summary.get('deleted', []):
+                results[product_id] = {'status': 'deleted', 'error': None}
+            for product_id in summary.get('notFound', []):
+                results[product_id] = {'status': 'not_found', 'error': None}
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(product_ids)))) as executor:
+            for product_id, (success, result) in zip(product_ids, executor.map(self.delete_product, product_ids)):
+                status = getattr(result, 'status_code', None)
+                if success:
+                    results[product_id] = {'status': 'deleted', 'error': None}
+                elif status == 404:
+                    results[product_id] = {'status': 'not_found', 'error': None}
+                else:
+                    error = f"{status}: {result.text}" if status is not None else str(result)
+                    results[product_id] = {'status': 'failed', 'error': error}
+        return results
     
     def reorder_product_images(self, product_id, image_orders):
         """Reorder product images using the dedicated endpoint"""
@@ -414,7 +718,7 @@ class ApiClient:
                 'imageOrders': image_orders
             }
             
-            response = requests.patch(
+            response = self.transport.patch(
                 f"{self.base_url}/products/{product_id}/images/reorder",
                 json=request_body
             )
@@ -433,40 +737,342 @@ class ApiClient:
             logger.error(f"Error reordering images for product {product_id}: {e}")
             return False
     
+    def get_product_versions(self, product_ids, chunk_size=500):
+        """Return {product_id: updatedAt} for the given ids, None for missing products
+
+        Uses the bulk versions endpoint; returns None if the server doesn't have it.
+        """
+        versions = {}
+        product_ids = list(product_ids)
+        for start in range(0, len(product_ids), chunk_size):
+            chunk = product_ids[start:start + chunk_size]
+            response = self.transport.post(f"{self.base_url}/products/versions", json={'ids': chunk})
+            if response.status_code in (404, 405):
+                logger.warning("Server does not support product versions")
+                return None
+            response.raise_for_status()
+            found = response.json().get('versions', {})
+            for product_id in chunk:
+                versions[product_id] = found.get(product_id)
+        return versions
+
+    def validate_image_cache(self, product_ids=None):
+        """Revalidate tracked image orders in bulk; returns the ids that were stale
+
+        Defaults to every tracked product. Without the bulk endpoint nothing is
+        dropped here and get_product_preview_images revalidates per product.
+        """
+        if product_ids is None:
+            product_ids = self.image_tracker.product_ids()
+        try:
+            versions = self.get_product_versions(product_ids)
+        except Exception as e:
+            logger.error(f"Error validating image cache: {e}")
+            return []
+        if versions is None:
+            return []
+        return self.image_tracker.validate(versions)
+
     def get_product_preview_images(self, product_id):
-        """Get preview images for a product"""
+        """Get preview images for a product
+
+        Tracked images are served while recently confirmed; otherwise the
+        product is fetched with If-None-Match so an unchanged product costs
+        a 304 instead of a full document.
+        """
         try:
             # First check local tracker
             local_images = self.image_tracker.get_product_images(product_id)
-            if local_images:
+            if local_images and self.image_tracker.is_validated(product_id):
                 return local_images
-            
-            # If not in tracker, fetch from API
-            product = self.get_product_by_id(product_id)
-            if product and 'images' in product:
-                # Sort images by order before extracting URLs
-                sorted_images = sorted(product['images'], key=lambda x: x.get('order', 0))
-                image_urls = [img['url'] for img in sorted_images]
-                
-                # Update local tracker
-                if image_urls:
-                    self.image_tracker.update_product_images(product_id, image_urls)
-                return image_urls
-            return []
+
+            headers = {}
+            _, etag = self.image_tracker.get_version(product_id)
+            if local_images and etag:
+                headers['If-None-Match'] = etag
+            response = self.transport.get(f"{self.base_url}/products/{product_id}", headers=headers)
+
+            if response.status_code == 304:
+                self.image_tracker.mark_validated(product_id)
+                return local_images
+            if response.status_code == 404:
+                self.image_tracker.invalidate(product_id)
+                return []
+            if not response.ok:
+                logger.error(f"Failed to fetch product {product_id}: {response.status_code}")
+                # Better an unconfirmed order than no images at all
+                return local_images
+
+            product = response.json()
+            # Sort images by order before extracting URLs
+            sorted_images = sorted(product.get('images', []), key=lambda x: x.get('order', 0))
+            image_urls = [img['url'] for img in sorted_images]
+
+            # Update local tracker, remembering which version the order came from
+            self.image_tracker.update_product_images(
+                product_id, image_urls,
+                server_updated_at=product.get('updatedAt'),
+                etag=response.headers.get('ETag')
+            )
+            return image_urls
         except Exception as e:
             logger.error(f"Error fetching preview images for product {product_id}: {e}")
-            return []
+            return self.image_tracker.get_product_images(product_id)
+
+class AsyncApiClient:
+    """asyncio counterpart of ApiClient for bulk work
+
+    All requests share one aiohttp session (one connection pool) and at most
+    max_concurrency of them run at once, so thousands of calls can be
+    gathered from a single thread. Use it as an async context manager:
+
+        async with AsyncApiClient() as client:
+            products = await client.get_products()
+
+    Local image paths are uploaded through UploadService on a worker thread.
+    """
+
+    def __init__(self, base_url="http://localhost:5001/api", max_concurrency=32, image_tracker=None,
+                 uploads=None, connect_timeout=3.05, read_timeout=30, max_retries=3, backoff_factor=0.3):
+        if aiohttp is None:
+            raise RuntimeError("AsyncApiClient needs the aiohttp package")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.image_tracker = image_tracker
+        self.uploads = uploads
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the session; it belongs to the running event loop"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, path, **kwargs):
+        """Send a request and return (status, parsed JSON or text)
+
+        Retries the same failures ApiTransport does: failing to connect for
+        every method, and rate limits, server errors, dropped connections and
+        read timeouts for idempotent methods only - a POST may have reached
+        the server by then.
+        """
+        await self.open()
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            delay = self.backoff_factor * (2 ** attempt)
+            try:
+                async with self.semaphore:
+                    async with self.session.request(method, url, **kwargs) as response:
+                        if (response.status in RETRY_STATUS_CODES and method in RETRY_METHODS
+                                and attempt < self.max_retries):
+                            retry_after = response.headers.get('Retry-After')
+                            if retry_after and retry_after.isdigit():
+                                delay = max(delay, int(retry_after))
+                        else:
+                            if response.content_type == 'application/json':
+                                return response.status, await response.json()
+                            return response.status, await response.text()
+            except aiohttp.ClientConnectionError as e:
+                never_sent = isinstance(e, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError))
+                if attempt >= self.max_retries or not (never_sent or method in RETRY_METHODS):
+                    raise
+                logger.warning(f"Retrying {method} {path} after connection error: {e}")
+            # Back off outside the semaphore so waiting doesn't hold a slot
+            await asyncio.sleep(delay)
+
+    async def get_categories(self):
+        status, data = await self.request('GET', '/categories')
+        return data if status == 200 else []
+
+    async def get_products(self, page_size=200):
+        """Fetch every product; pages after the first are requested concurrently"""
+        params = {'sort': PRODUCT_PAGE_SORT, 'limit': page_size}
+        status, first = await self.request('GET', '/products', params={**params, 'page': 1})
+        if status != 200:
+            raise RuntimeError(f"Failed to fetch products: {status}")
+        if isinstance(first, list):
+            return first
+        total_pages = int(first.get('totalPages') or 1)
+        pages = await asyncio.gather(*(
+            self.request('GET', '/products', params={**params, 'page': page})
+            for page in range(2, total_pages + 1)
+        ))
+        products = list(first.get('products', []))
+        for status, data in pages:
+            if status != 200:
+                raise RuntimeError(f"Failed to fetch products: {status}")
+            products.extend(data.get('products', []))
+        return products
+
+    async def get_product_by_id(self, product_id):
+        status, data = await self.request('GET', f"/products/{product_id}")
+        return data if status == 200 else None
+
+    async def upload_images(self, image_paths):
+        """Upload local files through UploadService on a worker thread; URLs pass through"""
+        if not any(os.path.exists(path) for path in image_paths):
+            return list(image_paths)
+        if self.uploads is None:
+            self.uploads = UploadService(preprocessor=preprocessor_from_env())
+        try:
+            return await asyncio.to_thread(self.uploads.upload_paths, image_paths)
+        except UploadError as e:
+            logger.error(f"Error uploading images to Cloudinary: {e}")
+            return e.urls
+
+    async def create_product(self, product_data):
+        product_data = dict(product_data)
+        image_paths = product_data.pop('images', [])
+        status, result = await self.request('POST', '/products', json=product_data)
+        if status not in (200, 201):
+            logger.error(f"Error creating product: {status} - {result}")
+            return None
+        if image_paths:
+            urls = await self.upload_images(image_paths)
+            result['images'] = await self.replace_product_images(result['_id'], urls, current_urls=[])
+        return result
+
+    async def update_product(self, product_id, product_data):
+        product_data = dict(product_data)
+        image_paths = product_data.pop('images', None)
+        status, result = await self.request('PUT', f"/products/{product_id}", json=product_data)
+        if status != 200:
+            logger.error(f"Error updating product {product_id}: {status} - {result}")
+            return None
+        if image_paths is not None:
+            urls = await self.upload_images(image_paths)
+            current_urls = self.image_tracker.get_product_images(product_id) if self.image_tracker else None
+            result['images'] = await self.replace_product_images(product_id, urls, current_urls or None)
+        return result
+
+    async def delete_products(self, product_ids):
+        """Delete products and return the same per-id status dict as ApiClient.delete_products"""
+        product_ids = list(dict.fromkeys(product_ids))
+        results = {}
+        if not product_ids:
+            return results
+
+        status, summary = await self.request('POST', '/products/bulk-delete', json={'ids': product_ids})
+        if status == 200:
+            for product_id in summary.get('deleted', []):
+                results[product_id] = {'status': 'deleted', 'error': None}
+            for product_id in summary.get('notFound', []):
+                results[product_id] = {'status': 'not_found', 'error': None}
+            return results
+
+        async def delete_one(product_id):
+            try:
+                status, data = await self.request('DELETE', f"/products/{product_id}")
+            except Exception as e:
+                return {'status': 'failed', 'error': str(e)}
+            if status == 200:
+                return {'status': 'deleted', 'error': None}
+            if status == 404:
+                return {'status': 'not_found', 'error': None}
+            return {'status': 'failed', 'error': f"{status}: {data}"}
+
+        outcomes = await asyncio.gather(*(delete_one(product_id) for product_id in product_ids))
+        return dict(zip(product_ids, outcomes))
+
+    async def add_product_images(self, product_id, urls):
+        """Append images after the product's existing ones"""
+        status, data = await self.request('POST', f"/products/{product_id}/images",
+                                          json={'images': [{'url': url} for url in urls]})
+        if status != 200:
+            raise RuntimeError(f"Failed to add images: {status} - {data}")
+        return data.get('images', [])
+
+    async def reorder_product_images(self, product_id, urls):
+        status, data = await self.request('PATCH', f"/products/{product_id}/images/reorder",
+                                          json={'imageOrders': [{'url': url} for url in urls]})
+        if status == 200:
+            self.track_images(product_id, urls)
+        return status == 200
+
+    async def clear_product_images(self, product_id):
+        status, data = await self.request('DELETE', f"/products/{product_id}/images")
+        if status != 200:
+            raise RuntimeError(f"Failed to clear images: {status} - {data}")
+        self.track_images(product_id, [])
+
+    async def replace_product_images(self, product_id, urls, current_urls=None):
+        """Async replace_product_images: PATCH for a pure reorder, else one PUT, else DELETE + POST"""
+        urls = list(urls)
+        images = [{'url': url, 'order': idx} for idx, url in enumerate(urls)]
+        if urls and current_urls is not None and sorted(urls) == sorted(current_urls):
+            if await self.reorder_product_images(product_id, urls):
+                return images
+
+        status, data = await self.request('PUT', f"/products/{product_id}/images", json={'images': images})
+        if status == 200:
+            self.track_images(product_id, urls)
+            return images
+        # A missing product answers with JSON; a server without the route doesn't
+        if status not in (404, 405) or isinstance(data, dict):
+            raise RuntimeError(f"Failed to replace images: {status} - {data}")
+
+        await self.clear_product_images(product_id)
+        if urls:
+            await self.add_product_images(product_id, urls)
+        self.track_images(product_id, urls)
+        return images
+
+    def track_images(self, product_id, urls):
+        if self.image_tracker:
+            self.image_tracker.update_product_images(product_id, urls)
+
+class ConsoleWidget(QPlainTextEdit):
+    """Log view that may be written to from any thread
+
+    log() only queues the line; a timer on the GUI thread appends whatever
+    has queued up as one block. The queue and the document are both capped,
+    so a chatty backend can't slow the UI down or grow memory without end.
+    """
+    MAX_LINES = 5000  # Lines kept in the document
+    MAX_PENDING = 2000  # Lines queued between flushes; older ones are dropped
+    FLUSH_INTERVAL_MS = 100
+    LEVEL_COLORS = {
+        "INFO": "#ffffff",    # White
+        "SUCCESS": "#4caf50", # Green
+        "WARNING": "#ffc107", # Yellow
+        "ERROR": "#f44336"    # Red
+    }
 
-class ConsoleWidget(QTextEdit):
     def __init__(self):
         super().__init__()
+        self._pending = deque(maxlen=self.MAX_PENDING)
+        self._dropped = 0
+        self._lock = threading.Lock()
         self.setup_ui()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
         
     def setup_ui(self):
         # Set read-only and styling
         self.setReadOnly(True)
+        self.setMaximumBlockCount(self.MAX_LINES)
+        self.setUndoRedoEnabled(False)
         self.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #ffffff;
                 font-family: 'Consolas', 'Courier New', monospace;
@@ -476,43 +1082,301 @@ class ConsoleWidget(QTextEdit):
         """)
         
     def log(self, message, level="INFO"):
-        # Get current timestamp
+        """Queue a message; safe to call from any thread"""
         timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-        
-        # Color coding based on level
-        color = {
-            "INFO": "#ffffff",    # White
-            "SUCCESS": "#4caf50", # Green
-            "WARNING": "#ffc107", # Yellow
-            "ERROR": "#f44336"    # Red
-        }.get(level.upper(), "#ffffff")
-        
-        # Format the message with HTML
-        formatted_message = f'<span style="color: #888888">[{timestamp}]</span> <span style="color: {color}">{message}</span>'
-        
-        # Append the message
-        self.append(formatted_message)
-        
-        # Scroll to bottom
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append((timestamp, str(message).rstrip('\r\n'), level.upper()))
+            
+    def flush(self):
+        """Append everything queued since the last flush (GUI thread)"""
+        with self._lock:
+            if not self._pending:
+                return
+            entries = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+            
+        lines = []
+        if dropped:
+            lines.append(f'<div style="color: {self.LEVEL_COLORS["WARNING"]}">'
+                         f'... {dropped} message(s) dropped</div>')
+        for timestamp, message, level in entries:
+            color = self.LEVEL_COLORS.get(level, "#ffffff")
+            lines.append(f'<div><span style="color: #888888">[{timestamp}]</span> '
+                         f'<span style="color: {color}">{html.escape(message)}</span></div>')
+        
+        # Only follow the output if the user hasn't scrolled up to read
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        # One div per message keeps them separate blocks for maximumBlockCount
+        self.appendHtml(''.join(lines))
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
 
-class ProductTableWidget(QTableWidget):
-    def __init__(self):
+class ProductTableModel(QAbstractTableModel):
+    """Product rows kept column-wise; cells are only formatted when the view asks for them"""
+    HEADERS = ['ID', 'Name', 'Price', 'Stock', 'Category', 'Actions']
+    ACTIONS_COLUMN = 5
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+    IMAGE_ROW_COLOR = QColor(200, 255, 200)  # Light green for products with images
+
+    def __init__(self, category_index=None, parent=None):
+        super().__init__(parent)
+        self.category_index = category_index
+        self.clear_store()
+
+    def clear_store(self):
+        self.ids = []
+        self.names = []
+        self.prices = array('d')
+        self.stocks = array('q')
+        self.category_ids = []
+        self.category_names = []
+        self.has_images = bytearray()
+        self.updated_at = []
+        self.row_by_id = {}
+        # Category values repeat across thousands of rows; share one string each
+        self._shared_strings = {}
+
+    def shared(self, value):
+        return self._shared_strings.setdefault(value, value)
+
+    def category_name(self, category):
+        if self.category_index:
+            return self.category_index.display_name(category)
+        if isinstance(category, dict):
+            return category.get('name', 'N/A')
+        return 'N/A'
+
+    def store_product(self, product):
+        """Append one product to the column store"""
+        self.row_by_id[product['_id']] = len(self.ids)
+        self.ids.append(product['_id'])
+        self.names.append('')
+        self.prices.append(0.0)
+        self.stocks.append(0)
+        self.category_ids.append(None)
+        self.category_names.append('')
+        self.has_images.append(0)
+        self.updated_at.append(None)
+        self.write_row(len(self.ids) - 1, product)
+
+    def write_row(self, row, product):
+        """Overwrite the stored columns of an existing row"""
+        category = product.get('category')
+        category_id = category.get('_id') if isinstance(category, dict) else category
+        try:
+            price = float(product.get('price') or 0)
+        except (TypeError, ValueError):
+            price = 0.0
+        try:
+            stock = int(product.get('stock') or 0)
+        except (TypeError, ValueError):
+            stock = 0
+
+        self.names[row] = product.get('name', '')
+        self.prices[row] = price
+        self.stocks[row] = stock
+        self.category_ids[row] = self.shared(category_id)
+        self.category_names[row] = self.shared(self.category_name(category))
+        self.has_images[row] = 1 if product.get('images') else 0
+        self.updated_at[row] = product.get('updatedAt')
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return self.ids[row]
+            if column == 1:
+                return self.names[row]
+            if column == 2:
+                return f"${self.prices[row]:.2f}"
+            if column == 3:
+                return str(self.stocks[row])
+            if column == 4:
+                return self.category_names[row]
+            return None
+        if role == self.SORT_ROLE:
+            return (self.ids, self.names, self.prices, self.stocks, self.category_names,
+                    self.ids)[column][row]
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if self.has_images[row] and column != self.ACTIONS_COLUMN:
+                return self.IMAGE_ROW_COLOR
+        return None
+
+    def set_products(self, products):
+        self.beginResetModel()
+        self.clear_store()
+        for product in products:
+            self.store_product(product)
+        self.endResetModel()
+
+    def is_current(self, row, product):
+        """True when the stored row already reflects this version of the product"""
+        updated_at = product.get('updatedAt')
+        return updated_at is not None and self.updated_at[row] == updated_at
+
+    def upsert_products(self, products):
+        """Insert new products and rewrite changed ones; returns (inserted, updated)"""
+        new_products = []
+        new_ids = set()
+        updated = 0
+        for product in products:
+            product_id = product.get('_id')
+            if not product_id or product_id in new_ids:
+                continue
+            row = self.row_by_id.get(product_id)
+            if row is None:
+                new_ids.add(product_id)
+                new_products.append(product)
+            elif not self.is_current(row, product):
+                self.write_row(row, product)
+                self.dataChanged.emit(self.index(row, 0),
+                                      self.index(row, self.columnCount() - 1))
+                updated += 1
+        self.append_products(new_products)
+        return len(new_products), updated
+
+    def append_products(self, products):
+        if not products:
+            return
+        first = len(self.ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(products) - 1)
+        for product in products:
+            self.store_product(product)
+        self.endInsertRows()
+
+    def remove_ids(self, product_ids):
+        """Remove rows for the given ids, one contiguous range at a time"""
+        rows = sorted((self.row_by_id[pid] for pid in set(product_ids) if pid in self.row_by_id),
+                      reverse=True)
+        if not rows:
+            return
+
+        # Group descending rows into (first, last) ranges
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+            else:
+                ranges.append([row, row])
+
+        for first, last in ranges:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for column in (self.ids, self.names, self.prices, self.stocks, self.category_ids,
+                           self.category_names, self.has_images, self.updated_at):
+                del column[first:last + 1]
+            self.endRemoveRows()
+
+        self.row_by_id = {product_id: row for row, product_id in enumerate(self.ids)}
+
+    def product_at(self, row):
+        """Return the basic product fields held by the table for a source row"""
+        return {
+            '_id': self.ids[row],
+            'name': self.names[row],
+            'price': self.prices[row],
+            'stock': self.stocks[row],
+            'category': self.category_ids[row] or self.category_names[row],
+            'updatedAt': self.updated_at[row]
+        }
+
+class EditButtonDelegate(QStyledItemDelegate):
+    """Paints an Edit button in the actions column without creating a widget per row"""
+    clicked = pyqtSignal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(6, 3, -6, -3)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor('#1565c0' if hovered else '#0d47a1'))
+        painter.drawRoundedRect(rect, 3, 3)
+        painter.setPen(QColor('white'))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Edit")
+        painter.restore()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.double_clicked = False
+
+    def editorEvent(self, event, model, option, index):
+        # A double click is one press of the button: the second press and
+        # its release are swallowed rather than opening the product again
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.double_clicked = False
+        elif event.type() == QEvent.Type.MouseButtonDblClick:
+            self.double_clicked = True
+            return True
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            if self.double_clicked:
+                self.double_clicked = False
+                return True
+            if option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+class ProductTableWidget(QTableView):
+    def __init__(self, category_index=None):
         super().__init__()
+        self.product_model = ProductTableModel(category_index, self)
+        self.synced_ids = None
+        self.sync_changes = {}
+        self.loading_text = None  # Shown over an empty table while products load
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.product_model)
+        self.proxy_model.setSortRole(ProductTableModel.SORT_ROLE)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.proxy_model.setFilterKeyColumn(-1)  # Match any column
+        self.setModel(self.proxy_model)
         self.setup_ui()
         
     def setup_ui(self):
         # Set up table properties
-        self.setColumnCount(6)
-        self.setHorizontalHeaderLabels(['ID', 'Name', 'Price', 'Stock', 'Category', 'Actions'])
-        self.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        
+        # Fixed row heights let the view skip measuring rows that are not visible
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(30)
+        self.setWordWrap(False)
+        self.setMouseTracking(True)  # Hover state for the Edit button
+        
+        # Keep API order until the user clicks a header
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.setSortingEnabled(True)
+        
+        # Edit action drawn by a delegate
+        self.edit_delegate = EditButtonDelegate(self)
+        self.edit_delegate.clicked.connect(self.handle_edit_index)
+        self.setItemDelegateForColumn(ProductTableModel.ACTIONS_COLUMN, self.edit_delegate)
         
         # Add double click handler
-        self.cellDoubleClicked.connect(self.handle_double_click)
+        self.doubleClicked.connect(self.handle_double_click)
         
         # Set column widths
         self.setColumnWidth(0, 200)  # ID
@@ -521,105 +1385,134 @@ class ProductTableWidget(QTableWidget):
         self.setColumnWidth(5, 100)  # Actions
         
         # Connect selection change signal
-        self.itemSelectionChanged.connect(self.on_selection_changed)
+        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
     
     def on_selection_changed(self):
         self.selection_changed_signal.emit()
     
+    def set_loading(self, text):
+        """Show text over the table while it is empty; None hides it"""
+        self.loading_text = text
+        self.viewport().update()
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.loading_text and self.proxy_model.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().placeholderText().color())
+            painter.drawText(self.viewport().rect(), Qt.AlignmentFlag.AlignCenter, self.loading_text)
+            painter.end()
+    
     def populate_products(self, products):
-        self.setRowCount(0)
-        for product in products:
-            row = self.rowCount()
-            self.insertRow(row)
-            
-            # Add product data
-            self.setItem(row, 0, QTableWidgetItem(product['_id']))
-            self.setItem(row, 1, QTableWidgetItem(product['name']))
-            self.setItem(row, 2, QTableWidgetItem(f"${product['price']:.2f}"))
-            self.setItem(row, 3, QTableWidgetItem(str(product['stock'])))
-            self.setItem(row, 4, QTableWidgetItem(product['category'].get('name', 'N/A')))
-            
-            # Add edit button
-            edit_btn = QPushButton("Edit")
-            edit_btn.clicked.connect(lambda checked, p=product: self.edit_clicked.emit(p))
-            self.setCellWidget(row, 5, edit_btn)
-            
-            # Set background color based on whether product has images
-            if product.get('images') and len(product['images']) > 0:
-                for col in range(self.columnCount()):
-                    item = self.item(row, col)
-                    if item:  # Skip cells with widgets (like the edit button)
-                        item.setBackground(QColor(200, 255, 200))  # Light green
+        self.product_model.set_products(products)
+    
+    def append_products(self, products):
+        """Add rows at the end of the table, e.g. one page at a time"""
+        self.product_model.append_products(products)
+    
+    def clear_products(self):
+        self.product_model.set_products([])
+        self.synced_ids = None
+    
+    def begin_sync(self):
+        """Start diffing a fresh product listing against the rows already shown"""
+        self.synced_ids = set()
+        self.sync_changes = {'inserted': 0, 'updated': 0, 'removed': 0}
+    
+    def sync_products(self, products):
+        """Apply one page of a listing: insert new rows and rewrite changed ones"""
+        inserted, updated = self.product_model.upsert_products(products)
+        if self.synced_ids is not None:
+            self.synced_ids.update(product['_id'] for product in products if product.get('_id'))
+            self.sync_changes['inserted'] += inserted
+            self.sync_changes['updated'] += updated
+    
+    def finish_sync(self):
+        """Remove rows missing from the completed listing and return the change counts"""
+        if self.synced_ids is None:
+            return {'inserted': 0, 'updated': 0, 'removed': 0}
+        missing = [pid for pid in self.product_model.ids if pid not in self.synced_ids]
+        self.product_model.remove_ids(missing)
+        self.sync_changes['removed'] = len(missing)
+        self.synced_ids = None
+        return self.sync_changes
+    
+    def upsert_product(self, product):
+        """Patch a single row in place, adding it if it is not shown yet"""
+        self.product_model.upsert_products([product])
+    
+    def product_count(self):
+        return self.product_model.rowCount()
+    
+    def set_filter_text(self, text):
+        self.proxy_model.setFilterFixedString(text)
+    
+    def get_product(self, product_id):
+        row = self.product_model.row_by_id.get(product_id)
+        return self.product_model.product_at(row) if row is not None else None
     
     def get_selected_products(self):
-        selected_rows = set(item.row() for item in self.selectedItems())
-        selected_products = []
-        for row in selected_rows:
-            product_id = self.item(row, 0).text()
-            selected_products.append(product_id)
-        return selected_products
-    
-    def handle_double_click(self, row, column):
-        """Handle double click on table row"""
-        product_id = self.item(row, 0).text()
-        product = {
-            '_id': product_id,
-            'name': self.item(row, 1).text(),
-            'price': float(self.item(row, 2).text().replace('$', '')),
-            'stock': int(self.item(row, 3).text()),
-            'category': self.item(row, 4).text()
-        }
-        self.edit_clicked.emit(product)
+        source_rows = sorted(
+            self.proxy_model.mapToSource(index).row()
+            for index in self.selectionModel().selectedRows()
+        )
+        return [self.product_model.ids[row] for row in source_rows]
+    
+    def remove_products(self, product_ids):
+        """Remove rows for the given product ids without rebuilding the table"""
+        self.product_model.remove_ids(product_ids)
+    
+    def visible_products(self, margin=PREFETCH_MARGIN):
+        """Return {product_id: updatedAt} for visible rows, then neighbours nearest first"""
+        row_count = self.proxy_model.rowCount()
+        if row_count == 0:
+            return {}
+        first = self.rowAt(0)
+        if first < 0:
+            return {}
+        last = self.rowAt(self.viewport().height() - 1)
+        if last < 0:
+            last = row_count - 1
+        rows = list(range(first, last + 1))
+        for offset in range(1, margin + 1):
+            rows.extend(row for row in (last + offset, first - offset) if 0 <= row < row_count)
+        model = self.product_model
+        products = {}
+        for row in rows:
+            source_row = self.proxy_model.mapToSource(self.proxy_model.index(row, 0)).row()
+            products[model.ids[source_row]] = model.updated_at[source_row]
+        return products
+    
+    def handle_double_click(self, index):
+        # The Edit button already reacted to the first click
+        if index.column() != ProductTableModel.ACTIONS_COLUMN:
+            self.handle_edit_index(index)
+
+    def handle_edit_index(self, index):
+        """Handle the Edit button or a double click on a row"""
+        source_index = self.proxy_model.mapToSource(index)
+        if source_index.isValid():
+            self.edit_clicked.emit(self.product_model.product_at(source_index.row()))
     
     # Signals
     selection_changed_signal = pyqtSignal()
     edit_clicked = pyqtSignal(dict)
 
-class ImageCache:
-    _instance = None
-    _cache = {}
-    _loading = set()  # Track URLs currently being loaded
-
-    @classmethod
-    def instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
-
-    def get_image(self, url):
-        # Return immediately if cached
-        if url in self._cache:
-            return self._cache.get(url)
-        
-        # Start async load if not already loading
-        if url not in self._loading:
-            self._loading.add(url)
-            threading.Thread(target=self._load_image, args=(url,), daemon=True).start()
-        
-        return None
-
-    def _load_image(self, url):
-        try:
-            response = requests.get(url)
-            if response.ok:
-                pixmap = QPixmap()
-                pixmap.loadFromData(response.content)
-                self._cache[url] = pixmap
-        except Exception as e:
-            logger.error(f"Error caching image {url}: {e}")
-        finally:
-            self._loading.remove(url)
-
 class ImageThumbnail(QLabel):
     removed = pyqtSignal(str)  # Signal emitted when thumbnail is removed
     reordered = pyqtSignal(str, int)  # Signal emitted when thumbnail is reordered (image_url, new_index)
+    IMAGE_SIZE = (90, 90)
+    MAX_SCALED_PIXMAPS = 256
+    
+    # Scaled pixmaps by URL or path, shared by all thumbnails, so showing an
+    # image again skips decoding and smooth scaling (LRU, GUI thread only)
+    scaled_pixmaps = OrderedDict()
     
     def __init__(self, image_url, index, is_local=False):
         super().__init__()
         self.image_url = image_url
         self.index = index
         self.is_local = is_local
-        self.loading_timer = None
         self.setFixedSize(100, 100)
         self.setStyleSheet("""
             QLabel {
@@ -638,14 +1531,18 @@ class ImageThumbnail(QLabel):
         self.start_loading()
 
     def start_loading(self):
-        if self.is_local:
+        pixmap = self.scaled_pixmaps.get(self.image_url)
+        if pixmap is not None:
+            self.scaled_pixmaps.move_to_end(self.image_url)
+            self.setPixmap(pixmap)
+        elif self.is_local:
             self.load_local_image()
         else:
             self.setText("Loading...")
-            # Start periodic check for cached image
-            self.loading_timer = QTimer()
-            self.loading_timer.timeout.connect(self.check_cached_image)
-            self.loading_timer.start(100)  # Check every 100ms
+            # Don't download for a thumbnail that is already gone
+            url, requester, size = self.image_url, id(self), self.IMAGE_SIZE
+            self.destroyed.connect(lambda _=None: ImageCache.instance().unsubscribe(url, requester, size))
+            ImageCache.instance().subscribe(url, requester, self.set_image, self.set_failed, size)
 
     def load_local_image(self):
         pixmap = QPixmap(self.image_url)
@@ -654,16 +1551,16 @@ class ImageThumbnail(QLabel):
         else:
             self.setText("Failed")
 
-    def check_cached_image(self):
-        pixmap = ImageCache.instance().get_image(self.image_url)
-        if pixmap:
-            self.set_image(pixmap)
-            self.loading_timer.stop()
-            self.loading_timer = None
+    def set_failed(self, message):
+        self.setText("Failed")
+        self.setToolTip(f"Could not load image: {message}")
 
     def set_image(self, pixmap):
-        scaled_pixmap = pixmap.scaled(90, 90, Qt.AspectRatioMode.KeepAspectRatio,
+        scaled_pixmap = pixmap.scaled(*self.IMAGE_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
                                     Qt.TransformationMode.SmoothTransformation)
+        self.scaled_pixmaps[self.image_url] = scaled_pixmap
+        while len(self.scaled_pixmaps) > self.MAX_SCALED_PIXMAPS:
+            self.scaled_pixmaps.popitem(last=False)
         self.setPixmap(scaled_pixmap)
 
     def mousePressEvent(self, event):
@@ -710,6 +1607,7 @@ class ImageUploadWidget(QWidget):
         super().__init__()
         self.image_urls = []  # Store URLs or file paths
         self.is_local = {}  # Track which images are local files
+        self.thumbnails = {}  # URL or path -> ImageThumbnail, reused across updates
         self.setup_ui()
         
     def setup_ui(self):
@@ -857,23 +1755,40 @@ class ImageUploadWidget(QWidget):
         self.images_updated.emit(self.image_urls)
         
     def update_thumbnails(self):
-        """Update the thumbnail display"""
-        # Clear existing thumbnails
-        while self.thumbnail_layout.count() > 1:
-            item = self.thumbnail_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Add thumbnails for each image
-        for i, image_url in enumerate(self.image_urls):
-            is_local = self.is_local.get(image_url, False)
-            thumbnail = ImageThumbnail(image_url, i, is_local)
-            thumbnail.removed.connect(self.remove_image)
-            thumbnail.reordered.connect(self.reorder_image)
-            self.thumbnail_layout.insertWidget(i, thumbnail)
-            
-        # Process events to keep UI responsive
-        QApplication.processEvents()
+        """Update the thumbnail display
+
+        Thumbnails are kept per image and only moved when the order changes;
+        widgets are created for new images and deleted for removed ones.
+        """
+        # The same URL may appear twice; each occurrence gets its own widget
+        keys = []
+        seen = {}
+        for image_url in self.image_urls:
+            count = seen.get(image_url, 0)
+            seen[image_url] = count + 1
+            keys.append(image_url if count == 0 else f"{image_url}#{count}")
+        
+        # Drop thumbnails for images that are gone
+        wanted = set(keys)
+        for key in [key for key in self.thumbnails if key not in wanted]:
+            thumbnail = self.thumbnails.pop(key)
+            self.thumbnail_layout.removeWidget(thumbnail)
+            thumbnail.deleteLater()
+        
+        # Put each thumbnail at its position, creating only the missing ones
+        for i, (key, image_url) in enumerate(zip(keys, self.image_urls)):
+            thumbnail = self.thumbnails.get(key)
+            if thumbnail is None:
+                is_local = self.is_local.get(image_url, False)
+                thumbnail = ImageThumbnail(image_url, i, is_local)
+                thumbnail.removed.connect(self.remove_image)
+                thumbnail.reordered.connect(self.reorder_image)
+                self.thumbnails[key] = thumbnail
+                self.thumbnail_layout.insertWidget(i, thumbnail)
+            elif self.thumbnail_layout.indexOf(thumbnail) != i:
+                self.thumbnail_layout.removeWidget(thumbnail)
+                self.thumbnail_layout.insertWidget(i, thumbnail)
+            thumbnail.index = i
     
     def remove_image(self, image_url):
         if image_url in self.image_urls:
@@ -914,52 +1829,100 @@ class ImageUploadWidget(QWidget):
         return [path for path in self.image_urls if self.is_local.get(path, False)]
 
 class ProductFormWidget(QWidget):
-    product_added = pyqtSignal()
-    product_updated = pyqtSignal()
+    product_added = pyqtSignal(dict)
+    product_updated = pyqtSignal(dict)
     
     def __init__(self, api_client, console_widget):
         super().__init__()
         self.api_client = api_client
         self.console = console_widget
         self.current_product = None
+        self.current_category_id = None
+        self.form_generation = 0  # Bumped whenever another product (or add mode) is put in the form
+        self.saved_image_urls = []  # Image order the server has for current_product
         self.is_original_price_auto = True  # Track if original price is auto-calculated
         self.setup_ui()
         self.load_categories()
         
+        # Drags are shown at once and sent as one reorder once they stop
+        self.reorder_writer = DebouncedWriter(self.write_image_order, parent=self)
+        self.reorder_writer.committed.connect(self.handle_reorder_committed)
+        self.reorder_writer.failed.connect(self.handle_reorder_failed)
+        
         # Connect the new reorder signal
         self.image_upload.image_reordered.connect(self.handle_image_reorder)
 
     def handle_image_reorder(self, reordered_urls):
-        """Handle reordering of images for existing products"""
-        if self.current_product and self.current_product.get('_id'):
-            # Create image orders with new sequence
-            image_orders = [
-                {'url': url, 'order': idx} 
-                for idx, url in enumerate(reordered_urls)
-            ]
-            
-            # Call API to update order
-            success = self.api_client.reorder_product_images(
-                self.current_product['_id'], 
-                image_orders
-            )
-            
-            if success:
-                self.console.log("Image order updated successfully", "SUCCESS")
-            else:
-                self.console.log("Failed to update image order", "ERROR")
-                # Refresh the product to restore original order
-                self.set_edit_mode(self.current_product)
+        """Handle reordering of images for existing products"""
+        if self.current_product and self.current_product.get('_id'):
+            self.reorder_writer.submit(self.current_product['_id'], list(reordered_urls), self.saved_image_urls)
+
+    def write_image_order(self, product_id, image_urls, previous_urls):
+        # Runs on the writer's worker thread
+        image_orders = [
+            {'url': url, 'order': idx} 
+            for idx, url in enumerate(image_urls)
+        ]
+        return self.api_client.reorder_product_images(product_id, image_orders)
+
+    def handle_reorder_committed(self, product_id, image_urls):
+        if self.current_product and self.current_product.get('_id') == product_id:
+            if (self.image_upload.image_urls == self.saved_image_urls
+                    and not self.reorder_writer.has_pending(product_id)):
+                # The product was opened again while the write was in flight
+                # and loaded the order from before it
+                self.image_upload.set_images(image_urls)
+            self.saved_image_urls = list(image_urls)
+        self.console.log("Image order updated successfully", "SUCCESS")
+
+    def handle_reorder_failed(self, product_id, previous_urls, error):
+        if self.current_product and self.current_product.get('_id') == product_id and previous_urls is not None:
+            # Put the thumbnails back in the order the server still has
+            self.image_upload.set_images(previous_urls)
+        self.console.log("Failed to update image order", "ERROR")
     
     def load_categories(self):
-        try:
-            categories = self.api_client.get_categories()
-            self.category_input.clear()
-            if categories:
-                for category in categories:
-                    self.category_input.addItem(category.get('name', ''), category.get('_id'))
-        except Exception as e:
-            print(f"Error loading categories: {e}")
+        """Fetch categories in the background and fill the combo box when they arrive"""
+        self.category_input.setPlaceholderText("Loading categories...")
+        self.api_client.executor.submit(
+            self.api_client.categories.all,
+            on_result=self.set_categories,
+            on_error=self.handle_categories_error,
+            tag='categories'
+        )
+    
+    def handle_categories_error(self, error):
+        logger.error(f"Error loading categories: {error}")
+        self.console.log(f"Error loading categories: {error}", "ERROR")
+        self.category_input.setPlaceholderText("")
+    
+    def set_categories(self, categories):
+        self.category_input.clear()
+        self.category_input.setPlaceholderText("")
+        if categories:
+            for category in categories:
+                self.category_input.addItem(category.get('name', ''), category.get('_id'))
+        # Categories may arrive after a product was put in the form
+        if self.current_product:
+            self.select_category(self.current_category_id)
+    
+    def select_category(self, category_id):
+        self.current_category_id = category_id
+        if category_id:
+            category_index = self.category_input.findData(category_id)
+            if category_index >= 0:
+                self.category_input.setCurrentIndex(category_index)
+    
+    def set_busy(self, message=None):
+        """Lock the form and show message on the submit button while a request runs"""
+        busy = message is not None
+        self.form_container.setEnabled(not busy)
+        self.submit_btn.setEnabled(not busy)
+        self.clear_btn.setEnabled(not busy)
+        if busy:
+            self.submit_btn.setText(message)
+        else:
+            self.submit_btn.setText("Update Product" if self.current_product else "Add Product")
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -985,6 +1948,7 @@ class ProductFormWidget(QWidget):
         
         form_container = QWidget()
         form_container.setObjectName("FormContainer")
+        self.form_container = form_container
         form_layout = QFormLayout(form_container)
         form_layout.setSpacing(10)
         form_layout.setContentsMargins(0, 0, 0, 0)
@@ -1079,7 +2043,9 @@ class ProductFormWidget(QWidget):
     def set_edit_mode(self, product):
         """Set the form to edit mode and populate with product data"""
         try:
+            self.reorder_writer.flush()
             self.current_product = product
+            self.form_generation += 1
             self.title_label.setText("Edit Product")
             self.submit_btn.setText("Update Product")
             
@@ -1115,30 +2081,72 @@ class ProductFormWidget(QWidget):
             except (TypeError, ValueError):
                 self.stock_input.setValue(0)
             
-            # Set category
-            category_id = product.get('category')
-            if category_id:
-                category_index = self.category_input.findData(category_id)
-                if category_index >= 0:
-                    self.category_input.setCurrentIndex(category_index)
-            
-            # Load and display existing images
-            if product.get('_id'):
-                image_urls = self.api_client.get_product_preview_images(product['_id'])
-                if image_urls:
-                    self.image_upload.set_images(image_urls)
-                else:
-                    self.image_upload.set_images([])
+            # Category and images may need the API, so they are filled in
+            # when the background lookup returns
+            self.current_category_id = None
+            self.saved_image_urls = []
+            if self.is_full_product(product) and not self.api_client.categories.is_stale():
+                # Nothing to fetch, e.g. the product came from the prefetch cache
+                self.apply_edit_details(product, self.load_edit_details(product))
+                return
+            self.image_upload.set_images([])
+            self.set_busy("Loading...")
+            self.api_client.executor.submit(
+                self.load_edit_details, product,
+                on_result=lambda details, product=product: self.apply_edit_details(product, details),
+                on_error=self.handle_edit_details_error,
+                tag='edit-details'
+            )
             
         except Exception as e:
             logger.error(f"Error in set_edit_mode: {str(e)}")
             logger.error(traceback.format_exc())
     
+    @staticmethod
+    def is_full_product(product):
+        """True for a document from the API rather than a table row"""
+        return bool(product.get('_id') and 'images' in product and product.get('updatedAt'))
+
+    def load_edit_details(self, product):
+        """Resolve the category and fetch the images for product (worker thread)"""
+        # Category may be a populated dict, an _id or a name from the table
+        category_id = self.api_client.categories.resolve_id(product.get('category'))
+        if self.is_full_product(product):
+            # A full document (e.g. prefetched) already has the images
+            image_urls = [img['url'] for img in sorted(product['images'], key=lambda x: x.get('order', 0))]
+            self.api_client.image_tracker.update_product_images(
+                product['_id'], image_urls, server_updated_at=product['updatedAt'])
+        elif product.get('_id'):
+            image_urls = self.api_client.get_product_preview_images(product['_id'])
+        else:
+            image_urls = []
+        return category_id, image_urls
+    
+    def apply_edit_details(self, product, details):
+        if product is not self.current_product:
+            return
+        category_id, image_urls = details
+        self.select_category(category_id)
+        # Load and display existing images
+        self.saved_image_urls = list(image_urls)
+        self.image_upload.set_images(image_urls)
+        self.set_busy(None)
+    
+    def handle_edit_details_error(self, error):
+        logger.error(f"Error loading product details: {error}")
+        self.console.log(f"Error loading product details: {error}", "ERROR")
+        self.set_busy(None)
+    
     def set_add_mode(self):
+        self.reorder_writer.flush()
         self.current_product = None
+        self.current_category_id = None
+        self.form_generation += 1
+        self.set_busy(None)
         self.title_label.setText("Add New Product")
         self.submit_btn.setText("Add Product")
         self.clear_form()
+        self.add_mode_entered.emit()
     
     def clear_form(self):
         self.name_input.clear()
@@ -1158,32 +2166,83 @@ class ProductFormWidget(QWidget):
                 'originalPrice': self.original_price_input.value(),
                 'stock': self.stock_input.value(),
                 'category': self.category_input.currentData(),
-                'images': self.image_upload.image_urls  # Use the direct image_urls attribute
+                'images': list(self.image_upload.image_urls)  # Copied; the form may change while saving
             }
             
+            # Results for a form the user has since left must not reset it
+            generation = self.form_generation
             if self.current_product:  # Update existing product
                 product_id = self.current_product['_id']
+                # The update sends the current image order, so unsent reorders are redundant
+                self.reorder_writer.discard(product_id)
                 logger.info(f"Updating product {product_id} with images: {product_data['images']}")
-                response = self.api_client.update_product(product_id, product_data)
-                if response:
-                    self.console.log(f"Product updated: {response['name']}", "SUCCESS")
-                    self.product_updated.emit()
-                    self.set_add_mode()
+                self.set_busy("Saving...")
+                self.api_client.executor.submit(
+                    self.save_product, product_id, product_data,
+                    on_result=lambda response: self.handle_product_updated(response, generation),
+                    on_error=lambda e: self.handle_submit_error(e, generation)
+                )
             else:  # Add new product
-                response = self.api_client.create_product(product_data)
-                if response:
-                    self.console.log(f"Product created: {response['name']}", "SUCCESS")
-                    self.product_added.emit()
-                    self.clear_form()
+                self.set_busy("Saving...")
+                self.api_client.executor.submit(
+                    self.save_product, None, product_data,
+                    on_result=lambda response: self.handle_product_created(response, generation),
+                    on_error=lambda e: self.handle_submit_error(e, generation)
+                )
                 
         except Exception as e:
-            self.console.log(f"Error submitting product: {str(e)}", "ERROR")
-            logger.error(f"Product submission error: {str(e)}")
+            self.handle_submit_error(e)
             logger.error(traceback.format_exc())
     
+    def save_product(self, product_id, product_data):
+        """Create or update a product (worker thread)"""
+        if product_id:
+            response = self.api_client.update_product(product_id, product_data)
+        else:
+            response = self.api_client.create_product(product_data)
+        # The table names the response's category from the index; load it here, not on the GUI thread
+        self.api_client.categories.ensure_fresh()
+        return response
+    
+    def handle_product_updated(self, response, generation=None):
+        current = generation is None or generation == self.form_generation
+        if current:
+            self.set_busy(None)
+        if response:
+            self.console.log(f"Product updated: {response['name']}", "SUCCESS")
+            self.product_updated.emit(response)
+            if current:
+                self.set_add_mode()
+        else:
+            self.console.log("Failed to update product", "ERROR")
+    
+    def handle_product_created(self, response, generation=None):
+        current = generation is None or generation == self.form_generation
+        if current:
+            self.set_busy(None)
+        if response:
+            self.console.log(f"Product created: {response['name']}", "SUCCESS")
+            self.product_added.emit(response)
+            if current:
+                self.clear_form()
+        else:
+            self.console.log("Failed to create product", "ERROR")
+    
+    def handle_submit_error(self, error, generation=None):
+        if generation is None or generation == self.form_generation:
+            self.set_busy(None)
+        self.console.log(f"Error submitting product: {str(error)}", "ERROR")
+        logger.error(f"Product submission error: {str(error)}")
+    
+    def hideEvent(self, event):
+        # Send pending reorders once the form is no longer on screen
+        self.reorder_writer.flush()
+        super().hideEvent(event)
+
     # Signals
-    product_added = pyqtSignal()
-    product_updated = pyqtSignal()
+    product_added = pyqtSignal(dict)
+    product_updated = pyqtSignal(dict)
+    add_mode_entered = pyqtSignal()
 
 class DatabaseWorker(QThread):
     finished = pyqtSignal(bool, str)
@@ -1231,6 +2290,384 @@ class DatabaseWorker(QThread):
         except Exception as e:
             self.finished.emit(False, str(e))
 
+class ProductPageLoader(QThread):
+    """Stream product pages from the API off the GUI thread"""
+    page_loaded = pyqtSignal(list, int)  # products on this page, products loaded so far
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, api_client, page_size=200):
+        super().__init__()
+        self.api_client = api_client
+        self.page_size = page_size
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        loaded = 0
+        pages = self.api_client.iter_product_pages(self.page_size)
+        try:
+            for products in pages:
+                if self._cancelled.is_set():
+                    # A partial listing must not be treated as complete
+                    self.finished.emit(False, "Cancelled")
+                    return
+                loaded += len(products)
+                self.page_loaded.emit(products, loaded)
+            self.finished.emit(True, f"Loaded {loaded} products")
+        except Exception as e:
+            logger.error(f"Error loading products: {e}")
+            self.finished.emit(False, str(e))
+        finally:
+            pages.close()
+
+class CsvImportWorker(QThread):
+    """Stream a product CSV and create products through a bounded worker pool"""
+    progress = pyqtSignal(int, int)  # processed rows, total rows
+    row_failed = pyqtSignal(int, str, str)  # row number, product name, error
+    finished = pyqtSignal(dict)  # summary
+
+    def __init__(self, api_client, file_path, max_in_flight=8, batch_size=200):
+        super().__init__()
+        self.api_client = api_client
+        self.file_path = file_path
+        self.max_in_flight = max(1, max_in_flight)
+        self.batch_size = max(1, batch_size)
+        self._cancelled = threading.Event()
+        self.processed = 0
+        self.successful = 0
+        self.failures = []
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def open_reader(self, file):
+        return csv.DictReader(
+            file,
+            quoting=csv.QUOTE_ALL,
+            quotechar='"',
+            skipinitialspace=True
+        )
+
+    def count_rows(self):
+        """Count data rows without keeping them in memory"""
+        with open(self.file_path, 'r', encoding='utf-8', newline='') as file:
+            return sum(1 for _ in self.open_reader(file))
+
+    def iter_batches(self, reader):
+        """Lazily yield (row_number, row) batches from the reader"""
+        batch = []
+        for row_number, row in enumerate(reader, start=1):
+            batch.append((row_number, row))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def parse_row(row, categories):
+        """Validate a CSV row and build the product payload, raising ValueError on bad data"""
+        def field(name, default=''):
+            return (row.get(name) or default).strip()
+
+        name = field('name')
+        if not name:
+            raise ValueError("Product name is required")
+
+        product_data = {
+            'name': name,
+            'description': field('description'),
+            'price': float(field('price', '0')),
+            'stock': int(field('stock', '0')),
+        }
+
+        category_name = field('category')
+        category_id = categories.id_for_name(category_name)
+        if not category_id:
+            raise ValueError(f"Category '{category_name}' not found")
+        product_data['category'] = category_id
+
+        original_price = field('originalPrice')
+        if original_price:
+            try:
+                product_data['originalPrice'] = float(original_price)
+            except ValueError:
+                pass
+
+        return product_data
+
+    def record_failure(self, row_number, row, error):
+        name = (row.get('name') or 'Unknown').strip() or 'Unknown'
+        self.failures.append({
+            'row': row_number,
+            'name': name,
+            'error': error,
+            'data': row
+        })
+        self.row_failed.emit(row_number, name, error)
+
+    def collect(self, futures, submitted, total):
+        for future in futures:
+            row_number, row = submitted.pop(future)
+            try:
+                if future.result():
+                    self.successful += 1
+                else:
+                    self.record_failure(row_number, row, "API call failed")
+            except Exception as e:
+                self.record_failure(row_number, row, str(e))
+            self.processed += 1
+            self.progress.emit(self.processed, total)
+
+    def write_failure_report(self, total, started_at):
+        """Write failed rows as JSON next to the source CSV and return the report path"""
+        base, _ = os.path.splitext(self.file_path)
+        report_path = f"{base}_import_failures.json"
+        report = {
+            'source': self.file_path,
+            'started_at': started_at,
+            'finished_at': QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate),
+            'total': total,
+            'processed': self.processed,
+            'successful': self.successful,
+            'failed': len(self.failures),
+            'cancelled': self._cancelled.is_set(),
+            'failures': sorted(self.failures, key=lambda f: f['row'])
+        }
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report_path
+
+    def run(self):
+        started_at = QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate)
+        summary = {'total': 0, 'successful': 0, 'failed': 0, 'cancelled': False,
+                   'report_path': None, 'error': None}
+        try:
+            total = self.count_rows()
+            summary['total'] = total
+            self.progress.emit(0, total)
+
+            categories = self.api_client.categories
+            categories.ensure_fresh()
+
+            submitted = {}
+            with open(self.file_path, 'r', encoding='utf-8', newline='') as file, \
+                    ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+                for batch in self.iter_batches(self.open_reader(file)):
+                    if self._cancelled.is_set():
+                        break
+
+                    for row_number, row in batch:
+                        try:
+                            product_data = self.parse_row(row, categories)
+                        except ValueError as ve:
+                            self.record_failure(row_number, row, f"Invalid data: {ve}")
+                            self.processed += 1
+                            self.progress.emit(self.processed, total)
+                            continue
+
+                        # Keep at most max_in_flight creates outstanding
+                        while len(submitted) >= self.max_in_flight:
+                            done, _ = wait(submitted, return_when=FIRST_COMPLETED)
+                            self.collect(done, submitted, total)
+
+                        if self._cancelled.is_set():
+                            break
+                        future = executor.submit(self.api_client.create_product, product_data)
+                        submitted[future] = (row_number, row)
+
+                if submitted:
+                    done, _ = wait(submitted)
+                    self.collect(done, submitted, total)
+
+            summary['cancelled'] = self._cancelled.is_set()
+            if self.failures:
+                summary['report_path'] = self.write_failure_report(total, started_at)
+        except Exception as e:
+            logger.error(f"CSV import error: {e}")
+            logger.error(traceback.format_exc())
+            summary['error'] = str(e)
+
+        summary['processed'] = self.processed
+        summary['successful'] = self.successful
+        summary['failed'] = len(self.failures)
+        summary['failures'] = sorted(self.failures, key=lambda f: f['row'])
+        self.finished.emit(summary)
+
+class BulkDeleteWorker(QThread):
+    """Delete many products with adaptive concurrency, or server-side when requested
+
+    Concurrency grows by one after a full window of successful deletes and is
+    halved on 429/5xx responses, which also pause new submissions for the
+    Retry-After time (or an exponential backoff) before the id is retried.
+    Deletes go through a transport without retries of its own, so throttling
+    reaches this loop at once instead of after hidden retries.
+    """
+    progress = pyqtSignal(int, int)  # processed, total
+    finished = pyqtSignal(dict)  # summary
+
+    THROTTLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_client, product_ids=None, server_side=False, max_concurrency=16,
+                 initial_concurrency=4, max_attempts=5, base_backoff=0.5, max_backoff=30.0):
+        super().__init__()
+        self.api_client = api_client
+        self.product_ids = list(product_ids) if product_ids is not None else None
+        self.server_side = server_side
+        self.max_concurrency = max(1, max_concurrency)
+        self.initial_concurrency = min(max(1, initial_concurrency), self.max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def retry_delay(self, response, consecutive_throttles):
+        retry_after = response.headers.get('Retry-After') if hasattr(response, 'headers') else None
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), self.max_backoff)
+        except ValueError:
+            pass
+        return min(self.base_backoff * (2 ** consecutive_throttles), self.max_backoff)
+
+    def delete_server_side(self, summary):
+        """Delete in server round-trip batches; returns False if a full wipe is not supported"""
+        if self.product_ids is None:
+            result = self.api_client.bulk_delete_products()
+            if result is None:
+                return False
+            summary['deleted'] = result.get('deletedCount', 0)
+            summary['total'] = summary['deleted']
+            self.progress.emit(summary['deleted'], summary['total'])
+            return True
+
+        batch_size = 500
+        total = len(self.product_ids)
+        summary['total'] = total
+        processed = 0
+        for start in range(0, total, batch_size):
+            if self._cancelled.is_set():
+                break
+            batch = self.product_ids[start:start + batch_size]
+            for product_id, result in self.api_client.delete_products(batch).items():
+                if result['status'] == 'deleted':
+                    summary['deleted_ids'].append(product_id)
+                elif result['status'] == 'not_found':
+                    summary['not_found_ids'].append(product_id)
+                else:
+                    summary['failed'].append({'_id': product_id, 'error': result['error']})
+            processed += len(batch)
+            self.progress.emit(processed, total)
+        return True
+
+    def delete_adaptive(self, summary):
+        if self.product_ids is None:
+            self.product_ids = [p['_id'] for p in self.api_client.get_products()]
+
+        total = len(self.product_ids)
+        summary['total'] = total
+        self.progress.emit(0, total)
+
+        transport = ApiTransport(pool_maxsize=self.max_concurrency, max_retries=0)
+        try:
+            self.run_adaptive(summary, transport)
+        finally:
+            transport.close()
+
+    def run_adaptive(self, summary, transport):
+        total = summary['total']
+        queue = deque((product_id, 1) for product_id in self.product_ids)
+        in_flight = {}
+        concurrency = self.initial_concurrency
+        peak_concurrency = concurrency
+        successes_at_level = 0
+        consecutive_throttles = 0
+        resume_at = 0.0
+        last_throttle_at = 0.0
+        processed = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while queue or in_flight:
+                if self._cancelled.is_set():
+                    queue.clear()
+
+                now = time.monotonic()
+                if now >= resume_at:
+                    while queue and len(in_flight) < concurrency:
+                        product_id, attempt = queue.popleft()
+                        future = executor.submit(self.api_client.delete_product, product_id, transport)
+                        in_flight[future] = (product_id, attempt, now)
+
+                if not in_flight:
+                    # Paused for backoff with nothing outstanding
+                    self._cancelled.wait(max(resume_at - now, 0.01))
+                    continue
+
+                done, _ = wait(in_flight, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    product_id, attempt, submitted_at = in_flight.pop(future)
+                    success, result = future.result()
+                    status = getattr(result, 'status_code', None)
+
+                    if success or status == 404:
+                        if success:
+                            summary['deleted_ids'].append(product_id)
+                        else:
+                            summary['not_found_ids'].append(product_id)
+                        consecutive_throttles = 0
+                        successes_at_level += 1
+                        if successes_at_level >= concurrency and concurrency < self.max_concurrency:
+                            concurrency += 1
+                            peak_concurrency = max(peak_concurrency, concurrency)
+                            successes_at_level = 0
+                    elif (status is None or status in self.THROTTLE_STATUS_CODES) and attempt < self.max_attempts:
+                        summary['throttled'] += 1
+                        queue.append((product_id, attempt + 1))
+                        # Requests sent before the last throttle belong to the same
+                        # burst and should not shrink the window or grow the backoff again
+                        if submitted_at >= last_throttle_at:
+                            last_throttle_at = time.monotonic()
+                            concurrency = max(1, concurrency // 2)
+                            successes_at_level = 0
+                            resume_at = max(resume_at, last_throttle_at + self.retry_delay(result, consecutive_throttles))
+                            consecutive_throttles += 1
+                        continue
+                    else:
+                        message = f"{status}: {result.text}" if status is not None else str(result)
+                        summary['failed'].append({'_id': product_id, 'error': message})
+
+                    processed += 1
+                    self.progress.emit(processed, total)
+
+        summary['peak_concurrency'] = peak_concurrency
+
+    def run(self):
+        summary = {'all': self.product_ids is None, 'total': 0, 'deleted': 0, 'deleted_ids': [],
+                   'not_found_ids': [], 'failed': [], 'throttled': 0, 'cancelled': False,
+                   'server_side': False, 'error': None}
+        started = time.monotonic()
+        try:
+            if self.server_side and self.delete_server_side(summary):
+                summary['server_side'] = True
+            else:
+                self.delete_adaptive(summary)
+        except Exception as e:
+            logger.error(f"Bulk delete error: {e}")
+            logger.error(traceback.format_exc())
+            summary['error'] = str(e)
+
+        if summary['deleted_ids']:
+            summary['deleted'] = len(summary['deleted_ids'])
+        summary['not_found'] = len(summary['not_found_ids'])
+        summary['cancelled'] = self._cancelled.is_set()
+        summary['elapsed'] = time.monotonic() - started
+        self.finished.emit(summary)
+
 class FrontendWorker(QThread):
     progress = pyqtSignal(str)
     status_changed = pyqtSignal(bool)  # True if running, False if stopped
@@ -1300,6 +2737,19 @@ class ProductManager(QMainWindow):
         self.backend_process = None
         self.db_worker = None
         self.frontend_worker = None
+        self.import_worker = None
+        self.delete_worker = None
+        self.product_loader = None
+        self.retired_loaders = []
+        # Full documents for rows on screen, so opening the edit form is instant
+        self.prefetcher = ProductPrefetcher(self.api_client.get_product_by_id, parent=self)
+        self.prefetcher.product_loaded.connect(self.on_product_prefetched)
+        self.prefetcher.product_failed.connect(self.on_product_prefetch_failed)
+        self.pending_edit = None  # Table row waiting for its full document
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(150)
+        self.prefetch_timer.timeout.connect(self.prefetch_visible_products)
         self.setup_ui()
         
     def setup_ui(self):
@@ -1448,7 +2898,7 @@ class ProductManager(QMainWindow):
                 selection-color: #ffffff;
                 border: 1px solid #3d3d3d;
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: #2d2d2d;
                 alternate-background-color: #353535;
                 color: #ffffff;
@@ -1462,7 +2912,7 @@ class ProductManager(QMainWindow):
                 padding: 5px;
                 border: 1px solid #3d3d3d;
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: #0d47a1;
             }}
             QScrollBar:vertical {{
@@ -1574,9 +3024,14 @@ class ProductManager(QMainWindow):
         self.delete_btn = QPushButton("Delete Selected")
         self.delete_btn.clicked.connect(self.delete_selected_products)
         self.delete_btn.setEnabled(False)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter products...")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setFixedWidth(220)
         
         toolbar_layout.addWidget(refresh_btn)
         toolbar_layout.addWidget(upload_btn)
+        toolbar_layout.addWidget(self.filter_input)
         toolbar_layout.addStretch()
         toolbar_layout.addWidget(self.edit_selected_btn)
         toolbar_layout.addWidget(self.delete_btn)
@@ -1594,9 +3049,15 @@ class ProductManager(QMainWindow):
         left_layout.setContentsMargins(0, 0, 0, 0)
         
         # Product list
-        self.product_table = ProductTableWidget()
+        self.product_table = ProductTableWidget(self.api_client.categories)
         self.product_table.edit_clicked.connect(self.edit_product)
+        self.filter_input.textChanged.connect(self.product_table.set_filter_text)
         self.product_table.selection_changed_signal.connect(self.update_button_states)
+        # Prefetch once scrolling, sorting or filtering settles
+        self.product_table.verticalScrollBar().valueChanged.connect(self.prefetch_timer.start)
+        self.product_table.proxy_model.layoutChanged.connect(self.prefetch_timer.start)
+        self.product_table.proxy_model.rowsInserted.connect(self.prefetch_timer.start)
+        self.product_table.proxy_model.modelReset.connect(self.prefetch_timer.start)
         left_layout.addWidget(self.product_table)
         
         # Console
@@ -1605,8 +3066,11 @@ class ProductManager(QMainWindow):
         
         # Right side (product form)
         self.product_form = ProductFormWidget(self.api_client, self.console)
-        self.product_form.product_added.connect(self.refresh_products)
-        self.product_form.product_updated.connect(self.refresh_products)
+        self.product_form.product_added.connect(self.on_product_saved)
+        self.product_form.product_updated.connect(self.on_product_saved)
+        self.product_form.reorder_writer.committed.connect(lambda product_id, _: self.prefetcher.invalidate(product_id))
+        # A product still loading for the form must not switch it back to edit mode
+        self.product_form.add_mode_entered.connect(self.cancel_pending_edit)
         
         # Add widgets to splitter
         content_splitter.addWidget(left_widget)
@@ -1698,14 +3162,57 @@ class ProductManager(QMainWindow):
                 
     def refresh_products(self):
         try:
-            products = self.api_client.get_products()
-            self.product_table.populate_products(products)
-            self.update_button_states()  # Update button states after refresh
+            # Drop any load still in flight; its pages would be stale
+            if self.product_loader and self.product_loader.isRunning():
+                self.product_loader.cancel()
+                self.product_loader.page_loaded.disconnect()
+                self.product_loader.finished.disconnect()
+                # Keep a reference until the thread exits on its own
+                self.retired_loaders.append(self.product_loader)
+            self.retired_loaders = [loader for loader in self.retired_loaders if loader.isRunning()]
+
+            # Rows stay in place; the new listing is diffed against them
+            self.product_table.begin_sync()
+            self.product_table.set_loading("Loading products...")
+            self.update_button_states()
             # Clear the form and set to add mode
             self.product_form.set_add_mode()
+            self.statusBar().showMessage("Loading products...")
+
+            self.product_loader = ProductPageLoader(self.api_client)
+            self.product_loader.page_loaded.connect(self.on_products_page_loaded)
+            self.product_loader.finished.connect(self.on_products_loaded)
+            self.product_loader.start()
         except Exception as e:
             print(f"Error refreshing products: {e}")
     
+    def on_products_page_loaded(self, products, loaded):
+        self.product_table.sync_products(products)
+        # The listing carries updatedAt, which validates the image tracker for free
+        self.api_client.image_tracker.validate({p['_id']: p.get('updatedAt') for p in products})
+        # Listing entries are full documents, so they can open the edit form as is
+        self.prefetcher.seed(p for p in products if 'images' in p)
+        self.statusBar().showMessage(f"Loading products... {loaded}")
+    
+    def on_products_loaded(self, success, message):
+        self.product_table.set_loading(None if success else "Could not load products")
+        if success:
+            # Only a complete listing can tell which products are gone
+            changes = self.product_table.finish_sync()
+            # Tracked products missing from the listing were probably deleted
+            # elsewhere; confirm in one bulk request and drop them
+            listed = set(self.product_table.product_model.ids)
+            unlisted = [pid for pid in self.api_client.image_tracker.product_ids() if pid not in listed]
+            if unlisted:
+                self.api_client.executor.submit(self.api_client.validate_image_cache, unlisted)
+            logger.info(f"Product refresh: {changes['inserted']} added, "
+                        f"{changes['updated']} updated, {changes['removed']} removed")
+            self.statusBar().showMessage(message)
+        else:
+            self.statusBar().showMessage("Error loading products")
+            print(f"Error refreshing products: {message}")
+        self.update_button_states()  # Update button states after refresh
+    
     def update_button_states(self):
         selected_products = self.product_table.get_selected_products()
         selected_count = len(selected_products)
@@ -1713,245 +3220,211 @@ class ProductManager(QMainWindow):
         self.edit_selected_btn.setEnabled(selected_count == 1)
         print(f"Selection changed: {selected_count} products selected")  # Debug print
     
+    def on_product_saved(self, product):
+        """Patch the saved product's row instead of reloading the catalog"""
+        self.prefetcher.invalidate(product.get('_id'))
+        self.product_table.upsert_product(product)
+        self.update_button_states()
+        self.statusBar().showMessage(f"Saved {product.get('name', 'product')}")
+    
     def delete_selected_products(self):
-        selected_rows = sorted(set(item.row() for item in self.product_table.selectedItems()))
-        if not selected_rows:
+        product_ids = self.product_table.get_selected_products()
+        if not product_ids:
             return
-            
+
+        if self.delete_worker and self.delete_worker.isRunning():
+            QMessageBox.information(self, "Info", "A delete operation is already running.")
+            return
+
         if QMessageBox.question(
             self,
             "Confirm Delete",
-            f"Delete {len(selected_rows)} selected products?",
+            f"Delete {len(product_ids)} selected products?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         ) != QMessageBox.StandardButton.Yes:
             return
-            
-        progress = QProgressDialog("Deleting products...", "Cancel", 0, len(selected_rows), self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        
-        success = 0
-        failed = 0
-        
-        for i, row in enumerate(selected_rows):
-            product_id = self.product_table.item(row, 0).text()
-            progress.setValue(i)
-            
-            if progress.wasCanceled():
-                break
-                
-            success_flag, result = self.api_client.delete_product(product_id)
-            if success_flag:
-                success += 1
-            else:
-                failed += 1
-                logger.error(f"Failed to delete product {product_id}: {result}")
-                
-        progress.setValue(len(selected_rows))
-        
-        QMessageBox.information(
-            self,
-            "Delete Results",
-            f"Successfully deleted: {success}\nFailed to delete: {failed}"
-        )
-        
-        self.refresh_products()
-        
+
+        self.start_bulk_delete(product_ids, server_side=True)
+
     def clear_all_products(self):
-        reply = QMessageBox.question(
+        if self.delete_worker and self.delete_worker.isRunning():
+            QMessageBox.information(self, "Info", "A delete operation is already running.")
+            return
+
+        confirm = QMessageBox(self)
+        confirm.setIcon(QMessageBox.Icon.Question)
+        confirm.setWindowTitle("Confirm Delete")
+        confirm.setText("Are you sure you want to delete ALL products?")
+        confirm.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        server_side_box = QCheckBox("Use server-side bulk delete")
+        server_side_box.setChecked(True)
+        confirm.setCheckBox(server_side_box)
+
+        if confirm.exec() != QMessageBox.StandardButton.Yes:
+            return
+
+        self.start_bulk_delete(None, server_side=server_side_box.isChecked())
+
+    def start_bulk_delete(self, product_ids, server_side=False):
+        """Run a BulkDeleteWorker for the given ids (None deletes every product)"""
+        count = "all" if product_ids is None else len(product_ids)
+        self.console.log(f"Deleting {count} products{' (server-side)' if server_side else ''}...", "INFO")
+
+        self.delete_progress = QProgressDialog("Deleting products...", "Cancel", 0, 0, self)
+        self.delete_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.delete_progress.setWindowTitle("Delete Progress")
+        self.delete_progress.setAutoClose(False)
+        self.delete_progress.setAutoReset(False)
+
+        self.delete_worker = BulkDeleteWorker(self.api_client, product_ids, server_side=server_side)
+        self.delete_worker.progress.connect(self.on_delete_progress)
+        self.delete_worker.finished.connect(self.on_delete_complete)
+        self.delete_progress.canceled.connect(self.cancel_delete)
+
+        self.delete_progress.show()
+        self.delete_worker.start()
+
+    def on_delete_progress(self, processed, total):
+        if self.delete_progress.maximum() != total:
+            self.delete_progress.setMaximum(total)
+        self.delete_progress.setValue(processed)
+
+    def cancel_delete(self):
+        if self.delete_worker and self.delete_worker.isRunning():
+            self.delete_worker.cancel()
+            self.delete_progress.setLabelText("Cancelling - waiting for in-flight requests...")
+            self.console.log("Delete cancelled by user", "WARNING")
+
+    def on_delete_complete(self, summary):
+        # close() emits canceled, and the worker may not have returned from run() yet
+        self.delete_progress.canceled.disconnect(self.cancel_delete)
+        self.delete_progress.close()
+
+        if summary['error']:
+            error_msg = f"Error deleting products: {summary['error']}"
+            self.console.log(error_msg, "ERROR")
+            QMessageBox.critical(self, "Error", error_msg)
+        else:
+            failed = summary['failed']
+            for failure in failed:
+                logger.error(f"Failed to delete product {failure['_id']}: {failure['error']}")
+
+            title = "Delete Cancelled" if summary['cancelled'] else "Delete Complete"
+            message = (f"Deleted: {summary['deleted']}\nFailed: {len(failed)}"
+                       f"\nAlready gone: {summary['not_found']}\nTotal: {summary['total']}")
+            if summary['server_side']:
+                message += "\n\nDeleted server-side in bulk."
+            elif summary['throttled']:
+                message += f"\n\nServer throttled {summary['throttled']} requests; retried with backoff."
+            message += f"\nTime: {summary['elapsed']:.1f}s"
+
+            self.console.log(
+                f"{title} - Deleted: {summary['deleted']}, Failed: {len(failed)}, "
+                f"Already gone: {summary['not_found']}",
+                "WARNING" if failed else "SUCCESS"
+            )
+            QMessageBox.information(self, title, message)
+
+        if summary['all']:
+            self.refresh_products()
+        else:
+            # Drop only the rows that are gone instead of reloading the catalog
+            self.product_table.remove_products(summary['deleted_ids'] + summary['not_found_ids'])
+            for product_id in summary['deleted_ids'] + summary['not_found_ids']:
+                self.prefetcher.invalidate(product_id)
+            self.update_button_states()
+
+    def upload_csv(self):
+        if self.import_worker and self.import_worker.isRunning():
+            QMessageBox.information(self, "Info", "A CSV import is already running.")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Confirm Delete",
-            "Are you sure you want to delete ALL products?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            "Select CSV File",
+            "",
+            "CSV Files (*.csv)"
         )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            try:
-                # Get all products
-                products = self.api_client.get_products()
-                
-                if not products:
-                    QMessageBox.information(self, "Info", "No products to delete.")
-                    return
-                
-                # Create progress dialog
-                progress = QProgressDialog("Deleting products...", "Cancel", 0, len(products), self)
-                progress.setWindowModality(Qt.WindowModality.WindowModal)
-                progress.setWindowTitle("Delete Progress")
-                
-                deleted_count = 0
-                failed_count = 0
-                
-                # Delete products one by one
-                for i, product in enumerate(products):
-                    if progress.wasCanceled():
-                        break
-                    
-                    progress.setValue(i)
-                    QApplication.processEvents()  # Keep UI responsive
-                    
-                    try:
-                        product_id = product['_id']
-                        if self.api_client.delete_products([product_id]):
-                            deleted_count += 1
-                            print(f"Deleted product: {product['name']}")
-                        else:
-                            failed_count += 1
-                            print(f"Failed to delete product: {product['name']}")
-                        
-                        # Add a small delay to prevent overwhelming the API
-                        time.sleep(0.2)
-                        
-                    except Exception as e:
-                        failed_count += 1
-                        print(f"Error deleting product {product.get('name', 'Unknown')}: {e}")
-                
-                progress.setValue(len(products))
-                
-                # Show results
-                QMessageBox.information(
-                    self,
-                    "Delete Complete",
-                    f"Delete operation completed!\nDeleted: {deleted_count}\nFailed: {failed_count}\nTotal processed: {len(products)}"
-                )
-                
-                # Refresh the product list
-                self.refresh_products()
-            
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "Error",
-                    f"Error clearing products: {str(e)}"
-                )
-    
-    def upload_csv(self):
-        try:
-            file_path, _ = QFileDialog.getOpenFileName(
-                self,
-                "Select CSV File",
-                "",
-                "CSV Files (*.csv)"
-            )
-            
-            if not file_path:
-                return
-                
-            # Read CSV file with proper quote handling
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(
-                    file,
-                    quoting=csv.QUOTE_ALL,  # Changed to QUOTE_ALL to handle all quoted fields
-                    quotechar='"',
-                    skipinitialspace=True
-                )
-                
-                rows = list(reader)
-                
-                # Create progress dialog
-                progress = QProgressDialog("Uploading products...", "Cancel", 0, len(rows), self)
-                progress.setWindowModality(Qt.WindowModality.WindowModal)
-                progress.setWindowTitle("Upload Progress")
-                
-                successful = 0
-                failed = 0
-                failed_products = []
-                
-                self.console.log(f"Starting CSV upload from: {file_path}", "INFO")
-                
-                for i, row in enumerate(rows):
-                    if progress.wasCanceled():
-                        self.console.log("Upload cancelled by user", "WARNING")
-                        break
-                        
-                    progress.setValue(i)
-                    QApplication.processEvents()
-                    
-                    try:
-                        # Clean and prepare product data
-                        product_data = {
-                            'name': row.get('name', '').strip(),
-                            'description': row.get('description', '').strip(),
-                            'price': float(row.get('price', '0').strip()),
-                            'stock': int(row.get('stock', '0').strip()),
-                            'category': row.get('category', '').strip()
-                        }
-                        
-                        # Validate required fields
-                        if not product_data['name']:
-                            raise ValueError("Product name is required")
-                        
-                        # Find category ID by name
-                        categories = self.api_client.get_categories()
-                        category_id = None
-                        for category in categories:
-                            if category['name'].lower() == product_data['category'].lower():
-                                category_id = category['_id']
-                                break
-                        
-                        if not category_id:
-                            error_msg = f"Category '{product_data['category']}' not found"
-                            self.console.log(f"Failed to add {product_data['name']}: {error_msg}", "ERROR")
-                            failed_products.append((product_data['name'], error_msg))
-                            failed += 1
-                            continue
-                        
-                        # Update product data with category ID
-                        product_data['category'] = category_id
-                        
-                        # Add optional fields if present
-                        if 'originalPrice' in row:
-                            try:
-                                product_data['originalPrice'] = float(row['originalPrice'].strip())
-                            except (ValueError, AttributeError):
-                                pass
-                        
-                        # Create product
-                        response = self.api_client.create_product(product_data)
-                        
-                        if response:
-                            successful += 1
-                            self.console.log(f"Successfully added product: {product_data['name']}", "SUCCESS")
-                        else:
-                            error_msg = "API call failed"
-                            self.console.log(f"Failed to add {product_data['name']}: {error_msg}", "ERROR")
-                            failed_products.append((product_data['name'], error_msg))
-                            failed += 1
-                            
-                    except ValueError as ve:
-                        error_msg = f"Invalid data: {str(ve)}"
-                        self.console.log(f"Failed to add {row.get('name', 'Unknown')}: {error_msg}", "ERROR")
-                        failed_products.append((row.get('name', 'Unknown'), error_msg))
-                        failed += 1
-                    except Exception as e:
-                        error_msg = str(e)
-                        self.console.log(f"Failed to add {row.get('name', 'Unknown')}: {error_msg}", "ERROR")
-                        failed_products.append((row.get('name', 'Unknown'), error_msg))
-                        failed += 1
-                
-                progress.setValue(len(rows))
-                
-                # Log final summary
-                self.console.log(f"Upload completed - Successful: {successful}, Failed: {failed}", "INFO")
-                
-                # Prepare detailed result message
-                result_message = f"Upload completed!\n\nSuccessful: {successful}\nFailed: {failed}\nTotal processed: {len(rows)}"
-                
-                if failed_products:
-                    result_message += "\n\nFailed Products Details:"
-                    for product_name, error in failed_products:
-                        result_message += f"\n• {product_name}: {error}"
-                
-                # Show results in a message box
-                QMessageBox.information(self, "Upload Complete", result_message)
-                
-                # Refresh product list
-                self.refresh_products()
-                
-        except Exception as e:
-            error_msg = f"Error uploading CSV: {str(e)}"
+
+        if not file_path:
+            return
+
+        self.console.log(f"Starting CSV upload from: {file_path}", "INFO")
+
+        # Progress dialog stays responsive since the import runs on a worker thread
+        self.import_progress = QProgressDialog("Uploading products...", "Cancel", 0, 0, self)
+        self.import_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.import_progress.setWindowTitle("Upload Progress")
+        self.import_progress.setAutoClose(False)
+        self.import_progress.setAutoReset(False)
+
+        self.import_worker = CsvImportWorker(self.api_client, file_path)
+        self.import_worker.progress.connect(self.on_import_progress)
+        self.import_worker.row_failed.connect(
+            lambda row, name, error: self.console.log(f"Failed to add {name} (row {row}): {error}", "ERROR")
+        )
+        self.import_worker.finished.connect(self.on_import_complete)
+        self.import_progress.canceled.connect(self.cancel_import)
+
+        self.import_progress.show()
+        self.import_worker.start()
+
+    def on_import_progress(self, processed, total):
+        if self.import_progress.maximum() != total:
+            self.import_progress.setMaximum(total)
+        self.import_progress.setValue(processed)
+
+    def cancel_import(self):
+        if self.import_worker and self.import_worker.isRunning():
+            self.import_worker.cancel()
+            self.import_progress.setLabelText("Cancelling - waiting for in-flight requests...")
+            self.console.log("Upload cancelled by user", "WARNING")
+
+    def on_import_complete(self, summary):
+        # close() emits canceled, and the worker may not have returned from run() yet
+        self.import_progress.canceled.disconnect(self.cancel_import)
+        self.import_progress.close()
+
+        if summary['error']:
+            error_msg = f"Error uploading CSV: {summary['error']}"
             self.console.log(error_msg, "ERROR")
             QMessageBox.critical(self, "Error", error_msg)
-    
+            return
+
+        successful = summary['successful']
+        failed = summary['failed']
+
+        # Log final summary
+        self.console.log(f"Upload completed - Successful: {successful}, Failed: {failed}", "INFO")
+        stats = self.api_client.transport.stats()
+        self.console.log(
+            f"HTTP requests: {stats['requests']}, connections opened: {stats['connections_opened']}, "
+            f"reused: {stats['connections_reused']}",
+            "INFO"
+        )
+
+        # Prepare detailed result message
+        title = "Upload Cancelled" if summary['cancelled'] else "Upload Complete"
+        result_message = (f"{title}!\n\nSuccessful: {successful}\nFailed: {failed}"
+                          f"\nTotal processed: {summary['processed']} of {summary['total']}")
+
+        if summary['failures']:
+            max_listed = 20
+            result_message += "\n\nFailed Products Details:"
+            for failure in summary['failures'][:max_listed]:
+                result_message += f"\n• {failure['name']} (row {failure['row']}): {failure['error']}"
+            if failed > max_listed:
+                result_message += f"\n... and {failed - max_listed} more"
+        if summary['report_path']:
+            result_message += f"\n\nFailure report written to:\n{summary['report_path']}"
+            self.console.log(f"Failure report written to {summary['report_path']}", "WARNING")
+
+        # Show results in a message box
+        QMessageBox.information(self, title, result_message)
+
+        # Refresh product list
+        self.refresh_products()
+
     def seed_database(self):
         try:
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -2001,6 +3474,9 @@ class ProductManager(QMainWindow):
         self.progress_dialog.close()
         if success:
             self.console.log("\nDatabase seeded successfully!\n", "INFO")
+            # Seeding recreates categories with new ids
+            self.api_client.categories.invalidate()
+            self.product_form.load_categories()
             QMessageBox.information(self, "Success", "Database seeded successfully")
             self.refresh_products()
         else:
@@ -2052,39 +3528,34 @@ class ProductManager(QMainWindow):
         if self.db_worker and self.db_worker.isRunning():
             self.db_worker.terminate()
             self.db_worker.wait()
+        for worker in (self.import_worker, self.delete_worker, self.product_loader, *self.retired_loaders):
+            if worker and worker.isRunning():
+                worker.cancel()
+                worker.wait()
         if self.frontend_worker and self.frontend_worker.running:
             self.stop_frontend()
         self.stop_backend()
+        self.product_form.reorder_writer.shutdown()
+        self.api_client.executor.shutdown()
+        self.prefetcher.shutdown()
+        logger.info(f"Product prefetch stats: {self.prefetcher.stats()}")
+        self.api_client.uploads.shutdown()
+        self.api_client.image_tracker.close()
+        self.api_client.transport.close()
+        image_cache = ImageCache.instance()
+        image_cache.shutdown()
+        logger.info(f"Image cache stats: {image_cache.stats()}")
         event.accept()
     
     def edit_selected_product(self):
         selected_products = self.product_table.get_selected_products()
         if len(selected_products) == 1:
-            product_id = selected_products[0]
             try:
-                # Find the product in the current table data
-                for row in range(self.product_table.rowCount()):
-                    if self.product_table.item(row, 0).text() == product_id:
-                        # Get the product data from the table
-                        product = {
-                            '_id': product_id,
-                            'name': self.product_table.item(row, 1).text(),
-                            'price': float(self.product_table.item(row, 2).text().replace('$', '')),
-                            'stock': int(self.product_table.item(row, 3).text()),
-                            'category': self.product_table.item(row, 4).text(),
-                            'description': ''  # Will be fetched from API
-                        }
-                        
-                        # Fetch full product details from API
-                        try:
-                            full_product = self.api_client.get_product_by_id(product_id)
-                            if full_product:
-                                product.update(full_product)
-                        except Exception as e:
-                            print(f"Error fetching full product details: {e}")
-                        
-                        self.product_form.set_edit_mode(product)
-                        break
+                # Basic fields come from the table; edit_product fetches the rest
+                product = self.product_table.get_product(selected_products[0])
+                if product:
+                    product['description'] = ''
+                    self.edit_product(product)
             except Exception as e:
                 print(f"Error preparing product for edit: {e}")
     
@@ -2094,19 +3565,52 @@ class ProductManager(QMainWindow):
             # Debug log the product being edited
             logger.info(f"Editing product: {product}")
             
-            # If we only have basic data from the table, fetch full product details
+            # If we only have basic data from the table, use the prefetched
+            # full product, or fetch it ahead of the prefetch queue
             if product.get('_id') and not product.get('description'):
-                full_product = self.api_client.get_product_by_id(product['_id'])
-                if full_product:
-                    # Merge the full product data while keeping any local changes
-                    product.update(full_product)
-                    logger.info(f"Fetched full product data: {product}")
+                self.pending_edit = None
+                if self.product_form.reorder_writer.has_pending(product['_id']):
+                    # The cached copy predates the reorder being written
+                    self.prefetcher.invalidate(product['_id'])
+                full_product = self.prefetcher.request(product['_id'], product.get('updatedAt'))
+                if full_product is None:
+                    self.pending_edit = product
+                    self.product_form.set_busy("Loading...")
+                    return
+                self.show_product_for_edit(product, full_product)
+                return
             
             self.product_form.set_edit_mode(product)
         except Exception as e:
             logger.error(f"Error preparing product for edit: {e}")
             logger.error(traceback.format_exc())
     
+    def show_product_for_edit(self, product, full_product):
+        if full_product:
+            # Merge the full product data while keeping any local changes
+            product.update(full_product)
+            logger.info(f"Fetched full product data: {product}")
+        self.product_form.set_edit_mode(product)
+    
+    def cancel_pending_edit(self):
+        self.pending_edit = None
+    
+    def prefetch_visible_products(self):
+        products = self.product_table.visible_products()
+        if products:
+            self.prefetcher.prefetch(list(products), versions=products)
+    
+    def on_product_prefetched(self, product_id, full_product):
+        if self.pending_edit and self.pending_edit.get('_id') == product_id:
+            product, self.pending_edit = self.pending_edit, None
+            self.show_product_for_edit(product, full_product)
+    
+    def on_product_prefetch_failed(self, product_id, error):
+        if self.pending_edit and self.pending_edit.get('_id') == product_id:
+            product, self.pending_edit = self.pending_edit, None
+            self.console.log(f"Could not load full product: {error}", "WARNING")
+            self.show_product_for_edit(product, None)
+    
     def update_button_states(self):
         selected_count = len(self.product_table.get_selected_products())
         self.delete_btn.setEnabled(selected_count > 0)
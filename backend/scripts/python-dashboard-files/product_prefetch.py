@@ -0,0 +1,170 @@
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PRODUCTS = 300
+
+
+def is_current(product, updated_at):
+    """True unless the caller knows of a newer version than the cached product
+
+    updatedAt is an ISO timestamp, so string order is time order. A cached
+    copy newer than the caller's (e.g. refetched after a save the list has
+    not seen yet) is still good.
+    """
+    return not updated_at or (product.get('updatedAt') or '') >= updated_at
+
+
+class ProductPrefetcher(QObject):
+    """Keeps full product documents for the rows the user is looking at warm
+
+    prefetch() is handed the ids on screen plus their neighbours whenever the
+    view moves; ids that scrolled away before their turn are dropped. request()
+    is for a product needed right now and skips the prefetch queue; its
+    result is always reported, even if the product is invalidated or
+    scrolls out of view while it loads. Documents
+    live in a bounded LRU that is only touched on the GUI thread; workers
+    report back through signals.
+    """
+    product_loaded = pyqtSignal(str, dict)  # product id, full product
+    product_failed = pyqtSignal(str, str)  # product id, error message
+    _fetched = pyqtSignal(str, int, object, str)  # product id, generation, product or None, error
+
+    def __init__(self, fetch, max_products=DEFAULT_MAX_PRODUCTS, max_workers=4, parent=None):
+        super().__init__(parent)
+        # fetch(product_id) returns the full product dict or None; it runs on a worker thread
+        self.fetch = fetch
+        self.max_products = max_products
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='product-prefetch')
+        self.demand_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='product-fetch')
+        self.products = OrderedDict()  # product id -> full product, least recently used first
+        self._pending = {}  # product id -> future
+        self._generation = {}  # product id -> bumped on invalidate so late results are ignored
+        self._waiting = set()  # product ids asked for through request() and not reported yet
+        self._closed = False
+        self._fetched.connect(self.on_fetched)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, product_id, updated_at=None):
+        """Return the cached product, or None if missing or older than updated_at"""
+        product = self.products.get(product_id)
+        if product is None or not is_current(product, updated_at):
+            self.misses += 1
+            return None
+        self.products.move_to_end(product_id)
+        self.hits += 1
+        return product
+
+    def put(self, product):
+        product_id = product.get('_id')
+        if not product_id:
+            return
+        self.products[product_id] = product
+        self.products.move_to_end(product_id)
+        while len(self.products) > self.max_products:
+            self.products.popitem(last=False)
+
+    def seed(self, products):
+        """Cache documents that arrived anyway (e.g. a listing page) while there is room
+
+        Unlike put() this never evicts, so a long listing doesn't push out
+        the rows on screen.
+        """
+        for product in products:
+            if len(self.products) >= self.max_products:
+                break
+            product_id = product.get('_id')
+            if product_id and product_id not in self.products and product_id not in self._pending:
+                self.products[product_id] = product
+
+    def invalidate(self, product_id=None):
+        """Forget one product, or all of them, including loads still running"""
+        product_ids = [product_id] if product_id is not None else list(set(self.products) | set(self._pending))
+        for product_id in product_ids:
+            self.products.pop(product_id, None)
+            self._generation[product_id] = self._generation.get(product_id, 0) + 1
+            future = self._pending.pop(product_id, None)
+            if future:
+                future.cancel()
+            if product_id in self._waiting:
+                # Someone is waiting for this one; load the current version instead
+                self._submit(product_id, self.demand_executor)
+
+    def prefetch(self, product_ids, versions=None):
+        """Warm the cache for product_ids, most important first
+
+        versions may map ids to the updatedAt the caller knows; cached copies
+        older than that are loaded again. Queued loads for ids not in the list
+        are cancelled, so scrolling quickly doesn't leave a backlog of rows
+        nobody looks at any more.
+        """
+        versions = versions or {}
+        wanted = set(product_ids)
+        for product_id, future in list(self._pending.items()):
+            if product_id not in wanted and product_id not in self._waiting and future.cancel():
+                del self._pending[product_id]
+        for product_id in product_ids:
+            if product_id in self._pending:
+                continue
+            cached = self.products.get(product_id)
+            if cached is not None and is_current(cached, versions.get(product_id)):
+                continue
+            self._submit(product_id, self.executor)
+
+    def request(self, product_id, updated_at=None):
+        """Return the product if cached, otherwise load it ahead of any prefetch
+
+        The result arrives through product_loaded or product_failed.
+        """
+        product = self.get(product_id, updated_at)
+        if product is not None:
+            return product
+        self._waiting.add(product_id)
+        if product_id in self.products:
+            self.invalidate(product_id)  # Older than updated_at; reloads for the waiter
+            return None
+        future = self._pending.get(product_id)
+        if future and not future.cancel():
+            return None  # Already being fetched
+        self._submit(product_id, self.demand_executor)
+        return None
+
+    def _submit(self, product_id, executor):
+        if self._closed:
+            return
+        self._pending[product_id] = executor.submit(
+            self._load, product_id, self._generation.get(product_id, 0))
+
+    def _load(self, product_id, generation):
+        try:
+            product = self.fetch(product_id)
+            error = '' if product else 'Product not found'
+        except Exception as e:
+            product, error = None, str(e)
+        self._fetched.emit(product_id, generation, product, error)
+
+    def on_fetched(self, product_id, generation, product, error):
+        if generation != self._generation.get(product_id, 0):
+            return  # Invalidated while loading
+        self._pending.pop(product_id, None)
+        self._waiting.discard(product_id)
+        if product:
+            self.put(product)
+            self.product_loaded.emit(product_id, product)
+        else:
+            logger.warning(f"Could not prefetch product {product_id}: {error}")
+            self.product_failed.emit(product_id, error)
+
+    def stats(self):
+        return {'products': len(self.products), 'pending': len(self._pending),
+                'hits': self.hits, 'misses': self.misses}
+
+    def shutdown(self):
+        self._closed = True
+        self._waiting.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.demand_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,84 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class RequestExecutor(QObject):
+    """Runs blocking API calls on worker threads and hands the outcome back on the GUI thread
+
+    submit() returns a concurrent.futures.Future; on_result/on_error run on
+    the thread that owns the executor (create it on the GUI thread). Giving
+    a tag makes the call supersede any earlier one with the same tag still
+    running: the earlier call's callbacks are skipped, so a slow response
+    for a product the user already left never overwrites the current one.
+    """
+    busy_changed = pyqtSignal(bool)  # True while any request is running
+    _done = pyqtSignal(object, object, object)  # ticket, result, exception
+
+    def __init__(self, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='api-request')
+        self._lock = threading.Lock()
+        self._latest = {}  # tag -> ticket of the newest call
+        self._callbacks = {}  # ticket -> (tag, on_result, on_error)
+        self._next_ticket = 0
+        self._closed = False
+        self._done.connect(self.on_done)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, tag=None, **kwargs):
+        with self._lock:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            first = not self._callbacks
+            self._callbacks[ticket] = (tag, on_result, on_error)
+            if tag is not None:
+                self._latest[tag] = ticket
+        if first:
+            self.busy_changed.emit(True)
+        return self.executor.submit(self._run, ticket, fn, args, kwargs)
+
+    def _run(self, ticket, fn, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if not self._closed:
+                self._done.emit(ticket, None, e)
+            raise
+        if not self._closed:
+            self._done.emit(ticket, result, None)
+        return result
+
+    def is_busy(self, tag=None):
+        with self._lock:
+            if tag is None:
+                return bool(self._callbacks)
+            return self._latest.get(tag) in self._callbacks
+
+    def on_done(self, ticket, result, error):
+        with self._lock:
+            tag, on_result, on_error = self._callbacks.pop(ticket, (None, None, None))
+            superseded = tag is not None and self._latest.get(tag) != ticket
+            if tag is not None and not superseded:
+                del self._latest[tag]
+            idle = not self._callbacks
+        try:
+            if superseded:
+                return
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    logger.error(f"Background request failed: {error}")
+            elif on_result:
+                on_result(result)
+        finally:
+            if idle:
+                self.busy_changed.emit(False)
+
+    def shutdown(self):
+        """Stop delivering results and wait for running requests to end"""
+        self._closed = True
+        self.executor.shutdown(wait=True, cancel_futures=True)
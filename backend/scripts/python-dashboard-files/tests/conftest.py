@@ -0,0 +1,66 @@
+import importlib
+import os
+import sys
+import time
+
+import pytest
+
+# Widgets are never shown; run without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def wait_until(app, condition, timeout=5.0):
+    """Run the event loop until condition() is true; returns its last value"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def wait(qapp):
+    return lambda condition, timeout=5.0: wait_until(qapp, condition, timeout)
+
+
+@pytest.fixture(scope='session')
+def product_manager(qapp, tmp_path_factory):
+    """The product_manager module, imported from a scratch directory
+
+    Importing it opens product_manager.log in the working directory.
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('product_manager'))
+    try:
+        return importlib.import_module('product_manager')
+    finally:
+        os.chdir(cwd)
+
+
+class StubImageCache:
+    """Stands in for ImageCache.instance(): records subscriptions, downloads nothing"""
+
+    def __init__(self):
+        self.subscribed = []
+
+    def subscribe(self, url, requester, on_ready, on_failed, size=None):
+        self.subscribed.append(url)
+
+    def unsubscribe(self, url, requester, size=None):
+        pass
+
+
+@pytest.fixture
+def image_cache(monkeypatch):
+    from image_pipeline import ImageCache
+    stub = StubImageCache()
+    monkeypatch.setattr(ImageCache, '_instance', stub)
+    return stub
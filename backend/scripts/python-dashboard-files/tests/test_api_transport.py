@@ -0,0 +1,199 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import api_transport
+from api_transport import ApiTransport, replace_product_images
+
+BASE_URL = 'http://api.test/api'
+IMAGES_URL = f'{BASE_URL}/products/p1/images'
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    """Local keep-alive HTTP server answering from a script of statuses per request line, then 200"""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ScriptedHandler)
+        self.scripts = {}
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def next_status(self, route):
+        with self.lock:
+            self.calls[route] += 1
+            script = self.scripts.get(route)
+            return script.pop(0) if script else 200
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def answer(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        status = self.server.next_status(f"{self.command} {self.path}")
+        body = b'{}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = answer
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ScriptedServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_share_one_kept_alive_connection(server):
+    transport = ApiTransport(backoff_factor=0)
+    for _ in range(5):
+        assert transport.get(f"{server.url}/products").status_code == 200
+    assert transport.stats() == {'requests': 5, 'errors': 0, 'connections_opened': 1, 'connections_reused': 4}
+    transport.close()
+
+
+def test_rate_limits_and_server_errors_are_retried(server):
+    server.scripts['GET /products'] = [429, 503]
+    server.scripts['DELETE /products/p1'] = [502]
+    transport = ApiTransport(backoff_factor=0)
+    assert transport.get(f"{server.url}/products").status_code == 200
+    assert transport.delete(f"{server.url}/products/p1").status_code == 200
+    assert server.calls == {'GET /products': 3, 'DELETE /products/p1': 2}
+    assert transport.stats()['requests'] == 2
+    transport.close()
+
+
+def test_post_is_not_retried_on_server_errors(server):
+    server.scripts['POST /products'] = [503]
+    transport = ApiTransport(backoff_factor=0)
+    assert transport.post(f"{server.url}/products", json={'name': 'Shoe'}).status_code == 503
+    assert server.calls['POST /products'] == 1
+    transport.close()
+
+
+def test_retries_stop_at_max_retries(server):
+    server.scripts['GET /products'] = [503] * 10
+    transport = ApiTransport(max_retries=2, backoff_factor=0)
+    assert transport.get(f"{server.url}/products").status_code == 503
+    assert server.calls['GET /products'] == 3
+    transport.close()
+
+    # Without retries the first answer is returned as is
+    server.calls.clear()
+    transport = ApiTransport(max_retries=0)
+    assert transport.get(f"{server.url}/products").status_code == 503
+    assert server.calls['GET /products'] == 1
+    transport.close()
+
+
+def test_connection_failures_are_counted(server):
+    url = server.url
+    server.shutdown()
+    server.server_close()
+    transport = ApiTransport(max_retries=1, backoff_factor=0)
+    with pytest.raises(requests.ConnectionError):
+        transport.get(f"{url}/products")
+    assert transport.stats()['errors'] == 1
+    transport.close()
+
+
+class StubResponse:
+    def __init__(self, status_code, content_type='application/json'):
+        self.status_code = status_code
+        self.headers = {'Content-Type': content_type}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class StubTransport:
+    """Answers each method with a fixed response and records the calls"""
+
+    def __init__(self, **responses):
+        self.responses = responses
+        self.calls = []
+
+    def __getattr__(self, method):
+        def send(url, **kwargs):
+            self.calls.append((method.upper(), url, kwargs.get('json')))
+            return self.responses.get(method, StubResponse(200))
+        return send
+
+    def methods(self):
+        return [method for method, _, _ in self.calls]
+
+
+@pytest.fixture(autouse=True)
+def replace_supported(monkeypatch):
+    monkeypatch.setattr(api_transport, '_replace_unsupported', set())
+
+
+def test_pure_reorder_is_one_patch():
+    transport = StubTransport()
+    images = replace_product_images(transport, BASE_URL, 'p1', ['b', 'a'], ['a', 'b'])
+    assert transport.calls == [('PATCH', f'{IMAGES_URL}/reorder', {'imageOrders': [{'url': 'b'}, {'url': 'a'}]})]
+    assert images == [{'url': 'b', 'order': 0}, {'url': 'a', 'order': 1}]
+
+
+def test_other_changes_are_one_put():
+    transport = StubTransport()
+    replace_product_images(transport, BASE_URL, 'p1', ['a', 'c'], ['a', 'b'])
+    assert transport.calls == [('PUT', IMAGES_URL, {'images': [{'url': 'a', 'order': 0}, {'url': 'c', 'order': 1}]})]
+
+
+def test_rejected_reorder_falls_back_to_put():
+    transport = StubTransport(patch=StubResponse(400))
+    replace_product_images(transport, BASE_URL, 'p1', ['b', 'a'], ['a', 'b'])
+    assert transport.methods() == ['PATCH', 'PUT']
+
+
+@pytest.mark.parametrize('missing_route', [StubResponse(405), StubResponse(404, 'text/html')])
+def test_missing_put_route_clears_and_re_adds_and_is_remembered(missing_route):
+    transport = StubTransport(put=missing_route)
+    replace_product_images(transport, BASE_URL, 'p1', ['a', 'c'], ['a', 'b'])
+    assert transport.methods() == ['PUT', 'DELETE', 'POST']
+    assert transport.calls[-1][2] == {'images': [{'url': 'a', 'order': 0}, {'url': 'c', 'order': 1}]}
+
+    # Later calls to the same server skip the PUT
+    transport.calls.clear()
+    replace_product_images(transport, BASE_URL, 'p1', ['c'], ['a', 'c'])
+    assert transport.methods() == ['DELETE', 'POST']
+
+
+def test_missing_product_is_an_error_not_a_missing_route():
+    transport = StubTransport(put=StubResponse(404))
+    with pytest.raises(requests.HTTPError):
+        replace_product_images(transport, BASE_URL, 'p1', ['a'], [])
+    assert transport.methods() == ['PUT']
+    assert api_transport._replace_unsupported == set()
+
+
+def test_clearing_through_the_fallback_sends_no_post():
+    transport = StubTransport(put=StubResponse(405))
+    assert replace_product_images(transport, BASE_URL, 'p1', [], ['a']) == []
+    assert transport.methods() == ['PUT', 'DELETE']
@@ -0,0 +1,88 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+class FlakyApi:
+    """Answers from a script of statuses per route, then 200"""
+
+    def __init__(self, **scripts):
+        self.scripts = {route: list(statuses) for route, statuses in scripts.items()}
+        self.calls = Counter()
+
+    def app(self):
+        app = web.Application()
+        app.router.add_route('*', '/api/{tail:.*}', self.handle)
+        return app
+
+    async def handle(self, request):
+        route = f"{request.method} /{request.match_info['tail']}"
+        self.calls[route] += 1
+        script = self.scripts.get(route)
+        status = script.pop(0) if script else 200
+        if status == 'drop':
+            request.transport.close()
+            return web.Response()
+        if status == 429:
+            return web.json_response({'message': 'slow down'}, status=429, headers={'Retry-After': '0'})
+        if status == 404:
+            return web.json_response({'message': 'Not found'}, status=404)
+        if status != 200:
+            return web.json_response({'message': 'unavailable'}, status=status)
+        if route == 'POST /products':
+            return web.json_response({'_id': 'p1', 'name': 'Shoe'}, status=201)
+        return web.json_response({'ok': True})
+
+
+def run(product_manager, api, work):
+    async def main():
+        async with TestServer(api.app()) as server:
+            base_url = str(server.make_url('/api'))
+            async with product_manager.AsyncApiClient(base_url, backoff_factor=0) as client:
+                return await work(client)
+    return asyncio.run(main())
+
+
+def test_rate_limits_and_server_errors_are_retried(product_manager):
+    api = FlakyApi(**{'GET /products/p1': [429, 503]})
+    product = run(product_manager, api, lambda client: client.get_product_by_id('p1'))
+    assert product == {'ok': True}
+    assert api.calls['GET /products/p1'] == 3
+
+
+def test_retries_give_up_after_max_retries(product_manager):
+    api = FlakyApi(**{'GET /products/p1': [503] * 10})
+    assert run(product_manager, api, lambda client: client.get_product_by_id('p1')) is None
+    assert api.calls['GET /products/p1'] == 4
+
+
+def test_post_is_not_resent_after_a_server_error(product_manager):
+    api = FlakyApi(**{'POST /products': [503]})
+    assert run(product_manager, api, lambda client: client.create_product({'name': 'Shoe'})) is None
+    assert api.calls['POST /products'] == 1
+
+
+def test_post_is_not_resent_after_the_connection_drops(product_manager):
+    api = FlakyApi(**{'POST /products': ['drop'], 'GET /products/p1': ['drop']})
+    with pytest.raises(aiohttp.ClientConnectionError):
+        run(product_manager, api, lambda client: client.create_product({'name': 'Shoe'}))
+    assert api.calls['POST /products'] == 1
+
+    assert run(product_manager, api, lambda client: client.get_product_by_id('p1')) == {'ok': True}
+    assert api.calls['GET /products/p1'] == 2
+
+
+def test_bulk_delete_falls_back_to_retried_single_deletes(product_manager):
+    api = FlakyApi(**{'POST /products/bulk-delete': [404], 'DELETE /products/p2': [429],
+                      'DELETE /products/p3': [404]})
+    results = run(product_manager, api, lambda client: client.delete_products(['p1', 'p2', 'p3', 'p1']))
+    assert results == {'p1': {'status': 'deleted', 'error': None},
+                       'p2': {'status': 'deleted', 'error': None},
+                       'p3': {'status': 'not_found', 'error': None}}
+    assert api.calls['POST /products/bulk-delete'] == 1
+    assert api.calls['DELETE /products/p2'] == 2
@@ -0,0 +1,85 @@
+import threading
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ''
+
+
+class FakeApiClient:
+    """Server without the bulk endpoint that throttles the first deletes it sees"""
+
+    def __init__(self, product_ids, throttled=0, missing=(), broken=()):
+        self.product_ids = list(product_ids)
+        self.throttled = throttled
+        self.missing = set(missing)
+        self.broken = set(broken)
+        self.deletes = []
+        self.transports = set()
+        self.lock = threading.Lock()
+
+    def bulk_delete_products(self, product_ids=None):
+        return None
+
+    def get_products(self):
+        return [{'_id': product_id} for product_id in self.product_ids]
+
+    def delete_product(self, product_id, transport=None):
+        with self.lock:
+            self.deletes.append(product_id)
+            self.transports.add(id(transport))
+            if self.throttled:
+                self.throttled -= 1
+                return False, Response(429, {'Retry-After': '0'})
+        if product_id in self.missing:
+            return False, Response(404)
+        if product_id in self.broken:
+            return False, Response(400)
+        return True, Response(200)
+
+
+def run(product_manager, api, **options):
+    worker = product_manager.BulkDeleteWorker(api, base_backoff=0, **options)
+    summaries = []
+    worker.finished.connect(summaries.append)
+    worker.run()
+    return summaries[0]
+
+
+def test_clear_all_falls_back_to_adaptive_deletes(product_manager):
+    ids = [f'p{i}' for i in range(20)]
+    api = FakeApiClient(ids, throttled=3)
+    summary = run(product_manager, api, server_side=True)
+
+    assert not summary['server_side'] and summary['all']
+    assert sorted(summary['deleted_ids']) == sorted(ids)
+    assert summary['deleted'] == 20 and summary['error'] is None
+    # Every throttled delete was retried, and all went through one transport
+    assert summary['throttled'] == 3
+    assert len(api.deletes) == 23
+    assert len(api.transports) == 1 and id(None) not in api.transports
+
+
+def test_concurrency_grows_while_deletes_succeed(product_manager):
+    api = FakeApiClient([f'p{i}' for i in range(60)])
+    summary = run(product_manager, api, initial_concurrency=2, max_concurrency=8)
+    assert summary['deleted'] == 60
+    assert 2 < summary['peak_concurrency'] <= 8
+
+
+def test_missing_and_failed_ids_are_reported(product_manager):
+    api = FakeApiClient(['p1', 'p2', 'p3'], missing=['p2'], broken=['p3'])
+    summary = run(product_manager, api, product_ids=['p1', 'p2', 'p3'])
+    assert summary['deleted_ids'] == ['p1']
+    assert summary['not_found_ids'] == ['p2'] and summary['not_found'] == 1
+    assert [failure['_id'] for failure in summary['failed']] == ['p3']
+
+
+def test_throttling_gives_up_after_max_attempts(product_manager):
+    api = FakeApiClient(['p1'], throttled=10)
+    summary = run(product_manager, api, product_ids=['p1'], max_attempts=3)
+    assert api.deletes == ['p1'] * 3
+    assert summary['deleted'] == 0
+    assert summary['failed'][0]['_id'] == 'p1'
@@ -0,0 +1,62 @@
+import threading
+import time
+
+
+class FakeApi:
+    def __init__(self, categories=()):
+        self.categories = list(categories)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get_categories(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.02)
+        return list(self.categories)
+
+
+def test_lookups_by_name_and_id(product_manager):
+    api = FakeApi([{'_id': 'c1', 'name': 'Home  Decor'}])
+    index = product_manager.CategoryIndex(api)
+    assert index.id_for_name(' home decor ') == 'c1'
+    assert index.resolve_id({'_id': 'c2'}) == 'c2'
+    assert index.resolve_id('c1') == 'c1'
+    assert index.display_name('c1') == 'Home  Decor'
+    assert index.display_name('missing') == 'N/A'
+    assert api.calls == 1
+
+
+def test_empty_fetch_is_not_repeated_per_lookup(product_manager):
+    api = FakeApi()
+    index = product_manager.CategoryIndex(api, retry_after=30)
+    for _ in range(20):
+        index.display_name('c1')
+    assert api.calls == 1
+
+
+def test_empty_fetch_keeps_previous_entries(product_manager):
+    api = FakeApi([{'_id': 'c1', 'name': 'Books'}])
+    index = product_manager.CategoryIndex(api)
+    index.ensure_fresh()
+    api.categories = []
+    index.invalidate()
+    assert index.id_for_name('books') == 'c1'
+
+
+def test_concurrent_callers_share_one_fetch(product_manager):
+    api = FakeApi([{'_id': 'c1', 'name': 'Books'}])
+    index = product_manager.CategoryIndex(api)
+    threads = [threading.Thread(target=index.id_for_name, args=('books',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert api.calls == 1
+
+
+def test_refetches_after_ttl(product_manager):
+    api = FakeApi([{'_id': 'c1', 'name': 'Books'}])
+    index = product_manager.CategoryIndex(api, ttl=0)
+    index.ensure_fresh()
+    index.ensure_fresh()
+    assert api.calls == 2
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def console(qapp, product_manager):
+    console = product_manager.ConsoleWidget()
+    console.flush_timer.stop()  # Flushed by hand
+    yield console
+    console.deleteLater()
+
+
+def lines(console):
+    return console.toPlainText().splitlines()
+
+
+def test_messages_from_many_threads_arrive_in_one_flush(console):
+    def log(n):
+        for i in range(50):
+            console.log(f"thread {n} line {i}")
+
+    threads = [threading.Thread(target=log, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert lines(console) == []
+
+    console.flush()
+    assert len(lines(console)) == 200
+    assert console.document().blockCount() == 200
+
+
+def test_markup_is_shown_as_text(console):
+    console.log("<b>bold</b> & co\n", "error")
+    console.flush()
+    assert lines(console)[0].endswith("<b>bold</b> & co")
+
+
+def test_queue_drops_oldest_and_says_so(monkeypatch, qapp, product_manager):
+    monkeypatch.setattr(product_manager.ConsoleWidget, 'MAX_PENDING', 3)
+    console = product_manager.ConsoleWidget()
+    console.flush_timer.stop()
+    for i in range(5):
+        console.log(f"line {i}")
+    console.flush()
+    assert lines(console)[0] == "... 2 message(s) dropped"
+    assert [line.split('] ', 1)[1] for line in lines(console)[1:]] == ["line 2", "line 3", "line 4"]
+
+
+def test_document_keeps_the_last_lines(monkeypatch, qapp, product_manager):
+    monkeypatch.setattr(product_manager.ConsoleWidget, 'MAX_LINES', 10)
+    console = product_manager.ConsoleWidget()
+    console.flush_timer.stop()
+    for batch in range(3):
+        for i in range(8):
+            console.log(f"line {batch * 8 + i}")
+        console.flush()
+    assert console.document().blockCount() == 10
+    assert lines(console)[-1].endswith("line 23")
+
+
+def test_timer_flushes_on_its_own(wait, console):
+    console.flush_timer.start()
+    console.log("hello")
+    assert wait(lambda: lines(console))
@@ -0,0 +1,71 @@
+import threading
+
+from debounced_writer import DebouncedWriter
+
+
+class Recorder:
+    def __init__(self, result=True):
+        self.writes = []
+        self.result = result
+        self.lock = threading.Lock()
+
+    def __call__(self, key, value, previous):
+        with self.lock:
+            self.writes.append((key, value, previous))
+        return self.result
+
+
+def test_rapid_edits_are_written_once(qapp, wait):
+    write = Recorder()
+    writer = DebouncedWriter(write, delay_ms=20)
+    committed = []
+    writer.committed.connect(lambda key, value: committed.append((key, value)))
+
+    writer.submit('p1', ['b', 'a', 'c'], ['a', 'b', 'c'])
+    writer.submit('p1', ['b', 'c', 'a'], ['b', 'a', 'c'])
+    writer.submit('p1', ['c', 'b', 'a'], ['b', 'c', 'a'])
+
+    assert wait(lambda: committed)
+    assert write.writes == [('p1', ['c', 'b', 'a'], ['a', 'b', 'c'])]
+    assert not writer.has_pending('p1')
+    writer.shutdown()
+
+
+def test_edits_that_cancel_out_send_nothing(qapp, wait):
+    write = Recorder()
+    writer = DebouncedWriter(write, delay_ms=10)
+    writer.submit('p1', ['b', 'a'], ['a', 'b'])
+    writer.submit('p1', ['a', 'b'], ['b', 'a'])
+    wait(lambda: write.writes, timeout=0.2)
+    assert write.writes == []
+    writer.shutdown()
+
+
+def test_failure_reports_value_still_on_server(qapp, wait):
+    writer = DebouncedWriter(Recorder(result=False), delay_ms=10)
+    failed = []
+    writer.failed.connect(lambda key, previous, error: failed.append((key, previous)))
+
+    writer.submit('p1', ['b', 'a'], ['a', 'b'])
+    assert wait(lambda: failed)
+    assert failed == [('p1', ['a', 'b'])]
+    assert not writer.has_pending('p1')
+    writer.shutdown()
+
+
+def test_discard_drops_unsent_edits(qapp, wait):
+    write = Recorder()
+    writer = DebouncedWriter(write, delay_ms=10)
+    writer.submit('p1', ['b', 'a'], ['a', 'b'])
+    writer.discard('p1')
+    wait(lambda: write.writes, timeout=0.2)
+    assert write.writes == []
+    writer.shutdown()
+
+
+def test_shutdown_writes_pending_values(qapp):
+    write = Recorder()
+    writer = DebouncedWriter(write, delay_ms=60000)
+    writer.submit('p1', ['b', 'a'], ['a', 'b'])
+    writer.shutdown()
+    assert write.writes == [('p1', ['b', 'a'], ['a', 'b'])]
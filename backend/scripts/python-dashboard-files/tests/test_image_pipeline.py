@@ -0,0 +1,61 @@
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QColor, QImage
+
+from image_pipeline import ImageLoader, MemoryImageCache, TieredImageCache, image_key, sized_url
+
+CLOUDINARY_URL = 'https://res.cloudinary.com/demo/image/upload/v1712/products/shoe.jpg'
+
+
+def test_sized_url_asks_cloudinary_for_a_limited_derivative():
+    assert sized_url(CLOUDINARY_URL, (150, 120)) == (
+        'https://res.cloudinary.com/demo/image/upload/c_limit,w_150,h_120,f_auto,q_auto/v1712/products/shoe.jpg'
+    )
+
+
+def test_sized_url_leaves_other_urls_alone():
+    assert sized_url(CLOUDINARY_URL) == CLOUDINARY_URL
+    assert sized_url('https://example.com/image/upload/shoe.jpg', (150, 150)) == \
+        'https://example.com/image/upload/shoe.jpg'
+    assert sized_url('https://res.cloudinary.com/demo/video/upload/clip.mp4', (150, 150)) == \
+        'https://res.cloudinary.com/demo/video/upload/clip.mp4'
+
+
+def test_image_key_separates_sizes():
+    assert image_key(CLOUDINARY_URL) == CLOUDINARY_URL
+    assert image_key(CLOUDINARY_URL, (150, 150)) != image_key(CLOUDINARY_URL, (80, 80))
+
+
+class StubDisk:
+    def __init__(self):
+        image = QImage(4, 4, QImage.Format.Format_RGB32)
+        image.fill(QColor('red'))
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, 'PNG')
+        self.png = bytes(data)
+        self.fetched = []
+
+    def fetch(self, url):
+        self.fetched.append(url)
+        return self.png
+
+    def flush(self):
+        pass
+
+
+def test_cold_image_counts_one_memory_miss(qapp, wait):
+    disk = StubDisk()
+    cache = TieredImageCache(MemoryImageCache(), disk)
+    loader = ImageLoader(cache, max_workers=1)
+    loaded = []
+    loader.image_loaded.connect(lambda key, image: loaded.append(key))
+
+    assert loader.request(CLOUDINARY_URL) is None
+    assert wait(lambda: loaded)
+    assert loader.request(CLOUDINARY_URL) is not None
+
+    stats = cache.memory.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert disk.fetched == [CLOUDINARY_URL]
+    loader.shutdown()
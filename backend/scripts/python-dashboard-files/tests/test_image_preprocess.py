@@ -0,0 +1,50 @@
+import os
+
+from PIL import Image
+
+from image_preprocess import ImagePreprocessor, preprocess_image
+
+
+def make_image(path, size, color='red', **save_options):
+    Image.new('RGB', size, color).save(path, **save_options)
+    return str(path)
+
+
+def test_large_image_is_downscaled_and_reencoded(tmp_path):
+    source = make_image(tmp_path / 'big.png', (3000, 1500))
+    result = preprocess_image(source, str(tmp_path / 'out'), max_dimension=1200, thumbnail_size=(64, 64))
+
+    assert result['path'].endswith('.webp')
+    with Image.open(result['path']) as image:
+        assert image.size == (1200, 600)
+    with Image.open(result['thumbnail']) as thumbnail:
+        assert max(thumbnail.size) == 64
+    assert not [name for name in os.listdir(tmp_path / 'out') if name.endswith('.tmp')]
+
+
+def test_second_run_reuses_the_output(tmp_path, monkeypatch):
+    source = make_image(tmp_path / 'big.png', (3000, 1500))
+    first = preprocess_image(source, str(tmp_path / 'out'))
+    monkeypatch.setattr(Image, 'open', lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("re-encoded")))
+    assert preprocess_image(source, str(tmp_path / 'out')) == first
+
+
+def test_original_is_kept_when_reencoding_does_not_help(tmp_path, monkeypatch):
+    source = make_image(tmp_path / 'small.webp', (40, 40), 'blue', quality=5)
+    result = preprocess_image(source, str(tmp_path / 'out'), quality=100)
+    assert result['path'] == source
+
+    # The decision is remembered rather than re-encoding on every upload
+    monkeypatch.setattr(Image, 'open', lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("re-encoded")))
+    assert preprocess_image(source, str(tmp_path / 'out'), quality=100)['path'] == source
+
+
+def test_preprocessor_runs_in_worker_processes(tmp_path):
+    source = make_image(tmp_path / 'big.png', (3000, 1500))
+    preprocessor = ImagePreprocessor(max_dimension=800, output_dir=str(tmp_path / 'out'), max_workers=1)
+    try:
+        processed = preprocessor.process(source)
+    finally:
+        preprocessor.shutdown()
+    with Image.open(processed) as image:
+        assert image.size == (800, 400)
@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def tracker_file(tmp_path):
+    return str(tmp_path / 'product_images.json')
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_changes_survive_a_restart_through_the_log(product_manager, tracker_file):
+    tracker = product_manager.ImageTracker(tracker_file)
+    tracker.update_product_images('p1', ['a', 'b'])
+    tracker.update_product_images('p2', ['c'])
+    tracker.flush()
+    assert os.path.exists(tracker.log_file)
+    assert not os.path.exists(tracker_file)
+
+    reopened = product_manager.ImageTracker(tracker_file)
+    assert reopened.get_product_images('p1') == ['a', 'b']
+    assert reopened.get_product_images('p2') == ['c']
+    # Startup folds the log into the snapshot
+    assert not os.path.exists(reopened.log_file)
+    assert set(read_json(tracker_file)['products']) == {'p1', 'p2'}
+
+
+def test_torn_last_log_line_is_ignored(product_manager, tracker_file):
+    tracker = product_manager.ImageTracker(tracker_file)
+    tracker.update_product_images('p1', ['a'])
+    tracker.flush()
+    with open(tracker.log_file, 'a') as f:
+        f.write('{"id": "p2", "product": {"ima')
+
+    reopened = product_manager.ImageTracker(tracker_file)
+    assert reopened.get_product_images('p1') == ['a']
+    assert reopened.get_product_images('p2') == []
+
+    # Later appends start on a clean log, not after the torn line
+    reopened.update_product_images('p3', ['d'])
+    reopened.flush()
+    assert product_manager.ImageTracker(tracker_file).get_product_images('p3') == ['d']
+
+
+def test_deletes_are_logged(product_manager, tracker_file):
+    tracker = product_manager.ImageTracker(tracker_file)
+    tracker.update_product_images('p1', ['a'])
+    tracker.close()
+    tracker = product_manager.ImageTracker(tracker_file)
+    tracker.invalidate('p1')
+    tracker.flush()
+    assert product_manager.ImageTracker(tracker_file).get_product_images('p1') == []
+
+
+def test_log_is_compacted_when_long(product_manager, tracker_file, monkeypatch):
+    monkeypatch.setattr(product_manager.ImageTracker, 'COMPACT_AFTER', 3)
+    tracker = product_manager.ImageTracker(tracker_file)
+    for i in range(3):
+        tracker.update_product_images(f'p{i}', ['a'])
+        tracker.flush()
+    assert not os.path.exists(tracker.log_file)
+    assert len(read_json(tracker_file)['products']) == 3
+
+
+def test_unreadable_snapshot_is_moved_aside(product_manager, tracker_file):
+    with open(tracker_file, 'w') as f:
+        f.write('{"products": {"p1": ')
+    with open(tracker_file + '.log', 'w') as f:
+        f.write(json.dumps({'id': 'p2', 'product': {'images': [{'url': 'b', 'order': 0}]}, 'at': None}) + '\n')
+
+    tracker = product_manager.ImageTracker(tracker_file)
+    assert tracker.get_product_images('p2') == ['b']
+    with open(tracker_file + '.corrupt') as f:
+        assert f.read() == '{"products": {"p1": '
+
+
+def test_validate_drops_stale_entries_and_keeps_own_writes(product_manager, tracker_file):
+    tracker = product_manager.ImageTracker(tracker_file)
+    tracker.update_product_images('fresh', ['a'], server_updated_at='v1')
+    tracker.update_product_images('changed', ['b'], server_updated_at='v1')
+    tracker.update_product_images('written', ['c'])
+
+    stale = tracker.validate({'fresh': 'v1', 'changed': 'v2', 'written': 'v5', 'unknown': 'v1'})
+
+    assert stale == ['changed']
+    assert tracker.is_validated('fresh')
+    assert tracker.is_validated('written')
+    assert tracker.get_version('written')[0] == 'v5'
+    assert tracker.get_product_images('changed') == []
+    tracker.close()
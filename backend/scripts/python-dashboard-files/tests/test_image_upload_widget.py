@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+import pytest
+from PyQt6.QtGui import QColor, QPixmap
+
+URLS = ['https://img.test/a.png', 'https://img.test/b.png', 'https://img.test/c.png']
+
+
+@pytest.fixture
+def thumbnails(monkeypatch, product_manager):
+    monkeypatch.setattr(product_manager.ImageThumbnail, 'scaled_pixmaps', OrderedDict())
+    return product_manager.ImageThumbnail
+
+
+@pytest.fixture
+def widget(qapp, product_manager, image_cache, thumbnails):
+    widget = product_manager.ImageUploadWidget()
+    yield widget
+    widget.deleteLater()
+
+
+def layout_urls(widget):
+    layout = widget.thumbnail_layout
+    return [layout.itemAt(i).widget().image_url for i in range(layout.count()) if layout.itemAt(i).widget()]
+
+
+def test_reorder_moves_existing_thumbnails(widget, image_cache):
+    widget.set_images(URLS)
+    before = dict(widget.thumbnails)
+    reordered = []
+    widget.image_reordered.connect(reordered.append)
+
+    widget.reorder_image(URLS[2], 0)
+
+    assert layout_urls(widget) == [URLS[2], URLS[0], URLS[1]]
+    assert widget.thumbnails == before
+    assert [widget.thumbnails[url].index for url in widget.image_urls] == [0, 1, 2]
+    assert reordered == [[URLS[2], URLS[0], URLS[1]]]
+    # Nothing was requested again
+    assert image_cache.subscribed == URLS
+
+
+def test_removing_an_image_keeps_the_other_thumbnails(widget):
+    widget.set_images(URLS)
+    kept = widget.thumbnails[URLS[2]]
+    widget.remove_image(URLS[1])
+    assert layout_urls(widget) == [URLS[0], URLS[2]]
+    assert widget.thumbnails[URLS[2]] is kept and kept.index == 1
+
+
+def test_repeated_url_gets_its_own_thumbnail(widget):
+    widget.set_images([URLS[0], URLS[0]])
+    assert len(widget.thumbnails) == 2
+    assert layout_urls(widget) == [URLS[0], URLS[0]]
+
+
+def test_scaled_pixmap_is_reused_by_later_thumbnails(widget, image_cache, thumbnails):
+    widget.set_images(URLS[:1])
+    pixmap = QPixmap(400, 300)
+    pixmap.fill(QColor('red'))
+    widget.thumbnails[URLS[0]].set_image(pixmap)
+    assert thumbnails.scaled_pixmaps[URLS[0]].width() == 90
+
+    # Showing the image again (e.g. another product, then back) needs no load
+    widget.set_images([])
+    widget.set_images(URLS[:1])
+    thumbnail = widget.thumbnails[URLS[0]]
+    assert thumbnail.pixmap().cacheKey() == thumbnails.scaled_pixmaps[URLS[0]].cacheKey()
+    assert image_cache.subscribed == URLS[:1]
+
+
+def test_scaled_pixmaps_are_bounded(monkeypatch, thumbnails):
+    monkeypatch.setattr(thumbnails, 'MAX_SCALED_PIXMAPS', 2)
+    pixmap = QPixmap(10, 10)
+    for url in URLS:
+        thumbnail = thumbnails(url, 0, is_local=True)
+        thumbnail.set_image(pixmap)
+    assert list(thumbnails.scaled_pixmaps) == URLS[1:]
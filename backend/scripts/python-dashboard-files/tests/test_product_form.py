@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from request_executor import RequestExecutor
+
+
+class FakeApiClient:
+    def __init__(self, product_manager, tmp_path):
+        self.executor = RequestExecutor()
+        self.categories = product_manager.CategoryIndex(self)
+        self.image_tracker = product_manager.ImageTracker(str(tmp_path / 'product_images.json'))
+        self.writes = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_categories(self):
+        return [{'_id': 'c1', 'name': 'Shoes'}]
+
+    def reorder_product_images(self, product_id, image_orders):
+        self.release.wait(5)
+        self.writes.append((product_id, [image['url'] for image in image_orders]))
+        return True
+
+
+def product(product_id, urls):
+    return {'_id': product_id, 'name': product_id, 'description': 'd', 'price': 1, 'stock': 1, 'category': 'c1',
+            'updatedAt': 'v1', 'images': [{'url': url, 'order': idx} for idx, url in enumerate(urls)]}
+
+
+@pytest.fixture
+def form(qapp, wait, product_manager, image_cache, tmp_path):
+    api = FakeApiClient(product_manager, tmp_path)
+    api.categories.ensure_fresh()
+    form = product_manager.ProductFormWidget(api, product_manager.ConsoleWidget())
+    # Only an explicit flush sends a reorder
+    form.reorder_writer.timer.setInterval(60000)
+    yield form
+    api.release.set()
+    form.reorder_writer.shutdown()
+    api.executor.shutdown()
+
+
+def test_switching_product_sends_the_pending_reorder(wait, form):
+    api = form.api_client
+    form.set_edit_mode(product('p1', ['a', 'b']))
+    form.handle_image_reorder(['b', 'a'])
+
+    form.set_edit_mode(product('p2', ['c']))
+    assert wait(lambda: api.writes)
+    assert api.writes == [('p1', ['b', 'a'])]
+    assert form.image_upload.image_urls == ['c']
+
+
+def test_reopening_during_the_write_shows_the_new_order(wait, form):
+    api = form.api_client
+    api.release.clear()
+    form.set_edit_mode(product('p1', ['a', 'b']))
+    form.handle_image_reorder(['b', 'a'])
+    form.reorder_writer.flush()
+
+    # Loaded before the reorder reached the server
+    form.set_edit_mode(product('p1', ['a', 'b']))
+    assert form.image_upload.image_urls == ['a', 'b']
+    api.release.set()
+    assert wait(lambda: form.saved_image_urls == ['b', 'a'])
+    assert form.image_upload.image_urls == ['b', 'a']
+
+
+def test_hiding_the_form_sends_the_pending_reorder(wait, form):
+    form.show()
+    form.set_edit_mode(product('p1', ['a', 'b']))
+    form.handle_image_reorder(['b', 'a'])
+    form.hide()
+    assert wait(lambda: form.api_client.writes == [('p1', ['b', 'a'])])
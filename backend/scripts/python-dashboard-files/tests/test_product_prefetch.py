@@ -0,0 +1,112 @@
+import threading
+
+from product_prefetch import ProductPrefetcher, is_current
+
+
+class FakeApi:
+    """fetch() stand-in that counts calls and can be held back"""
+
+    def __init__(self):
+        self.calls = []
+        self.version = 1
+        self.release = threading.Event()
+        self.release.set()
+        self.lock = threading.Lock()
+
+    def fetch(self, product_id):
+        self.release.wait(5)
+        with self.lock:
+            self.calls.append(product_id)
+            return {'_id': product_id, 'updatedAt': f"2026-01-01T00:00:0{self.version}Z"}
+
+
+def test_is_current_compares_iso_timestamps():
+    product = {'updatedAt': '2026-01-02T00:00:00Z'}
+    assert is_current(product, None)
+    assert is_current(product, '2026-01-01T00:00:00Z')
+    assert not is_current(product, '2026-01-03T00:00:00Z')
+
+
+def test_request_returns_cached_product_without_fetching(qapp):
+    api = FakeApi()
+    prefetcher = ProductPrefetcher(api.fetch)
+    prefetcher.put({'_id': 'a', 'updatedAt': '2026-01-01T00:00:01Z'})
+    assert prefetcher.request('a', '2026-01-01T00:00:01Z')['_id'] == 'a'
+    assert api.calls == []
+    prefetcher.shutdown()
+
+
+def test_lru_is_bounded(qapp):
+    prefetcher = ProductPrefetcher(FakeApi().fetch, max_products=2)
+    for product_id in 'abc':
+        prefetcher.put({'_id': product_id})
+    assert list(prefetcher.products) == ['b', 'c']
+    prefetcher.shutdown()
+
+
+def test_seed_never_evicts(qapp):
+    prefetcher = ProductPrefetcher(FakeApi().fetch, max_products=2)
+    prefetcher.put({'_id': 'visible'})
+    prefetcher.seed([{'_id': 'x'}, {'_id': 'y'}, {'_id': 'z'}])
+    assert list(prefetcher.products) == ['visible', 'x']
+    prefetcher.shutdown()
+
+
+def test_invalidate_reloads_a_requested_product(qapp, wait):
+    api = FakeApi()
+    api.release.clear()
+    prefetcher = ProductPrefetcher(api.fetch)
+    loaded = []
+    prefetcher.product_loaded.connect(lambda product_id, product: loaded.append(product['updatedAt']))
+
+    assert prefetcher.request('a') is None
+    # e.g. a reorder committing while the product is being opened
+    api.version = 2
+    prefetcher.invalidate('a')
+    api.release.set()
+
+    assert wait(lambda: loaded)
+    wait(lambda: len(api.calls) == 2, timeout=0.5)
+    assert loaded == ['2026-01-01T00:00:02Z']
+    prefetcher.shutdown()
+
+
+def test_prefetch_does_not_cancel_a_requested_product(qapp, wait):
+    api = FakeApi()
+    api.release.clear()
+    prefetcher = ProductPrefetcher(api.fetch, max_workers=1)
+    loaded = []
+    prefetcher.product_loaded.connect(lambda product_id, product: loaded.append(product_id))
+
+    # Fill the prefetch pool so later loads stay queued
+    prefetcher.prefetch(['busy'])
+    prefetcher.request('wanted')
+    prefetcher.prefetch(['other'])
+    api.release.set()
+
+    assert wait(lambda: 'wanted' in loaded)
+    prefetcher.shutdown()
+
+
+def test_prefetch_cancels_rows_that_scrolled_away(qapp, wait):
+    api = FakeApi()
+    api.release.clear()
+    prefetcher = ProductPrefetcher(api.fetch, max_workers=1)
+
+    prefetcher.prefetch(['a', 'b', 'c'])
+    prefetcher.prefetch(['d'])
+    api.release.set()
+
+    assert wait(lambda: 'd' in prefetcher.products)
+    assert 'b' not in api.calls and 'c' not in api.calls
+    prefetcher.shutdown()
+
+
+def test_failed_load_is_reported(qapp, wait):
+    prefetcher = ProductPrefetcher(lambda product_id: None)
+    failed = []
+    prefetcher.product_failed.connect(lambda product_id, error: failed.append((product_id, error)))
+    prefetcher.request('gone')
+    assert wait(lambda: failed)
+    assert failed == [('gone', 'Product not found')]
+    prefetcher.shutdown()
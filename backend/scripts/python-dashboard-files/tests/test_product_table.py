@@ -0,0 +1,44 @@
+import pytest
+from PyQt6.QtCore import QEvent, QPointF, Qt
+from PyQt6.QtGui import QMouseEvent
+from PyQt6.QtWidgets import QApplication
+
+PRESS, RELEASE, DOUBLE = (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                          QEvent.Type.MouseButtonDblClick)
+
+
+@pytest.fixture
+def table(qapp, product_manager):
+    table = product_manager.ProductTableWidget()
+    table.resize(900, 300)
+    table.show()
+    table.populate_products([{'_id': 'p1', 'name': 'Shoe', 'price': 10, 'stock': 1,
+                              'category': 'c1', 'images': []}])
+    table.opened = []
+    table.edit_clicked.connect(lambda product: table.opened.append(product['_id']))
+    yield table
+    table.close()
+
+
+def send(table, column, events):
+    viewport = table.viewport()
+    pos = QPointF(table.visualRect(table.model().index(0, column)).center())
+    for kind in events:
+        buttons = Qt.MouseButton.NoButton if kind == RELEASE else Qt.MouseButton.LeftButton
+        QApplication.sendEvent(viewport, QMouseEvent(kind, pos, viewport.mapToGlobal(pos), Qt.MouseButton.LeftButton,
+                                                     buttons, Qt.KeyboardModifier.NoModifier))
+
+
+def test_double_click_on_edit_opens_the_product_once(product_manager, table):
+    actions = product_manager.ProductTableModel.ACTIONS_COLUMN
+    send(table, actions, [PRESS, RELEASE, DOUBLE, RELEASE])
+    assert table.opened == ['p1']
+
+    # The next single click is not swallowed
+    send(table, actions, [PRESS, RELEASE])
+    assert table.opened == ['p1', 'p1']
+
+
+def test_double_click_on_a_row_opens_the_product(table):
+    send(table, 1, [PRESS, RELEASE, DOUBLE, RELEASE])
+    assert table.opened == ['p1']
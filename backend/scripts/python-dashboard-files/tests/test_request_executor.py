@@ -0,0 +1,52 @@
+import threading
+
+from request_executor import RequestExecutor
+
+
+def test_result_and_error_reach_their_callbacks(qapp, wait):
+    executor = RequestExecutor()
+    results, errors = [], []
+
+    def fail():
+        raise ValueError("boom")
+
+    executor.submit(lambda: 42, on_result=results.append)
+    executor.submit(fail, on_error=errors.append)
+    assert wait(lambda: results and errors)
+    assert results == [42]
+    assert isinstance(errors[0], ValueError)
+    executor.shutdown()
+
+
+def test_newer_call_with_same_tag_supersedes_older(qapp, wait):
+    executor = RequestExecutor()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        release.wait(5)
+        return 'old'
+
+    executor.submit(slow, on_result=results.append, tag='edit')
+    executor.submit(lambda: 'new', on_result=results.append, tag='edit')
+    assert wait(lambda: results)
+    release.set()
+    assert wait(lambda: not executor.is_busy())
+    assert results == ['new']
+    executor.shutdown()
+
+
+def test_busy_changed_brackets_outstanding_requests(qapp, wait):
+    executor = RequestExecutor()
+    states = []
+    executor.busy_changed.connect(states.append)
+    release = threading.Event()
+
+    executor.submit(release.wait, 5)
+    executor.submit(release.wait, 5)
+    assert executor.is_busy()
+    release.set()
+    assert wait(lambda: not executor.is_busy())
+    wait(lambda: len(states) == 2, timeout=0.5)
+    assert states == [True, False]
+    executor.shutdown()
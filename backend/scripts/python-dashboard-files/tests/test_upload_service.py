@@ -0,0 +1,167 @@
+import threading
+
+import cloudinary.uploader
+import pytest
+
+from upload_service import CloudinaryUploader, HashIndex, UploadQueue, UploadService, job_key
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return UploadQueue(str(tmp_path / 'upload_queue.json'))
+
+
+@pytest.fixture
+def hash_index(tmp_path):
+    return HashIndex(str(tmp_path / 'image_hashes.json'))
+
+
+@pytest.fixture
+def image(tmp_path):
+    def make(name, content=b'image'):
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def cloudinary_calls(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def upload(path, **options):
+        with lock:
+            calls.append(path)
+        return {'secure_url': f"https://res.cloudinary.com/demo/image/upload/{options['public_id']}.png",
+                'public_id': options['public_id']}
+
+    monkeypatch.setattr(cloudinary.uploader, 'upload', upload)
+    return calls
+
+
+def test_unfinished_batches_survive_a_restart(tmp_path, queue, image):
+    path = image('a.png')
+    batch_id = queue.add_batch([path], 'p1')
+    queue.update_job(job_key(path), status='uploading', offset=6)
+
+    reopened = UploadQueue(queue.queue_file)
+    assert reopened.unfinished_batches() == [(batch_id, reopened.get_batch(batch_id))]
+    assert reopened.unfinished_batches('p2') == []
+    assert reopened.get_job(job_key(path))['offset'] == 6
+
+    reopened.finish_batch(batch_id)
+    assert reopened.unfinished_batches() == []
+    assert reopened.get_job(job_key(path)) is None
+
+
+def test_chunked_upload_resumes_at_stored_offset(monkeypatch, queue, hash_index, image):
+    path = image('big.png', b'x' * 25)
+    parts = []
+
+    def upload_large_part(part, http_headers, **options):
+        parts.append((http_headers['Content-Range'], http_headers['X-Unique-Upload-Id']))
+        if len(parts) == 2:
+            raise ConnectionError("network went away")
+        return {'secure_url': 'https://res.cloudinary.com/demo/image/upload/big.png'}
+
+    monkeypatch.setattr(cloudinary.uploader, 'upload_large_part', upload_large_part)
+    uploader = CloudinaryUploader(queue, hash_index, chunk_size=10, large_file_bytes=5, max_attempts=1)
+    with pytest.raises(ConnectionError):
+        uploader.upload(path)
+    assert queue.get_job(job_key(path))['offset'] == 10
+
+    # A new run (e.g. after a restart) continues the same upload
+    uploader = CloudinaryUploader(UploadQueue(queue.queue_file), hash_index, chunk_size=10,
+                                  large_file_bytes=5, max_attempts=1)
+    assert uploader.upload(path).endswith('big.png')
+    ranges = [content_range for content_range, _ in parts]
+    assert ranges == ['bytes 0-9/25', 'bytes 10-19/25', 'bytes 10-19/25', 'bytes 20-24/25']
+    assert len({upload_id for _, upload_id in parts}) == 1
+
+
+def test_resumed_batch_skips_finished_files(qapp, wait, cloudinary_calls, queue, hash_index, image):
+    done, pending = image('done.png', b'one'), image('pending.png', b'two')
+    service = UploadService(queue=queue, hash_index=hash_index)
+    batch_id = queue.add_batch([done, pending], 'p1')
+    service.uploader.upload(done)
+    assert cloudinary_calls == [done]
+
+    finished = []
+    service.batch_finished.connect(lambda batch, summary: finished.append((batch, summary)))
+    service.resume_batch(batch_id)
+    assert wait(lambda: finished)
+
+    assert cloudinary_calls == [done, pending]
+    batch, summary = finished[0]
+    assert batch == batch_id and summary['product_id'] == 'p1'
+    assert len(summary['urls']) == 2 and not summary['failed']
+    assert queue.unfinished_batches() == []
+    service.shutdown()
+
+
+def test_batch_finished_waits_for_start_batch_to_return(qapp, wait, queue, hash_index):
+    service = UploadService(queue=queue, hash_index=hash_index)
+    finished = []
+    service.batch_finished.connect(lambda batch, summary: finished.append(batch))
+
+    batch_id = service.start_batch([], 'p1')
+    assert finished == []
+    assert wait(lambda: finished == [batch_id])
+    service.shutdown()
+
+
+def test_same_content_is_uploaded_once(cloudinary_calls, queue, hash_index, image):
+    first, copy = image('a.png', b'same'), image('copy-of-a.png', b'same')
+    uploader = CloudinaryUploader(queue, hash_index)
+    assert uploader.upload(first) == uploader.upload(copy)
+    assert cloudinary_calls == [first]
+
+    # The index is persisted, so a later session reuses the URL as well
+    uploader = CloudinaryUploader(UploadQueue(queue.queue_file), HashIndex(hash_index.index_file))
+    assert uploader.upload(image('again.png', b'same')) == uploader.upload(first)
+    assert cloudinary_calls == [first]
+
+
+def test_identical_files_in_one_batch_share_an_upload(qapp, wait, cloudinary_calls, queue, hash_index, image):
+    paths = [image(f'dup{i}.png', b'dup') for i in range(4)]
+    service = UploadService(queue=queue, hash_index=hash_index)
+    urls = service.upload_paths(paths)
+    assert len(set(urls)) == 1
+    assert len(cloudinary_calls) == 1
+    service.shutdown()
+
+
+def test_cancel_skips_files_not_yet_sent(qapp, wait, monkeypatch, queue, hash_index, image):
+    paths = [image(f'small{i}.png', bytes([i])) for i in range(6)]
+    started, release = threading.Event(), threading.Event()
+    sent = []
+
+    def upload(path, **options):
+        sent.append(path)
+        started.set()
+        release.wait(5)
+        return {'secure_url': f"https://res.cloudinary.com/demo/image/upload/{options['public_id']}.png"}
+
+    monkeypatch.setattr(cloudinary.uploader, 'upload', upload)
+    service = UploadService(queue=queue, hash_index=hash_index, max_workers=1)
+    failed = []
+    service.file_failed.connect(lambda path, error: failed.append(path))
+    finished = []
+    service.batch_finished.connect(lambda batch, summary: finished.append(summary))
+
+    batch_id = service.start_batch(paths, 'p1')
+    assert started.wait(5)
+    service.cancel_batch(batch_id)
+    release.set()
+    assert wait(lambda: finished)
+
+    # Only the file already in flight went out
+    assert sent == paths[:1]
+    summary = finished[0]
+    assert summary['cancelled'] and len(summary['urls']) == 1
+    assert set(summary['failed']) == set(paths[1:])
+    assert wait(lambda: sorted(failed) == sorted(paths[1:]))
+    # The batch is kept for resuming, which only sends what is left
+    assert [batch for batch, _ in queue.unfinished_batches()] == [batch_id]
+    service.shutdown()
@@ -0,0 +1,545 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import cloudinary.exceptions
+import cloudinary.uploader
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+from PyQt6.QtWidgets import QProgressDialog
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_QUEUE_FILE = os.path.join(SCRIPT_DIR, 'upload_queue.json')
+DEFAULT_HASH_INDEX_FILE = os.path.join(SCRIPT_DIR, 'image_hashes.json')  # Next to product_images.json
+
+JOB_RETENTION = 7 * 24 * 3600  # Seconds finished jobs are kept for re-runs
+
+# Cloudinary wants chunks of at least 5 MB; anything smaller goes up in one request
+CHUNK_SIZE = 6 * 1024 * 1024
+LARGE_FILE_BYTES = 10 * 1024 * 1024
+
+# Errors that will not go away by trying again
+PERMANENT_ERRORS = (
+    cloudinary.exceptions.BadRequest,
+    cloudinary.exceptions.AuthorizationRequired,
+    cloudinary.exceptions.NotAllowed,
+    cloudinary.exceptions.NotFound,
+    FileNotFoundError,
+    PermissionError
+)
+
+
+class UploadError(Exception):
+    """Raised when some files of a batch could not be uploaded"""
+
+    def __init__(self, failures, urls):
+        self.failures = failures  # path -> error message
+        self.urls = urls  # URLs of the files that did upload, in order
+        super().__init__(f"{len(failures)} image(s) failed to upload: " +
+                         "; ".join(f"{os.path.basename(p)}: {e}" for p, e in failures.items()))
+
+
+class UploadCancelled(Exception):
+    """Raised instead of sending a file once its batch has been cancelled"""
+
+    def __init__(self):
+        super().__init__("Upload cancelled")
+
+
+def file_digest(path, block_size=1024 * 1024):
+    """SHA-256 of a file's content, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def job_key(path):
+    """Identify a file by path, size and modification time"""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{stat.st_size}|{int(stat.st_mtime)}"
+
+
+class UploadQueue:
+    """Upload state saved to disk so an interrupted batch can pick up where it stopped
+
+    Jobs record per-file progress (including the offset of a chunked upload),
+    so running the same upload again skips what already went through.
+    Batches record which files were meant for which product; a batch and its
+    jobs are dropped once the batch has been handed back to its owner.
+    """
+
+    def __init__(self, queue_file=DEFAULT_QUEUE_FILE):
+        self.queue_file = queue_file
+        self._lock = threading.RLock()
+        data = self.load()
+        self.jobs = data.get('jobs', {})
+        self.batches = data.get('batches', {})
+        self.prune_jobs()
+
+    def load(self):
+        try:
+            if os.path.exists(self.queue_file):
+                with open(self.queue_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading upload queue: {e}")
+        return {}
+
+    def save(self):
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.queue_file)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({'jobs': self.jobs, 'batches': self.batches}, f, indent=2)
+                os.replace(tmp_path, self.queue_file)
+            except Exception as e:
+                logger.error(f"Error saving upload queue: {e}")
+
+    def get_job(self, key):
+        with self._lock:
+            job = self.jobs.get(key)
+            return dict(job) if job else None
+
+    def update_job(self, key, **fields):
+        with self._lock:
+            job = self.jobs.setdefault(key, {'status': 'pending', 'attempts': 0})
+            job.update(fields, updated_at=time.time())
+            self.save()
+
+    def prune_jobs(self, max_age=JOB_RETENTION):
+        """Drop old jobs that no unfinished batch refers to"""
+        cutoff = time.time() - max_age
+        with self._lock:
+            referenced = {os.path.abspath(path) for batch in self.batches.values()
+                          for path in batch['paths']}
+            stale = [key for key, job in self.jobs.items()
+                     if job.get('updated_at', 0) < cutoff and key.split('|', 1)[0] not in referenced]
+            for key in stale:
+                del self.jobs[key]
+            if stale:
+                self.save()
+
+    def add_batch(self, paths, product_id=None):
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self.batches[batch_id] = {
+                'paths': list(paths),
+                'product_id': product_id,
+                'created_at': time.time()
+            }
+            self.save()
+        return batch_id
+
+    def get_batch(self, batch_id):
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            return dict(batch) if batch else None
+
+    def unfinished_batches(self, product_id=None):
+        """Return (batch_id, batch) pairs, optionally only those for one product"""
+        with self._lock:
+            return [(batch_id, dict(batch)) for batch_id, batch in self.batches.items()
+                    if product_id is None or batch.get('product_id') == product_id]
+
+    def finish_batch(self, batch_id):
+        """Forget a batch and the jobs only it refers to"""
+        with self._lock:
+            batch = self.batches.pop(batch_id, None)
+            if not batch:
+                return
+            still_needed = {os.path.abspath(path) for other in self.batches.values()
+                            for path in other['paths']}
+            finished = {os.path.abspath(path) for path in batch['paths']} - still_needed
+            for key in list(self.jobs):
+                if key.split('|', 1)[0] in finished:
+                    del self.jobs[key]
+            self.save()
+
+
+class HashIndex:
+    """Maps image content hashes to the Cloudinary URL they were uploaded to"""
+
+    def __init__(self, index_file=DEFAULT_HASH_INDEX_FILE):
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self.entries = self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading image hash index: {e}")
+        return {}
+
+    def save(self):
+        """Write the index atomically; caller holds the lock"""
+        try:
+            directory = os.path.dirname(self.index_file)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving image hash index: {e}")
+
+    def lookup(self, digest):
+        with self._lock:
+            entry = self.entries.get(digest)
+            return entry['secure_url'] if entry else None
+
+    def record(self, digest, result):
+        with self._lock:
+            self.entries[digest] = {
+                'secure_url': result['secure_url'],
+                'public_id': result.get('public_id'),
+                'bytes': result.get('bytes'),
+                'uploaded_at': time.time()
+            }
+            self.save()
+
+
+class CloudinaryUploader:
+    """Uploads one file with retries, in chunks when it is large"""
+
+    def __init__(self, queue, hash_index=None, chunk_size=CHUNK_SIZE, large_file_bytes=LARGE_FILE_BYTES,
+                 max_attempts=4, base_backoff=1.0, max_backoff=30.0):
+        self.queue = queue
+        self.hash_index = hash_index or HashIndex()
+        self._digest_locks = {}
+        self._digest_locks_guard = threading.Lock()
+        self.chunk_size = chunk_size
+        self.large_file_bytes = large_file_bytes
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    def digest_lock(self, digest):
+        with self._digest_locks_guard:
+            return self._digest_locks.setdefault(digest, threading.Lock())
+
+    def upload(self, path, progress=None, cancelled=None, **options):
+        """Upload path and return its secure_url
+
+        progress(sent, total) is called as bytes go out. A file already
+        uploaded by an earlier, interrupted run is not sent again, and
+        neither is any file whose content was uploaded before.
+        """
+        key = job_key(path)
+        total = os.path.getsize(path)
+        job = self.queue.get_job(key)
+        if job and job.get('status') == 'done':
+            if progress:
+                progress(total, total)
+            return job['url']
+
+        digest = job.get('digest') if job else None
+        if not digest:
+            digest = file_digest(path)
+            self.queue.update_job(key, digest=digest)
+
+        # Identical files in one batch: the first uploads, the rest reuse its URL
+        with self.digest_lock(digest):
+            url = self.hash_index.lookup(digest)
+            if url:
+                logger.info(f"Reusing {url} for {path} (same content already uploaded)")
+                self.queue.update_job(key, status='done', url=url, error=None)
+                if progress:
+                    progress(total, total)
+                return url
+            return self.upload_new(path, key, digest, total, progress, cancelled, options)
+
+    def upload_new(self, path, key, digest, total, progress, cancelled, options):
+        # Naming the asset after its content makes a repeated upload a no-op
+        # on Cloudinary's side even if the local index was lost
+        options = dict(options)
+        options.setdefault('public_id', digest)
+        options.setdefault('overwrite', False)
+        options.setdefault('unique_filename', False)
+
+        attempt = 0
+        while True:
+            if cancelled and cancelled.is_set():
+                raise UploadCancelled()
+            attempt += 1
+            try:
+                result = self.upload_once(path, key, total, progress, cancelled, options)
+                break
+            except PERMANENT_ERRORS as e:
+                self.queue.update_job(key, status='failed', attempts=attempt, error=str(e))
+                raise
+            except Exception as e:
+                self.queue.update_job(key, status='pending', attempts=attempt, error=str(e))
+                if attempt >= self.max_attempts or (cancelled and cancelled.is_set()):
+                    raise
+                delay = min(self.base_backoff * 2 ** (attempt - 1), self.max_backoff)
+                logger.warning(f"Upload of {path} failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+                if cancelled:
+                    if cancelled.wait(delay):
+                        raise
+                else:
+                    time.sleep(delay)
+
+        url = result['secure_url']
+        self.hash_index.record(digest, result)
+        self.queue.update_job(key, status='done', url=url, attempts=attempt, error=None,
+                              upload_id=None, offset=None)
+        return url
+
+    def upload_once(self, path, key, total, progress, cancelled, options):
+        if total <= self.large_file_bytes:
+            result = cloudinary.uploader.upload(path, **options)
+            if progress:
+                progress(total, total)
+            return result
+        return self.upload_chunked(path, key, total, progress, cancelled, options)
+
+    def upload_chunked(self, path, key, total, progress, cancelled, options):
+        """Send the file in Content-Range chunks, continuing a stored upload if there is one"""
+        job = self.queue.get_job(key) or {}
+        upload_id = job.get('upload_id') or uuid.uuid4().hex
+        offset = job.get('offset') or 0
+        options = dict(options)
+        self.queue.update_job(key, status='uploading', upload_id=upload_id, offset=offset)
+
+        result = None
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while offset < total:
+                if cancelled and cancelled.is_set():
+                    raise UploadCancelled()
+                chunk = f.read(self.chunk_size)
+                headers = {
+                    'Content-Range': f"bytes {offset}-{offset + len(chunk) - 1}/{total}",
+                    'X-Unique-Upload-Id': upload_id
+                }
+                result = cloudinary.uploader.upload_large_part(
+                    (os.path.basename(path), chunk),
+                    http_headers=headers,
+                    resource_type='image',
+                    **options
+                )
+                offset += len(chunk)
+                self.queue.update_job(key, offset=offset)
+                if progress:
+                    progress(offset, total)
+        return result
+
+
+class UploadService(QObject):
+    """Uploads files on a bounded pool and reports per-file progress by signal
+
+    Create it on the GUI thread; signals emitted by the workers are then
+    delivered there.
+    """
+    file_progress = pyqtSignal(str, int, int)  # path, bytes sent, file size
+    file_finished = pyqtSignal(str, str)  # path, secure_url
+    file_failed = pyqtSignal(str, str)  # path, error message
+    batch_finished = pyqtSignal(str, dict)  # batch id, summary
+    _batch_done = pyqtSignal(str, object, object)  # batch id, futures, cancel event
+
+    def __init__(self, queue=None, hash_index=None, preprocessor=None, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.queue = queue or UploadQueue()
+        self.uploader = CloudinaryUploader(self.queue, hash_index)
+        self.preprocessor = preprocessor  # Optional ImagePreprocessor run before each upload
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='uploader')
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+        # Always queued: a batch whose files are all done at once (dedupe hits,
+        # an empty resume) must not report before start_batch has returned
+        self._batch_done.connect(self.finish_batch, Qt.ConnectionType.QueuedConnection)
+
+    def upload_file(self, path, cancelled=None):
+        try:
+            # Files still queued when their batch is cancelled are never sent
+            if cancelled and cancelled.is_set():
+                raise UploadCancelled()
+            # Progress is always reported against the path the caller gave
+            source = self.preprocessor.process(path) if self.preprocessor else path
+            url = self.uploader.upload(
+                source,
+                progress=lambda sent, total: self.file_progress.emit(path, sent, total),
+                cancelled=cancelled
+            )
+        except UploadCancelled as e:
+            logger.info(f"Skipped {path}: {e}")
+            self.file_failed.emit(path, str(e))
+            raise
+        except Exception as e:
+            logger.error(f"Error uploading {path}: {e}")
+            self.file_failed.emit(path, str(e))
+            raise
+        logger.info(f"Successfully uploaded {path} to: {url}")
+        self.file_finished.emit(path, url)
+        return url
+
+    def upload_paths(self, paths):
+        """Upload local files concurrently and wait; return URLs in input order
+
+        Entries that are already URLs are passed through. Raises UploadError,
+        carrying the URLs that did succeed, if any file failed; calling again
+        with the same files only sends the ones still missing.
+        """
+        local = [path for path in paths if not path.startswith('http') and os.path.exists(path)]
+        futures = {path: self.executor.submit(self.upload_file, path) for path in dict.fromkeys(local)}
+
+        urls = []
+        failures = {}
+        for path in paths:
+            if path in futures:
+                try:
+                    urls.append(futures[path].result())
+                except Exception as e:
+                    failures[path] = str(e)
+            elif path.startswith('http'):
+                urls.append(path)
+
+        if failures:
+            raise UploadError(failures, urls)
+        return urls
+
+    def start_batch(self, paths, product_id=None, batch_id=None):
+        """Upload files in the background; batch_finished carries the result
+
+        Pass the id of an unfinished batch to resume it.
+        """
+        if batch_id is None:
+            batch_id = self.queue.add_batch(paths, product_id)
+        cancelled = threading.Event()
+        with self._lock:
+            self._cancel_events[batch_id] = cancelled
+
+        paths = list(dict.fromkeys(paths))
+        futures = [(path, self.executor.submit(self.upload_file, path, cancelled)) for path in paths]
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def on_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self._batch_done.emit(batch_id, futures, cancelled)
+
+        if not futures:
+            self._batch_done.emit(batch_id, futures, cancelled)
+        for _, future in futures:
+            future.add_done_callback(on_done)
+        return batch_id
+
+    def resume_batch(self, batch_id):
+        batch = self.queue.get_batch(batch_id)
+        if not batch:
+            return None
+        paths = [path for path in batch['paths'] if os.path.exists(path)]
+        return self.start_batch(paths, batch.get('product_id'), batch_id)
+
+    def finish_batch(self, batch_id, futures, cancelled):
+        urls = []
+        failed = {}
+        for path, future in futures:
+            if future.cancelled():
+                failed[path] = "Cancelled"
+            elif future.exception() is not None:
+                failed[path] = str(future.exception())
+            else:
+                urls.append(future.result())
+
+        with self._lock:
+            self._cancel_events.pop(batch_id, None)
+        batch = self.queue.get_batch(batch_id) or {}
+        # A cancelled batch stays queued so it can be resumed later
+        if not cancelled.is_set():
+            self.queue.finish_batch(batch_id)
+        self.batch_finished.emit(batch_id, {
+            'product_id': batch.get('product_id'),
+            'urls': urls,
+            'failed': failed,
+            'cancelled': cancelled.is_set()
+        })
+
+    def cancel_batch(self, batch_id):
+        with self._lock:
+            cancelled = self._cancel_events.get(batch_id)
+        if cancelled:
+            cancelled.set()
+
+    def shutdown(self):
+        with self._lock:
+            for cancelled in self._cancel_events.values():
+                cancelled.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.preprocessor:
+            self.preprocessor.shutdown()
+
+
+class UploadProgressDialog(QProgressDialog):
+    """Progress dialog following the files of one upload batch"""
+
+    def __init__(self, service, paths, parent=None):
+        super().__init__("Uploading images...", "Cancel", 0, 100, parent)
+        self.service = service
+        self.batch_id = None
+        self.sizes = {}
+        for path in paths:
+            try:
+                self.sizes[path] = max(os.path.getsize(path), 1)
+            except OSError:
+                self.sizes[path] = 1
+        self.sent = dict.fromkeys(self.sizes, 0)
+        self.done = 0
+
+        self.setWindowTitle("Upload Progress")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.setValue(0)
+
+        service.file_progress.connect(self.on_file_progress)
+        service.file_finished.connect(self.on_file_done)
+        service.file_failed.connect(self.on_file_done)
+        self.canceled.connect(self.cancel_batch)
+
+    def track(self, batch_id):
+        self.batch_id = batch_id
+
+    def on_file_progress(self, path, sent, total):
+        if path not in self.sent:
+            return
+        # The file sent may be a smaller preprocessed copy; scale to the original
+        self.sent[path] = self.sizes[path] * sent / max(total, 1)
+        total_bytes = sum(self.sizes.values())
+        self.setValue(int(sum(self.sent.values()) * 100 / total_bytes))
+        self.setLabelText(f"Uploading {os.path.basename(path)}... "
+                          f"({self.done}/{len(self.sizes)} files done)")
+
+    def on_file_done(self, path, _):
+        if path not in self.sent:
+            return
+        self.sent[path] = self.sizes[path]
+        self.done += 1
+        self.on_file_progress(path, self.sizes[path], self.sizes[path])
+
+    def cancel_batch(self):
+        if self.batch_id:
+            self.setLabelText("Cancelling...")
+            self.service.cancel_batch(self.batch_id)
+
+    def close_dialog(self):
+        for signal, slot in ((self.service.file_progress, self.on_file_progress),
+                             (self.service.file_finished, self.on_file_done),
+                             (self.service.file_failed, self.on_file_done)):
+            signal.disconnect(slot)
+        self.close()